@@ -1,33 +1,250 @@
 // Built by tools/bundle.js
-const PROJECT_PREFIX = "ts";const STORAGE_KEYS = {  settings: `${PROJECT_PREFIX}:settings`,  onlineCache: `${PROJECT_PREFIX}:onlineCache`,  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`};const MESSAGE_TYPES = {  action: `${PROJECT_PREFIX}:action`,  list: `${PROJECT_PREFIX}:list`,  detail: `${PROJECT_PREFIX}:detail`,  status: `${PROJECT_PREFIX}:status`,  settings: `${PROJECT_PREFIX}:settings`,  visibility: `${PROJECT_PREFIX}:visibility`,  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,  clearCache: `${PROJECT_PREFIX}:clear-online-cache`};const CACHE_CONFIG = {  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days  VERSION: 'v1'};const DEFAULT_SETTINGS = {  schemaVersion: 1,  language: "auto",  includeCode: false,  sidebarWidth: 380,  theme: "auto",  listLimit: 40,  onlineEnabled: true};// Prefix for individual cache keys to avoid collision
-const CACHE_PREFIX = "ts:cache:";
-const buildCacheKey = (term, lang, source) => `${CACHE_PREFIX}${CACHE_CONFIG.VERSION}|${term}|${lang}|${source}`;
+const PROJECT_PREFIX = "ts";
+const STORAGE_KEYS = {
+  settings: `${PROJECT_PREFIX}:settings`,
+  onlineCache: `${PROJECT_PREFIX}:onlineCache`,
+  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`
+};
+const MESSAGE_TYPES = {
+  action: `${PROJECT_PREFIX}:action`,
+  list: `${PROJECT_PREFIX}:list`,
+  detail: `${PROJECT_PREFIX}:detail`,
+  status: `${PROJECT_PREFIX}:status`,
+  settings: `${PROJECT_PREFIX}:settings`,
+  visibility: `${PROJECT_PREFIX}:visibility`,
+  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,
+  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,
+  clearCache: `${PROJECT_PREFIX}:clear-online-cache`,
+  cacheStats: `${PROJECT_PREFIX}:online-cache-stats`
+};
+const CACHE_CONFIG = {
+  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days
+  VERSION: 'v1',
+  MEMORY_ENTRIES: 200, // results kept in the service worker's LRU
+  MAX_ENTRIES: 5000, // results kept in IndexedDB; the least recently used go first
+  TOUCH_INTERVAL_MS: 60 * 1000 // a hit rewrites a record's lastUsed at most this often
+};
+const DETAIL_CONFIG = {
+  SHARD_CACHE_SIZE: 8 // decoded detail shards kept per tab
+};
+const GLOSSARY_CONFIG = {
+  FULL_GLOSSARY_IDLE_TIMEOUT_MS: 5000 // swap in the full packs by then even if the page never idles
+};
+const SEARCH_CONFIG = {
+  RESULT_LIMIT: 50, // glossary hits per language and query
+  FUZZY_RATIO: 0.6 // share of the query's n-grams a typo match must contain
+};
+const DEFAULT_SETTINGS = {
+  schemaVersion: 1,
+  language: "auto",
+  includeCode: false,
+  sidebarWidth: 380,
+  theme: "auto",
+  listLimit: 40,
+  onlineEnabled: true,
+  allDomains: false // on sites with a domain pack, match the whole glossary anyway
+};
+// Minimal promise wrappers around IndexedDB for the service worker.
+const requestResult = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+const transactionDone = (tx) => new Promise((resolve, reject) => {
+  tx.oncomplete = () => resolve();
+  tx.onerror = () => reject(tx.error);
+  tx.onabort = () => reject(tx.error || new Error("IndexedDB transaction aborted"));
+});
+const openDatabase = (name, version, upgrade) => new Promise((resolve, reject) => {
+  const request = indexedDB.open(name, version);
+  request.onupgradeneeded = (event) => upgrade(request.result, event.oldVersion, request.transaction);
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+  request.onblocked = () => reject(new Error(`IndexedDB ${name} is blocked by an open connection`));
+});
+// Online results live in two levels: a small LRU in the service worker and
+// an IndexedDB store behind it. Writes go straight to a transaction; writes
+// that arrive while one is committing share the next. Each transaction also
+// drops expired records (expiresAt index) and evicts the least recently used
+// ones (lastUsed index) beyond CACHE_CONFIG.MAX_ENTRIES.
+const CACHE_DB_NAME = "ts-online-cache";
+const CACHE_DB_VERSION = 2;
+// entries: {key, value, ts, expiresAt, lastUsed}
+const CACHE_STORE = "entries";
+const CACHE_EXPIRES_INDEX = "expiresAt";
+const CACHE_LAST_USED_INDEX = "lastUsed";
+// Keys of the chrome.storage.local cache this module replaced.
+const LEGACY_PREFIX = "ts:cache:";
+let cacheDbPromise = null;
+let flushPromise = Promise.resolve();
+let nextFlush = null;
+const memory = new Map(); // key -> record, least recently used first
+const pending = new Map(); // key -> record waiting for the next transaction
+const stats = { memoryHits: 0, diskHits: 0, misses: 0, writes: 0, flushes: 0, evictions: 0 };
+// One full read of chrome.storage.local, when the database is first created.
+const removeLegacyEntries = async () => {
+  const keys = Object.keys(await chrome.storage.local.get(null)).filter((key) => key.startsWith(LEGACY_PREFIX));
+  await chrome.storage.local.remove([...keys, STORAGE_KEYS.onlineCache]);
+};
+const openCacheDb = () => {
+  if (!cacheDbPromise) {
+    cacheDbPromise = openDatabase(CACHE_DB_NAME, CACHE_DB_VERSION, (db, oldVersion, tx) => {
+      if (!db.objectStoreNames.contains(CACHE_STORE)) {
+        db.createObjectStore(CACHE_STORE, { keyPath: "key" }).createIndex(CACHE_EXPIRES_INDEX, CACHE_EXPIRES_INDEX);
+      }
+      if (oldVersion < 2) {
+        const store = tx.objectStore(CACHE_STORE);
+        store.createIndex(CACHE_LAST_USED_INDEX, CACHE_LAST_USED_INDEX);
+        // Version 1 records have no lastUsed; their write time stands in.
+        store.openCursor().onsuccess = (event) => {
+          const cursor = event.target.result;
+          if (!cursor) return;
+          cursor.update({ ...cursor.value, lastUsed: cursor.value.ts });
+          cursor.continue();
+        };
+      }
+      if (oldVersion === 0) {
+        removeLegacyEntries().catch((error) => console.warn("Removing the old online cache failed:", error));
+      }
+    }).catch((error) => {
+      cacheDbPromise = null;
+      throw error;
+    });
+  }
+  return cacheDbPromise;
+};
+const remember = (record) => {
+  memory.delete(record.key);
+  memory.set(record.key, record);
+  if (memory.size > CACHE_CONFIG.MEMORY_ENTRIES) {
+    memory.delete(memory.keys().next().value);
+  }
+};
+const isFresh = (record) => record && record.expiresAt > Date.now();
+// Marks a hit. lastUsed only moves when it is written back, at most once per
+// CACHE_CONFIG.TOUCH_INTERVAL_MS for each record, with the next transaction.
+const touch = (record) => {
+  const current = memory.get(record.key);
+  // A disk read that raced a newer write must not queue the old value again.
+  if (current && current.ts > record.ts) return;
+  const now = Date.now();
+  if (now - (record.lastUsed || 0) < CACHE_CONFIG.TOUCH_INTERVAL_MS) {
+    remember(record);
+    return;
+  }
+  record = { ...record, lastUsed: now };
+  remember(record);
+  pending.set(record.key, record);
+  scheduleFlush();
+};
+const buildCacheKey = (term, lang, source) => `${CACHE_CONFIG.VERSION}|${term}|${lang}|${source}`;
 const getCachedEntry = async (key) => {
-  const result = await chrome.storage.local.get(key);
-  const entry = result[key];
-  if (!entry) return null;
-  if (Date.now() - entry.ts > CACHE_CONFIG.TTL_MS) {
-    // Lazy expiration
-    await chrome.storage.local.remove(key);
+  let record = memory.get(key) || pending.get(key);
+  if (isFresh(record)) {
+    stats.memoryHits += 1;
+    touch(record);
+    return { value: record.value, ts: record.ts };
+  }
+  try {
+    const db = await openCacheDb();
+    record = await requestResult(db.transaction(CACHE_STORE, "readonly").objectStore(CACHE_STORE).get(key));
+  } catch (error) {
+    console.warn("Online cache read failed:", error);
+    record = null;
+  }
+  // Expired records are left to the next write transaction.
+  if (!isFresh(record)) {
+    stats.misses += 1;
     return null;
   }
-  return entry.value;
+  stats.diskHits += 1;
+  touch(record);
+  return { value: record.value, ts: record.ts };
 };
-const setCachedEntry = async (key, value) => {
-  // Store individually
-  await chrome.storage.local.set({ 
-      [key]: { ts: Date.now(), value } 
-  });
+// Drops expired records, then the least recently used ones beyond the cap.
+const pruneStore = (store) => {
+  store.index(CACHE_EXPIRES_INDEX).openCursor(IDBKeyRange.upperBound(Date.now())).onsuccess = (event) => {
+    const cursor = event.target.result;
+    if (!cursor) {
+      store.count().onsuccess = (countEvent) => {
+        let excess = countEvent.target.result - CACHE_CONFIG.MAX_ENTRIES;
+        if (excess <= 0) return;
+        store.index(CACHE_LAST_USED_INDEX).openCursor().onsuccess = (evictEvent) => {
+          const oldest = evictEvent.target.result;
+          if (!oldest || excess <= 0) return;
+          memory.delete(oldest.primaryKey);
+          oldest.delete();
+          stats.evictions += 1;
+          excess -= 1;
+          oldest.continue();
+        };
+      };
+      return;
+    }
+    memory.delete(cursor.primaryKey);
+    cursor.delete();
+    cursor.continue();
+  };
+};
+const flush = async () => {
+  nextFlush = null;
+  if (!pending.size) return;
+  const records = Array.from(pending.values());
+  pending.clear();
+  try {
+    const db = await openCacheDb();
+    const tx = db.transaction(CACHE_STORE, "readwrite");
+    const store = tx.objectStore(CACHE_STORE);
+    records.forEach((record) => store.put(record));
+    pruneStore(store);
+    await transactionDone(tx);
+    stats.flushes += 1;
+  } catch (error) {
+    // The results stay in memory for this session; losing them only costs a refetch.
+    console.warn("Online cache write failed:", error);
+  }
+};
+// Queues the next transaction behind the one in flight; records queued before
+// it starts are written together.
+const scheduleFlush = () => {
+  if (!nextFlush) {
+    nextFlush = flushPromise.then(flush);
+    flushPromise = nextFlush;
+  }
+  return nextFlush;
+};
+const flushOnlineCache = () => scheduleFlush();
+const setCachedEntry = (key, value) => {
+  const ts = Date.now();
+  const record = { key, value, ts, expiresAt: ts + CACHE_CONFIG.TTL_MS, lastUsed: ts };
+  remember(record);
+  pending.set(key, record);
+  stats.writes += 1;
+  return scheduleFlush();
 };
 const clearOnlineCache = async () => {
-  // Clear all keys starting with prefix
-  const all = await chrome.storage.local.get(null);
-  const keysToRemove = Object.keys(all).filter(k => k.startsWith(CACHE_PREFIX));
-  if (keysToRemove.length > 0) {
-      await chrome.storage.local.remove(keysToRemove);
+  memory.clear();
+  pending.clear();
+  await flushPromise;
+  const db = await openCacheDb();
+  const tx = db.transaction(CACHE_STORE, "readwrite");
+  tx.objectStore(CACHE_STORE).clear();
+  await transactionDone(tx);
+};
+const getCacheStats = async () => {
+  let stored = null;
+  try {
+    const db = await openCacheDb();
+    stored = await requestResult(db.transaction(CACHE_STORE, "readonly").objectStore(CACHE_STORE).count());
+  } catch (error) {
+    console.warn("Online cache count failed:", error);
   }
-  // Also clear legacy large object if exists
-  await chrome.storage.local.remove(STORAGE_KEYS.onlineCache);
+  return {
+    ...stats,
+    hits: stats.memoryHits + stats.diskHits,
+    memoryEntries: memory.size,
+    pendingWrites: pending.size,
+    storedEntries: stored
+  };
 };
 const RATE_LIMIT_MS = 1000;
 const FETCH_TIMEOUT_MS = 6000;
@@ -133,7 +350,83 @@ const fetchWikipedia = async (term, lang) => {
     examples: []
   };
 };
-const resolveOnline = async ({ term, lang, sources, force }) => {  const results = [];  for (const source of sources) {    const cacheKey = buildCacheKey(term, lang, source);    if (!force) {      const cached = await getCachedEntry(cacheKey);      if (cached) {        results.push({          ...cached.value,          source,          cached: true,          cacheTime: cached.ts        });        continue;      }    }    let fetched = null;    try {      fetched = await enqueueRequest(() => requestWithRetry(() => {        if (source === "wiktionary") return fetchWiktionary(term, lang);        if (source === "wikipedia") return fetchWikipedia(term, lang);        return null;      }));    } catch (e) {      console.error('Fetch error:', e);      fetched = null;    }    if (fetched) {      await setCachedEntry(cacheKey, fetched);      results.push({        ...fetched,        source,        cached: false,        cacheTime: Date.now()      });    }  }  return results;};chrome.runtime.onMessage.addListener((message, _sender, sendResponse) => {  const handle = async () => {    if (message?.type === MESSAGE_TYPES.onlineResolve) {      const term = message.term || "";      const lang = message.lang || "en";      const sources = Array.isArray(message.sources) ? message.sources : ["wiktionary", "wikipedia"];      const force = Boolean(message.force);      const results = await resolveOnline({ term, lang, sources, force });      return { ok: true, results };    }    if (message?.type === MESSAGE_TYPES.clearCache) {      await clearOnlineCache();      return { ok: true };    }    return { ok: false };  };  handle()    .then((result) => sendResponse(result))    .catch((error) => sendResponse({ ok: false, error: error?.message || String(error) }));  return true;});chrome.commands.onCommand.addListener(async (command) => {  if (command === "toggle-sidebar") {    const tabs = await chrome.tabs.query({ active: true, currentWindow: true });    const activeTab = tabs[0];
+const resolveOnline = async ({ term, lang, sources, force }) => {
+  const results = [];
+  for (const source of sources) {
+    const cacheKey = buildCacheKey(term, lang, source);
+    if (!force) {
+      const cached = await getCachedEntry(cacheKey);
+      if (cached) {
+        results.push({
+          ...cached.value,
+          source,
+          cached: true,
+          cacheTime: cached.ts
+        });
+        continue;
+      }
+    }
+    let fetched = null;
+    try {
+      fetched = await enqueueRequest(() => requestWithRetry(() => {
+        if (source === "wiktionary") return fetchWiktionary(term, lang);
+        if (source === "wikipedia") return fetchWikipedia(term, lang);
+        return null;
+      }));
+    } catch (e) {
+      console.error('Fetch error:', e);
+      fetched = null;
+    }
+    if (fetched) {
+      await setCachedEntry(cacheKey, fetched);
+      results.push({
+        ...fetched,
+        source,
+        cached: false,
+        cacheTime: Date.now()
+      });
+    }
+  }
+  return results;
+};
+chrome.runtime.onMessage.addListener((message, _sender, sendResponse) => {
+  const handle = async () => {
+    if (message?.type === MESSAGE_TYPES.onlineResolve) {
+      const term = message.term || "";
+      const lang = message.lang || "en";
+      const sources = Array.isArray(message.sources) ? message.sources : ["wiktionary", "wikipedia"];
+      const force = Boolean(message.force);
+      const results = await resolveOnline({ term, lang, sources, force });
+      return { ok: true, results };
+    }
+    if (message?.type === MESSAGE_TYPES.clearCache) {
+      await clearOnlineCache();
+      return { ok: true };
+    }
+    if (message?.type === MESSAGE_TYPES.cacheStats) {
+      return { ok: true, stats: await getCacheStats() };
+    }
+    return { ok: false };
+  };
+  handle()
+    .then((result) => sendResponse(result))
+    .catch((error) => sendResponse({ ok: false, error: error?.message || String(error) }));
+  return true;
+});
+// Earlier versions mirrored the packaged glossary into this database; the
+// content script always read the packaged files, so it is only dropped now.
+chrome.runtime.onInstalled.addListener(() => {
+  indexedDB.deleteDatabase("ts-glossary");
+});
+// Results are written through already; this only commits lastUsed updates
+// still waiting for a transaction.
+chrome.runtime.onSuspend.addListener(() => {
+  flushOnlineCache();
+});
+chrome.commands.onCommand.addListener(async (command) => {
+  if (command === "toggle-sidebar") {
+    const tabs = await chrome.tabs.query({ active: true, currentWindow: true });
+    const activeTab = tabs[0];
     if (!activeTab?.id) return;
     const url = activeTab.url || "";
     if (!url || url.startsWith("chrome://") || url.startsWith("edge://") || url.startsWith("about:") || url.startsWith("chrome-extension://")) {
@@ -144,4 +437,5 @@ const resolveOnline = async ({ term, lang, sources, force }) => {  const result
     } catch (error) {
       return;
     }
-  }});
\ No newline at end of file
+  }
+});
\ No newline at end of file
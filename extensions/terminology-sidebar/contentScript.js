@@ -1,6 +1,51 @@
 // Built by tools/bundle.js
 (() => {
-const PROJECT_PREFIX = "ts";const STORAGE_KEYS = {  settings: `${PROJECT_PREFIX}:settings`,  onlineCache: `${PROJECT_PREFIX}:onlineCache`,  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`};const MESSAGE_TYPES = {  action: `${PROJECT_PREFIX}:action`,  list: `${PROJECT_PREFIX}:list`,  detail: `${PROJECT_PREFIX}:detail`,  status: `${PROJECT_PREFIX}:status`,  settings: `${PROJECT_PREFIX}:settings`,  visibility: `${PROJECT_PREFIX}:visibility`,  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,  clearCache: `${PROJECT_PREFIX}:clear-online-cache`};const CACHE_CONFIG = {  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days  VERSION: 'v1'};const DEFAULT_SETTINGS = {  schemaVersion: 1,  language: "auto",  includeCode: false,  sidebarWidth: 380,  theme: "auto",  listLimit: 40,  onlineEnabled: true};class Store {
+const PROJECT_PREFIX = "ts";
+const STORAGE_KEYS = {
+  settings: `${PROJECT_PREFIX}:settings`,
+  onlineCache: `${PROJECT_PREFIX}:onlineCache`,
+  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`
+};
+const MESSAGE_TYPES = {
+  action: `${PROJECT_PREFIX}:action`,
+  list: `${PROJECT_PREFIX}:list`,
+  detail: `${PROJECT_PREFIX}:detail`,
+  status: `${PROJECT_PREFIX}:status`,
+  settings: `${PROJECT_PREFIX}:settings`,
+  visibility: `${PROJECT_PREFIX}:visibility`,
+  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,
+  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,
+  clearCache: `${PROJECT_PREFIX}:clear-online-cache`,
+  cacheStats: `${PROJECT_PREFIX}:online-cache-stats`
+};
+const CACHE_CONFIG = {
+  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days
+  VERSION: 'v1',
+  MEMORY_ENTRIES: 200, // results kept in the service worker's LRU
+  MAX_ENTRIES: 5000, // results kept in IndexedDB; the least recently used go first
+  TOUCH_INTERVAL_MS: 60 * 1000 // a hit rewrites a record's lastUsed at most this often
+};
+const DETAIL_CONFIG = {
+  SHARD_CACHE_SIZE: 8 // decoded detail shards kept per tab
+};
+const GLOSSARY_CONFIG = {
+  FULL_GLOSSARY_IDLE_TIMEOUT_MS: 5000 // swap in the full packs by then even if the page never idles
+};
+const SEARCH_CONFIG = {
+  RESULT_LIMIT: 50, // glossary hits per language and query
+  FUZZY_RATIO: 0.6 // share of the query's n-grams a typo match must contain
+};
+const DEFAULT_SETTINGS = {
+  schemaVersion: 1,
+  language: "auto",
+  includeCode: false,
+  sidebarWidth: 380,
+  theme: "auto",
+  listLimit: 40,
+  onlineEnabled: true,
+  allDomains: false // on sites with a domain pack, match the whole glossary anyway
+};
+class Store {
   constructor(initialState) {
     this.state = initialState;
     this.listeners = new Set();
@@ -27,14 +72,27 @@ const PROJECT_PREFIX = "ts";const STORAGE_KEYS = {  settings: `${PROJECT_PREFI
 }
 const initialState = {
   settings: { ...DEFAULT_SETTINGS },
-  glossaryEn: [],
-  glossaryZh: [],
-  enPatterns: [], // Raw patterns for worker
-  zhPatterns: [], // Raw patterns for worker
+  glossaryEn: null, // PackedGlossary (hot tier or full) or JSON list wrapper ({ length, getEntry, findEntry })
+  glossaryZh: null,
+  enPack: null, // Packed glossary buffer for worker (hot tier until the full pack loads)
+  zhPack: null,
+  enPatterns: [], // Raw patterns for worker (JSON fallback)
+  zhPatterns: [], // Raw patterns for worker (JSON fallback)
+  siteDomain: null, // Domain pack picked for this host (glossary_domains.json)
+  partialLangs: [], // Languages on a hot tier or domain pack (see useFullGlossary)
+  fullGlossaryPromise: null,
   glossaryLoaded: false,
-  detailMap: null,
+  detailIndexPromise: null, // data/detail/index.json (null result = no shards)
+  detailShards: new Map(), // LRU of decoded detail shards
+  detailShardPromises: new Map(),
+  detailMap: null, // Full glossary_detail.json, only when shards are unavailable
   detailPromise: null,
   detailLoadError: false,
+  searchIndexPromise: null, // data/search_{en,zh}.bin, loaded on the first query
+  searchIndexes: null, // { en: SearchIndex|null, zh: SearchIndex|null }
+  searchGlossaries: null, // { en, zh } full glossaries the search indexes point into
+  searchItems: [], // Glossary-wide hits of the current query (not on the page)
+  relatedItems: [], // Related terms of the entry in the detail view
   worker: null, // Web Worker instance
   matches: [],
   listItems: [],
@@ -60,66 +118,583 @@ const getScanModes = (settings) => {
   if (settings.language === "auto") return ["en", "zh"];
   return settings.language === "zh_CN" ? ["zh"] : ["en"];
 };
+// Reader for the packed binary glossary written by tools/build_glossary.py.
+// Layout: a header of little-endian uint32 fields (PACK_HEADER_FIELDS order)
+// followed by 4-byte aligned typed-array sections.
+const PACK_FORMAT_VERSION = 3;
+const PACK_MAGIC = 0x50475354; // "TSGP"
+const PACK_HEADER_FIELDS = [
+  "magic",
+  "formatVersion",
+  "schemaVersion",
+  "entryCount",
+  "stringCount",
+  "aliasCount",
+  "patternCount",
+  "categoryCount",
+  "stateCount",
+  "transitionCount",
+  "outputCount",
+  "stringOffsets",
+  "stringData",
+  "entryIds",
+  "entryTerms",
+  "entryCategories",
+  "aliasOffsets",
+  "aliasStrings",
+  "patternEntries",
+  "patternLengths",
+  "categoryStrings",
+  "stateTransitions",
+  "transitionCodes",
+  "stateFail",
+  "stateOutputs",
+  "stateOutputLink",
+  "outputPatterns",
+  "byteLength"
+];
+const utf16Decoder = new TextDecoder("utf-16le");
+class PackedGlossary {
+  constructor(buffer) {
+    if (buffer.byteLength < PACK_HEADER_FIELDS.length * 4) {
+      throw new Error("Packed glossary is truncated");
+    }
+    const raw = new Uint32Array(buffer, 0, PACK_HEADER_FIELDS.length);
+    const header = {};
+    PACK_HEADER_FIELDS.forEach((name, index) => {
+      header[name] = raw[index];
+    });
+    if (header.magic !== PACK_MAGIC) {
+      throw new Error("Not a packed glossary");
+    }
+    if (header.formatVersion !== PACK_FORMAT_VERSION) {
+      throw new Error(`Unsupported packed glossary version ${header.formatVersion}`);
+    }
+    if (header.byteLength !== buffer.byteLength) {
+      throw new Error("Packed glossary size mismatch");
+    }
+    this.buffer = buffer;
+    this.header = header;
+    this.schemaVersion = header.schemaVersion;
+    this.length = header.entryCount;
+    this.patternCount = header.patternCount;
+    this.stringOffsets = new Uint32Array(buffer, header.stringOffsets, header.stringCount + 1);
+    this.stringData = new Uint16Array(buffer, header.stringData, this.stringOffsets[header.stringCount]);
+    this.entryIds = new Uint32Array(buffer, header.entryIds, header.entryCount);
+    this.entryTerms = new Uint32Array(buffer, header.entryTerms, header.entryCount);
+    this.entryCategories = new Uint16Array(buffer, header.entryCategories, header.entryCount);
+    this.aliasOffsets = new Uint32Array(buffer, header.aliasOffsets, header.entryCount + 1);
+    this.aliasStrings = new Uint32Array(buffer, header.aliasStrings, header.aliasCount);
+    this.patternEntries = new Uint32Array(buffer, header.patternEntries, header.patternCount);
+    this.patternLengths = new Uint16Array(buffer, header.patternLengths, header.patternCount);
+    this.categoryStrings = new Uint32Array(buffer, header.categoryStrings, header.categoryCount);
+    // Precompiled Aho-Corasick automaton (see compile_automaton in build_glossary.py)
+    this.stateTransitions = new Uint32Array(buffer, header.stateTransitions, header.stateCount + 1);
+    this.transitionCodes = new Uint16Array(buffer, header.transitionCodes, header.transitionCount);
+    this.stateFail = new Uint32Array(buffer, header.stateFail, header.stateCount);
+    this.stateOutputs = new Uint32Array(buffer, header.stateOutputs, header.stateCount + 1);
+    this.stateOutputLink = new Uint32Array(buffer, header.stateOutputLink, header.stateCount);
+    this.outputPatterns = new Uint32Array(buffer, header.outputPatterns, header.outputCount);
+    this.entryCache = new Map();
+    this.idIndex = null;
+  }
+  getString(index) {
+    const start = this.stringOffsets[index];
+    const end = this.stringOffsets[index + 1];
+    return utf16Decoder.decode(this.stringData.subarray(start, end));
+  }
+  getEntry(index) {
+    if (index < 0 || index >= this.length) return undefined;
+    let entry = this.entryCache.get(index);
+    if (!entry) {
+      const aliases = [];
+      for (let a = this.aliasOffsets[index]; a < this.aliasOffsets[index + 1]; a++) {
+        aliases.push(this.getString(this.aliasStrings[a]));
+      }
+      entry = {
+        id: this.getString(this.entryIds[index]),
+        term: this.getString(this.entryTerms[index]),
+        aliases,
+        category: this.getString(this.categoryStrings[this.entryCategories[index]])
+      };
+      this.entryCache.set(index, entry);
+    }
+    return entry;
+  }
+  findEntry(id) {
+    if (!this.idIndex) {
+      this.idIndex = new Map();
+      for (let index = 0; index < this.length; index++) {
+        this.idIndex.set(this.getString(this.entryIds[index]), index);
+      }
+    }
+    const index = this.idIndex.get(id);
+    return index === undefined ? undefined : this.getEntry(index);
+  }
+}
 // Worker is now initialized in scanner.js or index.js, but we need to pass data to it.
 // We will store the patterns in the store, and let scanner init the worker.
+const createListGlossary = (items) => {
+  let byId = null;
+  return {
+    length: items.length,
+    getEntry: (index) => items[index],
+    findEntry: (id) => {
+      byId = byId || new Map(items.map((item) => [item.id, item]));
+      return byId.get(id);
+    }
+  };
+};
+const loadPacked = async (name) => {
+  const response = await fetch(chrome.runtime.getURL(`data/${name}`));
+  if (!response.ok) throw new Error(`HTTP ${response.status}`);
+  return new PackedGlossary(await response.arrayBuffer());
+};
+const loadJsonIndex = async (lang) => {
+  const index = await fetch(chrome.runtime.getURL(`data/glossary_${lang}_index.json`)).then((r) => r.json());
+  return index.items || index;
+};
+// Create lightweight patterns for Worker (avoid sending full entry objects)
+// { p: pattern, i: entry index, l: term length }
+const buildPatterns = (items, lowercase) => {
+  const patterns = [];
+  items.forEach((entry, index) => {
+    patterns.push({
+      p: lowercase ? entry.term.toLowerCase() : entry.term,
+      i: index,
+      l: entry.term.length
+    });
+    (entry.aliases || []).forEach((alias) => {
+      patterns.push({
+        p: lowercase ? alias.toLowerCase() : alias,
+        i: index,
+        l: alias.length
+      });
+    });
+  });
+  return patterns;
+};
+const loadDomainIndex = async () => {
+  try {
+    const response = await fetch(chrome.runtime.getURL("data/glossary_domains.json"));
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return await response.json();
+  } catch (error) {
+    console.warn("Domain packs unavailable, loading the whole glossary:", error);
+    return null;
+  }
+};
+const findSiteDomain = (index, hostname) => {
+  if (!index?.sites) return null;
+  const labels = hostname.toLowerCase().split(".");
+  for (let i = 0; i < labels.length - 1; i++) {
+    const domain = index.sites[labels.slice(i).join(".")];
+    if (domain && index.domains?.[domain]) return domain;
+  }
+  return null;
+};
+const loadLanguage = async (lang, domain) => {
+  const packs = [[`glossary_${lang}_hot.bin`, true], [`glossary_${lang}.bin`, false]];
+  if (domain) packs.unshift([`glossary_${lang}_${domain}.bin`, true]);
+  for (const [name, partial] of packs) {
+    try {
+      const packed = await loadPacked(name);
+      return { glossary: packed, pack: packed.buffer, patterns: null, partial };
+    } catch (error) {
+      console.warn(`Packed ${lang} glossary ${name} unavailable:`, error);
+    }
+  }
+  const items = await loadJsonIndex(lang);
+  return {
+    glossary: createListGlossary(items),
+    pack: null,
+    patterns: buildPatterns(items, lang === "en"),
+    partial: false
+  };
+};
 const loadGlossary = async () => {
-  const results = await Promise.allSettled([
-    fetch(chrome.runtime.getURL("data/glossary_en_index.json")).then((r) => r.json()),
-    fetch(chrome.runtime.getURL("data/glossary_zh_index.json")).then((r) => r.json())
-  ]);
-  const enIndex = results[0].status === 'fulfilled' ? results[0].value : { items: [] };
+  const { settings } = store.getState();
+  const siteDomain = settings.allDomains ? null : findSiteDomain(await loadDomainIndex(), location.hostname);
+  const results = await Promise.allSettled([loadLanguage("en", siteDomain), loadLanguage("zh", siteDomain)]);
+  const empty = { glossary: createListGlossary([]), pack: null, patterns: [], partial: false };
+  const en = results[0].status === 'fulfilled' ? results[0].value : empty;
   if (results[0].status === 'rejected') {
     console.warn('Failed to load English glossary:', results[0].reason);
   }
-  const zhIndex = results[1].status === 'fulfilled' ? results[1].value : { items: [] };
+  const zh = results[1].status === 'fulfilled' ? results[1].value : empty;
   if (results[1].status === 'rejected') {
     console.warn('Failed to load Chinese glossary:', results[1].reason);
   }
   store.setState({
-    glossaryEn: enIndex.items || enIndex,
-    glossaryZh: zhIndex.items || zhIndex
+    glossaryEn: en.glossary,
+    glossaryZh: zh.glossary,
+    enPack: en.pack,
+    zhPack: zh.pack,
+    enPatterns: en.patterns,
+    zhPatterns: zh.patterns,
+    siteDomain,
+    partialLangs: [["en", en], ["zh", zh]].filter(([, result]) => result.partial).map(([lang]) => lang),
+    glossaryLoaded: true
+  });
+};
+const loadFullGlossary = () => {
+  const { fullGlossaryPromise, partialLangs } = store.getState();
+  if (fullGlossaryPromise) return fullGlossaryPromise;
+  const load = (lang) => loadPacked(`glossary_${lang}.bin`).catch((error) => {
+    console.warn(`Full ${lang} glossary unavailable, keeping the partial pack:`, error);
+    return null;
+  });
+  const promise = Promise.all(partialLangs.map(load)).then((packed) => {
+    const full = {};
+    partialLangs.forEach((lang, index) => {
+      if (packed[index]) full[lang] = packed[index];
+    });
+    return full;
+  });
+  store.setState({ fullGlossaryPromise: promise });
+  return promise;
+};
+const findRelatedEntries = async (ids, lang) => {
+  if (!ids?.length) return [];
+  const full = await loadFullGlossary();
+  const glossary = full[lang] || store.getState()[lang === "en" ? "glossaryEn" : "glossaryZh"];
+  return ids.map((id) => glossary?.findEntry(id)).filter(Boolean);
+};
+const useFullGlossary = async () => {
+  const full = await loadFullGlossary();
+  const { partialLangs, scanToken, siteDomain } = store.getState();
+  const update = {};
+  const packs = {};
+  partialLangs.forEach((lang) => {
+    if (!full[lang]) return;
+    update[lang === "en" ? "glossaryEn" : "glossaryZh"] = full[lang];
+    packs[`${lang}Pack`] = full[lang].buffer;
+  });
+  if (!Object.keys(packs).length) return packs;
+  store.setState({
+    ...update,
+    ...packs,
+    siteDomain: null,
+    partialLangs: partialLangs.filter((lang) => !full[lang]),
+    scanToken: siteDomain ? scanToken + 1 : scanToken
+  });
+  return packs;
+};
+// FNV-1a over the QID's characters; QIDs are ASCII, so this matches
+// fnv1a32() over UTF-8 bytes in tools/build_glossary.py.
+const hashDetailKey = (key) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < key.length; i++) {
+    hash ^= key.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+};
+const shardNameFor = (id, shardCount) => {
+  const width = (shardCount - 1).toString(16).length;
+  return (hashDetailKey(id) % shardCount).toString(16).padStart(width, "0");
+};
+const fetchData = (path) =>
+  fetch(chrome.runtime.getURL(path)).then((r) => {
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    return r.json();
   });
+// Resolves to the shard index, or null when the build has no shards and the
+// monolithic glossary_detail.json has to be used instead.
+const loadDetailIndex = () => {
+  const { detailIndexPromise } = store.getState();
+  if (detailIndexPromise) return detailIndexPromise;
+  const promise = fetchData("data/detail/index.json")
+    .then((index) => (index?.shardCount > 0 ? index : null))
+    .catch(() => null);
+  store.setState({ detailIndexPromise: promise });
+  return promise;
+};
+const loadDetailMap = async () => {
   const state = store.getState();
-  const enPatterns = [];
-  // Create lightweight patterns for Worker (avoid sending full entry objects)
-  state.glossaryEn.forEach((entry, index) => {
-    // 0: pattern, 1: id (index), 2: term (for length check in worker if needed, or just pattern length)
-    // Actually worker needs pattern string to build trie.
-    // We pass: { p: pattern, i: index, t: term }
-    // Minify property names to save slightly on serialization
-    enPatterns.push({
-      p: entry.term.toLowerCase(),
-      i: index,
-      l: entry.term.length 
+  if (state.detailMap) return state.detailMap;
+  if (state.detailPromise) return state.detailPromise;
+  const promise = fetchData("data/glossary_detail.json")
+    .then((data) => {
+      const detailMap = data.items || {};
+      store.setState({ detailMap });
+      return detailMap;
+    })
+    .finally(() => {
+      store.setState({ detailPromise: null });
     });
-    (entry.aliases || []).forEach((alias) => {
-      enPatterns.push({
-        p: alias.toLowerCase(),
-        i: index,
-        l: alias.length
-      });
+  store.setState({ detailPromise: promise });
+  return promise;
+};
+// Decoded shards are kept in a small LRU (Map insertion order = recency).
+const touchShard = (name, items) => {
+  const { detailShards } = store.getState();
+  detailShards.delete(name);
+  detailShards.set(name, items);
+  while (detailShards.size > DETAIL_CONFIG.SHARD_CACHE_SIZE) {
+    detailShards.delete(detailShards.keys().next().value);
+  }
+  return items;
+};
+const loadShard = (name) => {
+  const { detailShards, detailShardPromises } = store.getState();
+  if (detailShards.has(name)) return Promise.resolve(touchShard(name, detailShards.get(name)));
+  if (detailShardPromises.has(name)) return detailShardPromises.get(name);
+  const promise = fetchData(`data/detail/${name}.json`)
+    .then((data) => touchShard(name, data.items || {}))
+    .finally(() => {
+      detailShardPromises.delete(name);
     });
-  });
-  const zhPatterns = [];
-  state.glossaryZh.forEach((entry, index) => {
-    zhPatterns.push({
-      p: entry.term,
-      i: index,
-      l: entry.term.length
+  detailShardPromises.set(name, promise);
+  return promise;
+};
+const loadDetail = async (id) => {
+  store.setState({ detailLoadError: false });
+  try {
+    const index = await loadDetailIndex();
+    const items = index
+      ? await loadShard(shardNameFor(id, index.shardCount))
+      : await loadDetailMap();
+    return items[id] || null;
+  } catch (error) {
+    store.setState({ detailLoadError: true });
+    return null;
+  }
+};
+const getCachedDetail = (id) => {
+  const { detailShards, detailMap } = store.getState();
+  for (const items of detailShards.values()) {
+    if (items[id]) return items[id];
+  }
+  return detailMap?.[id] || null;
+};
+// Reader for the sidebar search index written by tools/build_glossary.py
+// (build_search_index). Layout: a header of little-endian uint32 fields
+// (SEARCH_HEADER_FIELDS order) followed by 4-byte aligned typed-array sections.
+const SEARCH_FORMAT_VERSION = 1;
+const SEARCH_MAGIC = 0x53475354; // "TSGS"
+const SEARCH_HEADER_FIELDS = [
+  "magic",
+  "formatVersion",
+  "schemaVersion",
+  "entryCount",
+  "keyCount",
+  "gramSize",
+  "gramCount",
+  "postingCount",
+  "postingBytes",
+  "keyOffsets",
+  "keyData",
+  "keyEntries",
+  "gramUnits",
+  "gramPostingOffsets",
+  "gramPostings",
+  "byteLength"
+];
+// Result ranks, best first.
+const SEARCH_RANK = {
+  exact: 0,
+  prefix: 1,
+  infix: 2,
+  fuzzy: 3
+};
+const searchDecoder = new TextDecoder("utf-16le");
+class SearchIndex {
+  constructor(buffer) {
+    if (buffer.byteLength < SEARCH_HEADER_FIELDS.length * 4) {
+      throw new Error("Search index is truncated");
+    }
+    const raw = new Uint32Array(buffer, 0, SEARCH_HEADER_FIELDS.length);
+    const header = {};
+    SEARCH_HEADER_FIELDS.forEach((name, index) => {
+      header[name] = raw[index];
     });
-    (entry.aliases || []).forEach((alias) => {
-      zhPatterns.push({
-        p: alias,
-        i: index,
-        l: alias.length
-      });
+    if (header.magic !== SEARCH_MAGIC) {
+      throw new Error("Not a search index");
+    }
+    if (header.formatVersion !== SEARCH_FORMAT_VERSION) {
+      throw new Error(`Unsupported search index version ${header.formatVersion}`);
+    }
+    if (header.byteLength !== buffer.byteLength) {
+      throw new Error("Search index size mismatch");
+    }
+    this.schemaVersion = header.schemaVersion;
+    this.entryCount = header.entryCount;
+    this.keyCount = header.keyCount;
+    this.gramSize = header.gramSize;
+    this.gramCount = header.gramCount;
+    this.keyOffsets = new Uint32Array(buffer, header.keyOffsets, header.keyCount + 1);
+    this.keyData = new Uint16Array(buffer, header.keyData, this.keyOffsets[header.keyCount]);
+    this.keyEntries = new Uint32Array(buffer, header.keyEntries, header.keyCount);
+    this.gramUnits = new Uint16Array(buffer, header.gramUnits, header.gramCount * header.gramSize);
+    this.gramPostingOffsets = new Uint32Array(buffer, header.gramPostingOffsets, header.gramCount + 1);
+    // Varint-encoded gaps between ascending key indexes, byte ranges per gram.
+    this.gramPostings = new Uint8Array(buffer, header.gramPostings, header.postingBytes);
+    // Per-key n-gram hit counters, reset after every query.
+    this.hits = new Uint16Array(header.keyCount);
+  }
+  getKey(key) {
+    return searchDecoder.decode(this.keyData.subarray(this.keyOffsets[key], this.keyOffsets[key + 1]));
+  }
+  // Compares key `key` with the first `length` code units of `query`:
+  // negative when the key sorts first, 0 when the key starts with them.
+  comparePrefix(key, query, length) {
+    const start = this.keyOffsets[key];
+    const keyLength = this.keyOffsets[key + 1] - start;
+    for (let i = 0; i < length; i++) {
+      if (i >= keyLength) return -1;
+      const diff = this.keyData[start + i] - query.charCodeAt(i);
+      if (diff) return diff;
+    }
+    return 0;
+  }
+  findGram(gram) {
+    const size = this.gramSize;
+    let lo = 0;
+    let hi = this.gramCount - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >> 1;
+      let diff = 0;
+      for (let i = 0; i < size && !diff; i++) {
+        diff = this.gramUnits[mid * size + i] - gram.charCodeAt(i);
+      }
+      if (!diff) return mid;
+      if (diff < 0) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return -1;
+  }
+  search(query, { limit, fuzzyRatio }) {
+    const results = new Map();
+    const add = (key, rank, score) => {
+      const entry = this.keyEntries[key];
+      const previous = results.get(entry);
+      if (!previous || rank < previous.rank || (rank === previous.rank && score > previous.score)) {
+        results.set(entry, { entry, key, rank, score });
+      }
+    };
+    // Prefix range: lower bound, then walk while keys keep the prefix.
+    let lo = 0;
+    let hi = this.keyCount;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.comparePrefix(mid, query, query.length) < 0) lo = mid + 1;
+      else hi = mid;
+    }
+    for (let key = lo; key < this.keyCount && results.size < limit; key++) {
+      if (this.comparePrefix(key, query, query.length) !== 0) break;
+      const exact = this.keyOffsets[key + 1] - this.keyOffsets[key] === query.length;
+      add(key, exact ? SEARCH_RANK.exact : SEARCH_RANK.prefix, query.length);
+    }
+    // n-gram postings: all grams present = infix candidate, enough of them = fuzzy match.
+    const grams = new Set();
+    for (let offset = 0; offset + this.gramSize <= query.length; offset++) {
+      grams.add(query.substr(offset, this.gramSize));
+    }
+    if (grams.size) {
+      const touched = [];
+      for (const text of grams) {
+        const gram = this.findGram(text);
+        if (gram < 0) continue;
+        const postings = this.gramPostings;
+        const end = this.gramPostingOffsets[gram + 1];
+        let key = 0;
+        for (let p = this.gramPostingOffsets[gram]; p < end;) {
+          let gap = 0;
+          let shift = 0;
+          let byte;
+          do {
+            byte = postings[p++];
+            gap |= (byte & 0x7f) << shift;
+            shift += 7;
+          } while (byte & 0x80);
+          key += gap;
+          if (this.hits[key]++ === 0) touched.push(key);
+        }
+      }
+      const required = Math.max(1, Math.ceil(grams.size * fuzzyRatio));
+      for (const key of touched) {
+        const hits = this.hits[key];
+        this.hits[key] = 0;
+        if (hits < required) continue;
+        if (hits === grams.size && this.getKey(key).includes(query)) {
+          add(key, SEARCH_RANK.infix, hits);
+        } else {
+          add(key, SEARCH_RANK.fuzzy, hits);
+        }
+      }
+    }
+    const ranked = Array.from(results.values());
+    const keyLength = (key) => this.keyOffsets[key + 1] - this.keyOffsets[key];
+    ranked.sort((a, b) => (
+      a.rank - b.rank ||
+      b.score - a.score ||
+      keyLength(a.key) - keyLength(b.key) ||
+      a.key - b.key
+    ));
+    return ranked.slice(0, limit);
+  }
+}
+const loadSearchPack = async (lang) => {
+  const response = await fetch(chrome.runtime.getURL(`data/search_${lang}.bin`));
+  if (!response.ok) throw new Error(`HTTP ${response.status}`);
+  return new SearchIndex(await response.arrayBuffer());
+};
+const loadSearchIndexes = () => {
+  const { searchIndexPromise } = store.getState();
+  if (searchIndexPromise) return searchIndexPromise;
+  const load = (lang, glossary) => loadSearchPack(lang)
+    .then((index) => (index.entryCount === glossary?.length ? index : null))
+    .catch((error) => {
+      console.warn(`Search index for ${lang} unavailable:`, error);
+      return null;
+    });
+  const promise = loadFullGlossary()
+    .then(async (full) => {
+      const { glossaryEn, glossaryZh } = store.getState();
+      const searchGlossaries = { en: full.en || glossaryEn, zh: full.zh || glossaryZh };
+      const [en, zh] = await Promise.all([load("en", searchGlossaries.en), load("zh", searchGlossaries.zh)]);
+      const searchIndexes = { en, zh };
+      store.setState({ searchIndexes, searchGlossaries });
+      return searchIndexes;
+    });
+  store.setState({ searchIndexPromise: promise });
+  return promise;
+};
+const normalizeQuery = (query, lang) => {
+  const collapsed = query.trim().split(/\s+/).join(" ");
+  return lang === "en" ? collapsed.toLowerCase() : collapsed;
+};
+const searchGlossary = (query) => {
+  const { searchIndexes, searchGlossaries } = store.getState();
+  if (!searchIndexes) return null;
+  const options = { limit: SEARCH_CONFIG.RESULT_LIMIT, fuzzyRatio: SEARCH_CONFIG.FUZZY_RATIO };
+  const hits = [];
+  [["en", searchGlossaries.en], ["zh", searchGlossaries.zh]].forEach(([lang, glossary]) => {
+    const index = searchIndexes[lang];
+    const normalized = normalizeQuery(query, lang);
+    if (!index || !normalized) return;
+    index.search(normalized, options).forEach((hit) => {
+      hits.push({ ...hit, entry: glossary.getEntry(hit.entry) });
     });
   });
-  store.setState({
-    enPatterns,
-    zhPatterns,
-    glossaryLoaded: true
+  hits.sort((a, b) => a.rank - b.rank || b.score - a.score);
+  const seen = new Set();
+  const items = [];
+  hits.forEach(({ entry }) => {
+    if (!entry) return;
+    const key = entry.term.toLowerCase();
+    if (seen.has(key)) return;
+    seen.add(key);
+    items.push({
+      term: entry.term,
+      count: 0,
+      category: entry.category || "",
+      source: "local",
+      entry
+    });
   });
+  return items;
 };
 const extractVisibleTextNodes = function* (options = {}) {
   const includeCode = Boolean(options.includeCode);
@@ -279,11 +854,11 @@ const initWorker = async () => {
       }
     });
     workerInstance = proxy;
-    // Send init data
-    const { enPatterns, zhPatterns } = store.getState();
+    // Send init data (packed buffers when available, pattern lists otherwise)
+    const { enPack, zhPack, enPatterns, zhPatterns } = store.getState();
     workerInstance.postMessage({
       type: 'INIT',
-      payload: { enPatterns, zhPatterns }
+      payload: { enPack, zhPack, enPatterns, zhPatterns }
     });
     return workerInstance;
   })();
@@ -340,7 +915,7 @@ const finalizeScan = (task) => {
   const hydrate = (matches, lang) => matches.map(m => {
     const chunk = chunkMap.get(m.chunkId);
     // Lookup entry from store using index
-    const entry = lang === 'en' ? state.glossaryEn[m.i] : state.glossaryZh[m.i];
+    const entry = lang === 'en' ? state.glossaryEn.getEntry(m.i) : state.glossaryZh.getEntry(m.i);
     return {
       term: entry ? entry.term : "Unknown", // Reconstruct term
       entry: entry,
@@ -435,7 +1010,10 @@ const scanPage = async (options = {}) => {
   };
   let i = 0;
   for (const node of nodeGenerator) {
-    if (token !== store.getState().scanToken) return;
+    if (token !== store.getState().scanToken) {
+      scanTasks.delete(token);
+      return;
+    }
     // node can be null if generator yields for time slicing
     if (!node) {
         await sleep(1); // Yield to main thread
@@ -481,6 +1059,14 @@ const scanPage = async (options = {}) => {
           finalizeScan(task);
       }
   }
+};
+const attachFullGlossary = async () => {
+  const packs = await useFullGlossary();
+  if (!workerInstance || !Object.keys(packs).length) return;
+  workerInstance.postMessage({ type: 'LOAD_PACKS', payload: packs });
+  if (store.getState().sidebarOpen || scanTasks.size) {
+    await scanPage();
+  }
 };
  // Circular dependency?
 // scanPage imports updateSidebarList from sidebar-manager.
@@ -504,43 +1090,53 @@ const updateStatus = (status) => {
 const updateSidebarList = () => {
   const { port, searchQuery, listItems, settings } = store.getState();
   if (!port) return;
-  const filtered = searchQuery
-    ? listItems.filter((item) => item.term.toLowerCase().includes(searchQuery.toLowerCase()))
-    : listItems;
+  let items = listItems;
+  let searchItems = [];
+  if (searchQuery) {
+    const query = searchQuery.toLowerCase();
+    items = listItems.filter((item) => item.term.toLowerCase().includes(query));
+    const hits = searchGlossary(searchQuery);
+    if (hits) {
+      const onPage = new Set(listItems.map((item) => item.term.toLowerCase()));
+      searchItems = hits.filter((item) => !onPage.has(item.term.toLowerCase()));
+    } else {
+      loadSearchIndexes().then(() => {
+        if (store.getState().searchQuery === searchQuery) updateSidebarList();
+      });
+    }
+  }
+  store.setState({ searchItems });
   port.postMessage({
     type: MESSAGE_TYPES.list,
-    items: filtered,
-    total: listItems.length,
+    items: searchItems.length ? [...items, ...searchItems] : items,
+    total: listItems.length + searchItems.length,
     language: getLanguage(settings),
     query: searchQuery
   });
 };
-const loadDetailMap = async () => {
-  const state = store.getState();
-  if (state.detailMap) return state.detailMap;
-  if (state.detailPromise) return state.detailPromise;
-  store.setState({ detailLoadError: false });
-  const promise = fetch(chrome.runtime.getURL("data/glossary_detail.json"))
-    .then((r) => r.json())
-    .then((data) => {
-      const detailMap = data.items || {};
-      store.setState({ detailMap, detailLoadError: false });
-      return detailMap;
-    })
-    .catch(() => {
-      store.setState({ detailMap: {}, detailLoadError: true });
-      return {};
-    })
-    .finally(() => {
-      store.setState({ detailPromise: null });
-    });
-  store.setState({ detailPromise: promise });
-  return promise;
+const findListItem = (term) => {
+  const { listItems, searchItems, relatedItems } = store.getState();
+  return listItems.find((item) => item.term === term)
+    || searchItems.find((item) => item.term === term)
+    || relatedItems.find((item) => item.term === term);
+};
+const withRelatedTerms = async (entry, lang) => {
+  const ids = entry?.detail?.related;
+  if (!ids?.length) return entry;
+  const relatedItems = (await findRelatedEntries(ids, lang)).map((related) => ({
+    term: related.term,
+    count: 0,
+    category: related.category || "",
+    source: "local",
+    entry: related
+  }));
+  store.setState({ relatedItems });
+  return { ...entry, detail: { ...entry.detail, related: relatedItems.map((item) => item.term) } };
 };
 const updateDetail = async (term) => {
-  const { port, listItems, onlineResults, settings } = store.getState();
+  const { port, onlineResults, settings } = store.getState();
   if (!port) return;
-  const item = listItems.find((entry) => entry.term === term);
+  const item = findListItem(term);
   let entry = item?.entry || null;
   const online = onlineResults[term] || [];
   const count = item?.count || 0;
@@ -557,9 +1153,9 @@ const updateDetail = async (term) => {
     });
   }
   if (entry?.id) {
-    const detailMap = await loadDetailMap();
-    if (detailMap[entry.id]) {
-      entry = detailMap[entry.id];
+    const detail = await loadDetail(entry.id);
+    if (detail) {
+      entry = await withRelatedTerms(detail, lang);
     }
   }
   const { detailLoadError } = store.getState();
@@ -709,8 +1305,8 @@ const scrollToTerm = (term) => {
   }
 };
 // Import resources directly (will be inlined by bundler)
-const sidebarHtml = "<div class=\"ts-container\">\n  <div class=\"ts-resize-handle\" title=\"Drag to resize\"></div>\n  <button class=\"ts-float-toggle\" aria-label=\"Toggle\">T</button>\n  <aside class=\"ts-sidebar\">\n    <header class=\"ts-header\">\n      <div class=\"ts-title\" data-i18n=\"title\"></div>\n      <div class=\"ts-controls\">\n        <select class=\"ts-language\">\n          <option value=\"auto\" data-i18n=\"languageAuto\"></option>\n          <option value=\"en\" data-i18n=\"languageEn\"></option>\n          <option value=\"zh_CN\" data-i18n=\"languageZh\"></option>\n        </select>\n        <button class=\"ts-btn ts-rescan\" data-i18n=\"rescan\"></button>\n        <button class=\"ts-btn ts-settings\" data-i18n=\"settings\"></button>\n      </div>\n      <div class=\"ts-search-row\">\n        <input class=\"ts-search\" type=\"search\" data-i18n-placeholder=\"searchPlaceholder\" />\n        <button class=\"ts-btn ts-clear-search\" data-i18n=\"clearSearch\"></button>\n      </div>\n      <div class=\"ts-summary\"></div>\n    </header>\n    <section class=\"ts-list\"></section>\n    <div class=\"ts-empty\"></div>\n    <section class=\"ts-detail-drawer\" aria-hidden=\"true\">\n      <div class=\"ts-detail-backdrop\" data-action=\"close\"></div>\n      <div class=\"ts-detail-panel\" role=\"dialog\" aria-modal=\"true\">\n        <header class=\"ts-detail-top\">\n          <div class=\"ts-detail-title\">\n            <div class=\"ts-detail-title-zh\"></div>\n            <div class=\"ts-detail-title-en\"></div>\n          </div>\n          <div class=\"ts-detail-top-actions\">\n            <button class=\"ts-btn ts-detail-copy\" data-i18n=\"detailCopyFull\" data-i18n-aria=\"detailCopyFull\" aria-label=\"\"></button>\n            <button class=\"ts-btn ts-detail-close\" data-i18n=\"detailClose\" data-i18n-aria=\"detailClose\" aria-label=\"\"></button>\n          </div>\n        </header>\n        <div class=\"ts-detail-meta\"></div>\n        <div class=\"ts-detail-body\">\n          <div class=\"ts-detail-state ts-detail-loading\">\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 70%;\"></div>\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 90%;\"></div>\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 85%;\"></div>\n          </div>\n          <div class=\"ts-detail-state ts-detail-empty\" data-i18n=\"detailEmpty\"></div>\n          <div class=\"ts-detail-state ts-detail-error\" data-i18n=\"detailError\"></div>\n          <div class=\"ts-detail-content\">\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailDefinition\"></div>\n              <div class=\"ts-detail-definition\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailExplanation\"></div>\n              <div class=\"ts-detail-explanation\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailScenarios\"></div>\n              <div class=\"ts-detail-scenarios\">\n                <div class=\"ts-detail-scenario\">\n                  <div class=\"ts-detail-scenario-title\" data-i18n=\"detailUse\"></div>\n                  <ul class=\"ts-detail-use-list\"></ul>\n                </div>\n                <div class=\"ts-detail-scenario\">\n                  <div class=\"ts-detail-scenario-title\" data-i18n=\"detailAvoid\"></div>\n                  <ul class=\"ts-detail-avoid-list\"></ul>\n                </div>\n              </div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailExamples\"></div>\n              <div class=\"ts-detail-examples\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailPitfalls\"></div>\n              <ul class=\"ts-detail-pitfalls\"></ul>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailRelated\"></div>\n              <div class=\"ts-detail-related\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailSources\"></div>\n              <div class=\"ts-detail-sources\"></div>\n            </section>\n          </div>\n        </div>\n        <div class=\"ts-detail-actions\">\n          <button class=\"ts-btn ts-highlight\" data-i18n=\"highlight\"></button>\n          <button class=\"ts-btn ts-online\" data-i18n=\"onlineResolve\"></button>\n          <button class=\"ts-btn ts-online-refresh\" data-i18n=\"onlineRefresh\"></button>\n        </div>\n      </div>\n    </section>\n    <section class=\"ts-settings-panel\">\n      <div class=\"ts-settings-title\" data-i18n=\"settingsTitle\"></div>\n      <label class=\"ts-setting\">\n        <span data-i18n=\"listLimit\"></span>\n        <select class=\"ts-setting-limit\">\n          <option value=\"20\">20</option>\n          <option value=\"30\">30</option>\n          <option value=\"40\">40</option>\n        </select>\n      </label>\n      <label class=\"ts-setting\">\n        <span data-i18n=\"theme\"></span>\n        <select class=\"ts-setting-theme\">\n          <option value=\"auto\" data-i18n=\"themeAuto\"></option>\n          <option value=\"light\" data-i18n=\"themeLight\"></option>\n          <option value=\"dark\" data-i18n=\"themeDark\"></option>\n        </select>\n      </label>\n      <label class=\"ts-setting\">\n        <input class=\"ts-setting-include-code\" type=\"checkbox\" />\n        <span data-i18n=\"includeCode\"></span>\n      </label>\n      <label class=\"ts-setting\">\n        <input class=\"ts-setting-online\" type=\"checkbox\" />\n        <span data-i18n=\"onlineEnable\"></span>\n      </label>\n      <button class=\"ts-btn ts-clear-cache\" data-i18n=\"clearCache\"></button>\n      <div class=\"ts-about\" data-i18n=\"cedictAbout\"></div>\n    </section>\n    <footer class=\"ts-footer\">\n      <div class=\"ts-status\"></div>\n    </footer>\n    <div class=\"ts-toast\"></div>\n    <div class=\"ts-tutorial\" aria-hidden=\"true\">\n      <div class=\"ts-tutorial-backdrop\"></div>\n      <div class=\"ts-tutorial-card\" role=\"dialog\" aria-modal=\"true\">\n        <div class=\"ts-tutorial-header\">\n          <div class=\"ts-tutorial-icon\" aria-hidden=\"true\">\n            <svg viewBox=\"0 0 24 24\" width=\"24\" height=\"24\" fill=\"none\">\n              <circle cx=\"12\" cy=\"12\" r=\"10\" stroke=\"currentColor\" stroke-width=\"1.5\"></circle>\n              <path d=\"M12 7.2a1.2 1.2 0 1 0 0 2.4a1.2 1.2 0 0 0 0-2.4Z\" fill=\"currentColor\"></path>\n              <path d=\"M11 11.2h2V16h-2z\" fill=\"currentColor\"></path>\n            </svg>\n          </div>\n          <div class=\"ts-tutorial-title\" data-i18n=\"tutorialTitle\"></div>\n        </div>\n        <div class=\"ts-tutorial-body\">\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep1\"></div>\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep2\"></div>\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep3\"></div>\n        </div>\n        <button class=\"ts-btn ts-tutorial-close\" data-i18n=\"tutorialStart\"></button>\n      </div>\n    </div>\n  </aside>\n</div>\n";
-const sidebarCss = ":host {\n  --ts-bg: #ffffff;\n  --ts-text: #111827;\n  --ts-muted: #6b7280;\n  --ts-border: #e5e7eb;\n  --ts-accent: #2563eb;\n  --ts-accent-hover: #1d4ed8;\n  --ts-surface: #f9fafb;\n  --ts-sidebar-width: 380px;\n  --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);\n  font-family: system-ui, -apple-system, \"Segoe UI\", sans-serif;\n}\n\n:host([data-theme=\"dark\"]) {\n  --ts-bg: #0f172a;\n  --ts-text: #e2e8f0;\n  --ts-muted: #94a3b8;\n  --ts-border: #1f2937;\n  --ts-accent: #60a5fa;\n  --ts-accent-hover: #3b82f6;\n  --ts-surface: #1e293b;\n  --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3), 0 2px 4px -1px rgba(0, 0, 0, 0.18);\n}\n\n:host([data-theme=\"auto\"]) {\n  color-scheme: light dark;\n}\n\n@media (prefers-color-scheme: dark) {\n  :host([data-theme=\"auto\"]) {\n    --ts-bg: #0f172a;\n    --ts-text: #e2e8f0;\n    --ts-muted: #94a3b8;\n    --ts-border: #1f2937;\n    --ts-accent: #60a5fa;\n    --ts-accent-hover: #3b82f6;\n    --ts-surface: #1e293b;\n    --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3), 0 2px 4px -1px rgba(0, 0, 0, 0.18);\n  }\n}\n\n.ts-container {\n  position: fixed;\n  right: 0;\n  bottom: 0;\n  z-index: 2147483646;\n  pointer-events: none;\n}\n\n.ts-resize-handle {\n  position: absolute;\n  left: 0;\n  top: 0;\n  bottom: 0;\n  width: 14px;\n  cursor: ew-resize;\n  z-index: 2147483647;\n  background: transparent;\n  transition: background 0.2s;\n  pointer-events: auto;\n  transform: translateX(-50%);\n}\n\n.ts-resize-handle:hover {\n  background: rgba(0, 0, 0, 0.05);\n}\n\n:host([data-theme=\"dark\"]) .ts-resize-handle:hover {\n  background: rgba(255, 255, 255, 0.1);\n}\n\n\n.ts-float-toggle {\n  \n  position: fixed;\n  right: 20px;\n  bottom: 20px;\n  width: 44px;\n  height: 44px;\n  border-radius: 22px;\n  border: 1px solid var(--ts-border);\n  background: var(--ts-accent);\n  color: #fff;\n  font-weight: 700;\n  cursor: pointer;\n  pointer-events: auto;\n  box-shadow: 0 6px 18px rgba(0, 0, 0, 0.18);\n  transition: transform 0.3s cubic-bezier(0.34, 1.56, 0.64, 1), box-shadow 0.3s ease, background-color 0.2s;\n  display: flex;\n  align-items: center;\n  justify-content: center;\n  will-change: transform;\n}\n\n.ts-float-toggle:hover {\n  transform: scale(1.1);\n  box-shadow: 0 8px 24px rgba(0, 0, 0, 0.25);\n  background: var(--ts-accent-hover);\n}\n\n.ts-float-toggle:active {\n  transform: scale(0.95);\n}\n\n\n.ts-sidebar {\n  position: fixed;\n  right: 0;\n  top: 0;\n  height: 100vh;\n  width: var(--ts-sidebar-width);\n  background: var(--ts-bg);\n  border-left: 1px solid var(--ts-border);\n  box-shadow: -8px 0 20px rgba(0, 0, 0, 0.12);\n  display: flex;\n  flex-direction: column;\n  transform: translate3d(100%, 0, 0); \n  transition: transform 0.35s cubic-bezier(0.16, 1, 0.3, 1); \n  will-change: transform;\n  pointer-events: auto;\n}\n\n:host([data-open=\"true\"]) .ts-sidebar {\n  transform: translate3d(0, 0, 0);\n}\n\n.ts-header {\n  padding: 14px;\n  border-bottom: 1px solid var(--ts-border);\n  background: var(--ts-surface);\n}\n\n.ts-title {\n  font-size: 16px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 8px;\n}\n\n.ts-controls {\n  display: flex;\n  gap: 6px;\n  margin-bottom: 8px;\n}\n\n.ts-search-row {\n  display: flex;\n  gap: 6px;\n  align-items: center;\n}\n\n.ts-language,\n.ts-search,\n.ts-btn,\n.ts-setting select {\n  border: 1px solid var(--ts-border);\n  background: var(--ts-bg);\n  color: var(--ts-text);\n  border-radius: 6px;\n  padding: 6px 8px;\n  font-size: 12px;\n  transition: border-color 0.2s, background-color 0.2s, transform 0.1s;\n}\n\n.ts-language:hover,\n.ts-search:hover,\n.ts-btn:hover:not([disabled]),\n.ts-setting select:hover {\n  border-color: var(--ts-muted);\n}\n\n.ts-search {\n  flex: 1;\n  min-width: 0;\n}\n\n.ts-search:focus {\n  outline: 2px solid var(--ts-accent);\n  outline-offset: -1px;\n  border-color: transparent;\n}\n\n.ts-btn {\n  cursor: pointer;\n  white-space: nowrap;\n  user-select: none;\n}\n\n.ts-btn:hover:not([disabled]) {\n  background: var(--ts-surface);\n}\n\n.ts-btn:active:not([disabled]) {\n  background: var(--ts-border);\n  transform: translateY(1px);\n}\n\n.ts-btn[disabled] {\n  opacity: 0.5;\n  cursor: not-allowed;\n}\n\n.ts-summary {\n  margin-top: 6px;\n  font-size: 11px;\n  color: var(--ts-muted);\n}\n\n.ts-list {\n  flex: 1;\n  overflow: auto;\n  padding: 10px 12px;\n  display: block;\n}\n\n.ts-empty {\n  display: none;\n  padding: 20px;\n  font-size: 13px;\n  color: var(--ts-muted);\n  text-align: center;\n}\n\n\n.ts-item {\n  box-sizing: border-box;\n  height: 56px;\n  border: 1px solid transparent;\n  border-bottom: 1px solid var(--ts-border);\n  border-radius: 6px;\n  padding: 8px 10px;\n  background: transparent;\n  display: grid;\n  gap: 2px;\n  cursor: pointer;\n  \n  transition: background-color 0.15s ease, transform 0.15s cubic-bezier(0.2, 0, 0, 1);\n  margin-bottom: 8px;\n  will-change: transform; \n}\n\n.ts-item:hover {\n  background: var(--ts-surface);\n  transform: translate3d(4px, 0, 0); \n}\n\n\n.ts-item-detail-container {\n  margin-top: 4px;\n  padding: 8px 16px 16px 16px;\n  background: transparent; \n  border-radius: 8px;\n  border: none; \n  font-size: 14px;\n  line-height: 1.6;\n  cursor: default;\n  overflow-y: auto; \n  box-shadow: none; \n  \n}\n\n\n.ts-detail-enter {\n  animation: ts-slide-down 0.3s cubic-bezier(0.16, 1, 0.3, 1);\n}\n\n@keyframes ts-slide-down {\n  from { opacity: 0; transform: translateY(-8px); max-height: 0; }\n  to { opacity: 1; transform: translateY(0); max-height: 500px; }\n}\n\n.ts-item-expanded {\n  \n  border-color: var(--ts-accent);\n  background: var(--ts-surface);\n  box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);\n  z-index: 1; \n}\n\n.ts-item-expanded:hover {\n  transform: none; \n}\n\n.ts-item-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  width: 100%;\n}\n\n.ts-detail-definition {\n  color: var(--ts-text);\n  margin-bottom: 16px;\n  font-weight: 500;\n  font-size: 16px; \n  line-height: 1.7; \n}\n\n.ts-badge {\n  display: inline-block;\n  padding: 2px 8px;\n  border-radius: 4px;\n  font-size: 11px;\n  font-weight: 600;\n  background: var(--ts-accent);\n  color: #fff;\n  margin-bottom: 8px;\n  opacity: 0.9;\n}\n\n.ts-detail-examples {\n  margin-bottom: 16px;\n  background: var(--ts-bg); \n  padding: 12px;\n  border-radius: 6px;\n  border: 1px solid var(--ts-border); \n}\n\n.ts-detail-label {\n  font-size: 11px;\n  text-transform: uppercase;\n  letter-spacing: 0.5px;\n  color: var(--ts-muted);\n  margin-bottom: 8px;\n  font-weight: 600;\n}\n\n.ts-detail-examples ul {\n  margin: 0;\n  padding-left: 20px;\n  list-style-type: disc;\n}\n\n.ts-detail-examples li {\n  margin-bottom: 4px;\n  color: var(--ts-text);\n  font-style: italic;\n  font-size: 13px;\n}\n\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  margin-bottom: 12px;\n  justify-content: flex-end; \n}\n\n\n.ts-icon-btn {\n  background: transparent;\n  border: 1px solid transparent;\n  color: var(--ts-muted);\n  padding: 6px;\n  border-radius: 6px;\n  display: flex;\n  align-items: center;\n  justify-content: center;\n  transition: all 0.2s;\n}\n\n.ts-icon-btn:hover {\n  background: var(--ts-surface);\n  color: var(--ts-accent);\n  border-color: var(--ts-border);\n}\n\n\n.ts-badge {\n  display: inline-block;\n  padding: 2px 8px;\n  border-radius: 12px;\n  font-size: 11px;\n  font-weight: 600;\n  margin-bottom: 8px;\n}\n\n.ts-badge-category {\n  background: var(--ts-accent);\n  color: #fff;\n  background: color-mix(in srgb, var(--ts-accent), white 80%); \n  color: var(--ts-accent-hover);\n  border: 1px solid color-mix(in srgb, var(--ts-accent), transparent 80%);\n}\n\n:host([data-theme=\"dark\"]) .ts-badge-category {\n  background: color-mix(in srgb, var(--ts-accent), black 60%);\n  color: var(--ts-accent);\n}\n\n.ts-detail-sources {\n  font-size: 11px;\n  color: var(--ts-muted);\n  border-top: 1px solid var(--ts-border);\n  padding-top: 12px;\n  display: flex;\n  flex-direction: column;\n  gap: 4px;\n}\n\n.ts-online-def {\n  margin-top: 4px;\n  color: var(--ts-text);\n  background: var(--ts-surface);\n  padding: 4px 8px;\n  border-radius: 4px;\n}\n\n.ts-item-active {\n  background: var(--ts-surface);\n  border-left: 3px solid var(--ts-accent);\n  border-bottom-color: var(--ts-border);\n}\n\n.ts-item-term {\n  font-weight: 600;\n  color: var(--ts-text);\n  display: flex;\n  align-items: center;\n  gap: 6px;\n  white-space: nowrap;\n  overflow: hidden;\n  text-overflow: ellipsis;\n  font-size: 14px;\n}\n\n.ts-item-count {\n  font-size: 10px;\n  padding: 1px 6px;\n  border-radius: 10px;\n  background: var(--ts-border);\n  color: var(--ts-text);\n  flex-shrink: 0;\n  font-weight: 500;\n}\n\n.ts-item-category {\n  font-size: 11px;\n  color: var(--ts-muted);\n  white-space: nowrap;\n  overflow: hidden;\n  text-overflow: ellipsis;\n}\n\n.ts-detail-drawer {\n  position: absolute;\n  inset: 0;\n  display: none;\n  z-index: 50;\n}\n.ts-detail-drawer.open {\n  display: block;\n}\n.ts-detail-backdrop {\n  position: absolute;\n  inset: 0;\n  background: rgba(0,0,0,0.25);\n}\n.ts-detail-panel {\n  position: absolute;\n  top: 8px;\n  left: 8px;\n  right: 8px;\n  bottom: 8px;\n  display: grid;\n  grid-template-rows: auto 1fr auto;\n  background: var(--ts-bg);\n  border: 1px solid var(--ts-border);\n  border-radius: 10px;\n  box-shadow: 0 8px 28px rgba(0,0,0,0.2);\n}\n.ts-detail-top {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  padding: 12px 14px;\n  border-bottom: 1px solid var(--ts-border);\n}\n.ts-detail-title-zh {\n  font-size: 20px;\n  font-weight: 700;\n  color: var(--ts-text);\n}\n.ts-detail-title-en {\n  font-size: 14px;\n  color: var(--ts-muted);\n}\n.ts-detail-top-actions {\n  display: flex;\n  gap: 8px;\n}\n.ts-detail-meta {\n  padding: 10px 14px;\n  font-size: 12px;\n  color: var(--ts-muted);\n  border-bottom: 1px solid var(--ts-border);\n}\n.ts-detail-body {\n  padding: 12px 14px;\n  overflow: auto;\n  min-height: 70vh;\n}\n.ts-detail-state { display: none; }\n.ts-detail-state.show { display: block; }\n.ts-detail-content { display: none; }\n.ts-detail-content.show { display: block; }\n.ts-detail-section { margin-bottom: 16px; }\n.ts-detail-section-title {\n  font-size: 12px;\n  font-weight: 700;\n  color: var(--ts-muted);\n  text-transform: uppercase;\n  letter-spacing: .6px;\n  margin-bottom: 8px;\n}\n.ts-detail-explanation {\n  font-size: 14px;\n  line-height: 1.7;\n  color: var(--ts-text);\n}\n.ts-detail-scenarios {\n  display: grid;\n  grid-template-columns: 1fr 1fr;\n  gap: 12px;\n}\n.ts-detail-scenario-title {\n  font-size: 12px;\n  font-weight: 600;\n  color: var(--ts-text);\n  margin-bottom: 6px;\n}\n.ts-detail-examples pre {\n  background: var(--ts-surface);\n  border: 1px solid var(--ts-border);\n  border-radius: 8px;\n  padding: 10px;\n  overflow: auto;\n  margin: 8px 0;\n}\n.ts-detail-example-title {\n  font-weight: 600;\n  margin-bottom: 4px;\n  color: var(--ts-text);\n}\n.ts-detail-example-desc {\n  font-size: 13px;\n  color: var(--ts-muted);\n  margin-bottom: 6px;\n}\n.ts-detail-pitfalls li {\n  margin-bottom: 6px;\n  color: var(--ts-text);\n}\n.ts-detail-related .ts-related-term {\n  border: 1px solid var(--ts-border);\n  background: transparent;\n  color: var(--ts-accent);\n  border-radius: 12px;\n  padding: 2px 8px;\n  cursor: pointer;\n  font-size: 12px;\n}\n.ts-detail-related .ts-related-term:hover {\n  background: var(--ts-surface);\n}\n.ts-detail-related a {\n  display: inline-block;\n  margin-right: 8px;\n  margin-bottom: 6px;\n  padding: 2px 8px;\n  border-radius: 12px;\n  border: 1px solid var(--ts-border);\n  color: var(--ts-accent);\n  text-decoration: none;\n}\n.ts-detail-examples .ts-detail-example {\n  margin-bottom: 12px;\n}\n@media (max-width: 640px) {\n  .ts-detail-scenarios {\n    grid-template-columns: 1fr;\n  }\n}\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  justify-content: flex-end;\n  padding: 10px 14px;\n  border-top: 1px solid var(--ts-border);\n}\n\n@keyframes ts-fade-in {\n  from { opacity: 0; transform: translateY(5px); }\n  to { opacity: 1; transform: translateY(0); }\n}\n\n.ts-detail-header {\n  margin-bottom: 16px;\n  padding-bottom: 16px;\n  border-bottom: 1px solid var(--ts-border);\n}\n\n.ts-detail-term {\n  font-size: 24px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 6px;\n  line-height: 1.2;\n}\n\n.ts-detail-meta {\n  font-size: 12px;\n  color: var(--ts-muted);\n}\n\n.ts-detail-definition {\n  font-size: 15px;\n  line-height: 1.6;\n  color: var(--ts-text);\n  margin-bottom: 20px;\n}\n\n.ts-detail-examples {\n  margin-bottom: 20px;\n}\n\n.ts-example {\n  background: var(--ts-surface);\n  padding: 10px 12px;\n  border-radius: 6px;\n  margin-bottom: 8px;\n  font-size: 13px;\n  color: var(--ts-text);\n  border-left: 3px solid var(--ts-accent);\n  line-height: 1.5;\n}\n\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  margin-top: auto;\n  padding-top: 16px;\n  border-top: 1px solid var(--ts-border);\n}\n\n.ts-detail-sources {\n  margin-top: 12px;\n  font-size: 11px;\n  color: var(--ts-muted);\n}\n\n.ts-tutorial {\n  position: fixed;\n  inset: 0;\n  z-index: 9999;\n  display: none;\n  align-items: center;\n  justify-content: center;\n}\n\n.ts-tutorial.show {\n  display: flex;\n}\n\n.ts-tutorial-backdrop {\n  position: absolute;\n  inset: 0;\n  background: rgba(0, 0, 0, 0.45);\n  backdrop-filter: blur(6px);\n}\n\n.ts-tutorial-card {\n  position: relative;\n  width: min(92vw, 420px);\n  background: var(--ts-surface);\n  border: 1px solid var(--ts-border);\n  border-radius: 16px;\n  padding: 18px;\n  box-shadow: 0 16px 40px rgba(0, 0, 0, 0.18);\n  color: var(--ts-text);\n  display: flex;\n  flex-direction: column;\n  gap: 14px;\n}\n\n.ts-tutorial-header {\n  display: flex;\n  align-items: center;\n  gap: 10px;\n}\n\n.ts-tutorial-icon {\n  width: 36px;\n  height: 36px;\n  border-radius: 10px;\n  background: rgba(79, 70, 229, 0.12);\n  color: var(--ts-accent);\n  display: inline-flex;\n  align-items: center;\n  justify-content: center;\n}\n\n.ts-tutorial-title {\n  font-size: 16px;\n  font-weight: 700;\n}\n\n.ts-tutorial-body {\n  display: grid;\n  gap: 8px;\n  font-size: 13px;\n  color: var(--ts-muted);\n  line-height: 1.6;\n}\n\n.ts-tutorial-item {\n  padding: 8px 10px;\n  border-radius: 10px;\n  background: var(--ts-surface-strong, rgba(148, 163, 184, 0.08));\n  border: 1px solid var(--ts-border);\n}\n\n.ts-tutorial-close {\n  align-self: flex-end;\n}\n\n\n\n.ts-skeleton {\n  background: linear-gradient(90deg, var(--ts-surface) 25%, var(--ts-border) 40%, var(--ts-surface) 75%);\n  background-size: 200% 100%;\n  animation: ts-shimmer 1.5s infinite linear; \n  border-radius: 4px;\n  display: inline-block;\n  will-change: background-position;\n}\n\n@keyframes ts-shimmer {\n  0% { background-position: 200% 0; }\n  100% { background-position: -200% 0; }\n}\n\n.ts-skeleton-text {\n  height: 14px;\n  width: 100%;\n  margin-bottom: 8px;\n}\n\n.ts-skeleton-title {\n  height: 24px;\n  width: 60%;\n  margin-bottom: 12px;\n}\n\n\n.ts-toast {\n  position: absolute;\n  bottom: 20px;\n  left: 50%;\n  transform: translateX(-50%) translateY(20px);\n  background: var(--ts-text);\n  color: var(--ts-bg);\n  padding: 8px 16px;\n  border-radius: 20px;\n  font-size: 12px;\n  font-weight: 500;\n  opacity: 0;\n  pointer-events: none;\n  transition: opacity 0.3s, transform 0.3s;\n  box-shadow: 0 4px 12px rgba(0,0,0,0.15);\n  z-index: 100;\n}\n\n.ts-toast.show {\n  opacity: 1;\n  transform: translateX(-50%) translateY(0);\n}\n\n.ts-settings-panel {\n  display: none;\n  flex: 1;\n  padding: 16px;\n  overflow: auto;\n  animation: ts-fade-in 0.2s ease-out;\n}\n\n.ts-settings-title {\n  font-size: 18px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 20px;\n  padding-bottom: 10px;\n  border-bottom: 1px solid var(--ts-border);\n}\n\n.ts-setting {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  margin-bottom: 16px;\n  font-size: 14px;\n  color: var(--ts-text);\n}\n\n.ts-about {\n  margin-top: 32px;\n  font-size: 12px;\n  color: var(--ts-muted);\n  line-height: 1.6;\n  padding-top: 16px;\n  border-top: 1px solid var(--ts-border);\n}\n\n.ts-footer {\n  padding: 10px 16px;\n  border-top: 1px solid var(--ts-border);\n  background: var(--ts-surface);\n  font-size: 11px;\n  color: var(--ts-muted);\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n}\n\n\n\n::-webkit-scrollbar {\n  width: 8px; \n  height: 8px;\n}\n\n::-webkit-scrollbar-thumb {\n  background: var(--ts-border);\n  border-radius: 4px;\n  border: 2px solid var(--ts-bg); \n}\n\n::-webkit-scrollbar-thumb:hover {\n  background: var(--ts-muted);\n}\n";
+const sidebarHtml = "<div class=\"ts-container\">\n  <div class=\"ts-resize-handle\" title=\"Drag to resize\"></div>\n  <button class=\"ts-float-toggle\" aria-label=\"Toggle\">T</button>\n  <aside class=\"ts-sidebar\">\n    <header class=\"ts-header\">\n      <div class=\"ts-title\" data-i18n=\"title\"></div>\n      <div class=\"ts-controls\">\n        <select class=\"ts-language\">\n          <option value=\"auto\" data-i18n=\"languageAuto\"></option>\n          <option value=\"en\" data-i18n=\"languageEn\"></option>\n          <option value=\"zh_CN\" data-i18n=\"languageZh\"></option>\n        </select>\n        <button class=\"ts-btn ts-rescan\" data-i18n=\"rescan\"></button>\n        <button class=\"ts-btn ts-settings\" data-i18n=\"settings\"></button>\n      </div>\n      <div class=\"ts-search-row\">\n        <input class=\"ts-search\" type=\"search\" data-i18n-placeholder=\"searchPlaceholder\" />\n        <button class=\"ts-btn ts-clear-search\" data-i18n=\"clearSearch\"></button>\n      </div>\n      <div class=\"ts-summary\"></div>\n    </header>\n    <section class=\"ts-list\"></section>\n    <div class=\"ts-empty\"></div>\n    <section class=\"ts-detail-drawer\" aria-hidden=\"true\">\n      <div class=\"ts-detail-backdrop\" data-action=\"close\"></div>\n      <div class=\"ts-detail-panel\" role=\"dialog\" aria-modal=\"true\">\n        <header class=\"ts-detail-top\">\n          <div class=\"ts-detail-title\">\n            <div class=\"ts-detail-title-zh\"></div>\n            <div class=\"ts-detail-title-en\"></div>\n          </div>\n          <div class=\"ts-detail-top-actions\">\n            <button class=\"ts-btn ts-detail-copy\" data-i18n=\"detailCopyFull\" data-i18n-aria=\"detailCopyFull\" aria-label=\"\"></button>\n            <button class=\"ts-btn ts-detail-close\" data-i18n=\"detailClose\" data-i18n-aria=\"detailClose\" aria-label=\"\"></button>\n          </div>\n        </header>\n        <div class=\"ts-detail-meta\"></div>\n        <div class=\"ts-detail-body\">\n          <div class=\"ts-detail-state ts-detail-loading\">\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 70%;\"></div>\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 90%;\"></div>\n            <div class=\"ts-skeleton ts-skeleton-text\" style=\"width: 85%;\"></div>\n          </div>\n          <div class=\"ts-detail-state ts-detail-empty\" data-i18n=\"detailEmpty\"></div>\n          <div class=\"ts-detail-state ts-detail-error\" data-i18n=\"detailError\"></div>\n          <div class=\"ts-detail-content\">\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailDefinition\"></div>\n              <div class=\"ts-detail-definition\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailExplanation\"></div>\n              <div class=\"ts-detail-explanation\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailScenarios\"></div>\n              <div class=\"ts-detail-scenarios\">\n                <div class=\"ts-detail-scenario\">\n                  <div class=\"ts-detail-scenario-title\" data-i18n=\"detailUse\"></div>\n                  <ul class=\"ts-detail-use-list\"></ul>\n                </div>\n                <div class=\"ts-detail-scenario\">\n                  <div class=\"ts-detail-scenario-title\" data-i18n=\"detailAvoid\"></div>\n                  <ul class=\"ts-detail-avoid-list\"></ul>\n                </div>\n              </div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailExamples\"></div>\n              <div class=\"ts-detail-examples\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailPitfalls\"></div>\n              <ul class=\"ts-detail-pitfalls\"></ul>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailRelated\"></div>\n              <div class=\"ts-detail-related\"></div>\n            </section>\n            <section class=\"ts-detail-section\">\n              <div class=\"ts-detail-section-title\" data-i18n=\"detailSources\"></div>\n              <div class=\"ts-detail-sources\"></div>\n            </section>\n          </div>\n        </div>\n        <div class=\"ts-detail-actions\">\n          <button class=\"ts-btn ts-highlight\" data-i18n=\"highlight\"></button>\n          <button class=\"ts-btn ts-online\" data-i18n=\"onlineResolve\"></button>\n          <button class=\"ts-btn ts-online-refresh\" data-i18n=\"onlineRefresh\"></button>\n        </div>\n      </div>\n    </section>\n    <section class=\"ts-settings-panel\">\n      <div class=\"ts-settings-title\" data-i18n=\"settingsTitle\"></div>\n      <label class=\"ts-setting\">\n        <span data-i18n=\"listLimit\"></span>\n        <select class=\"ts-setting-limit\">\n          <option value=\"20\">20</option>\n          <option value=\"30\">30</option>\n          <option value=\"40\">40</option>\n        </select>\n      </label>\n      <label class=\"ts-setting\">\n        <span data-i18n=\"theme\"></span>\n        <select class=\"ts-setting-theme\">\n          <option value=\"auto\" data-i18n=\"themeAuto\"></option>\n          <option value=\"light\" data-i18n=\"themeLight\"></option>\n          <option value=\"dark\" data-i18n=\"themeDark\"></option>\n        </select>\n      </label>\n      <label class=\"ts-setting\">\n        <input class=\"ts-setting-include-code\" type=\"checkbox\" />\n        <span data-i18n=\"includeCode\"></span>\n      </label>\n      <label class=\"ts-setting\">\n        <input class=\"ts-setting-all-domains\" type=\"checkbox\" />\n        <span data-i18n=\"allDomains\"></span>\n      </label>\n      <label class=\"ts-setting\">\n        <input class=\"ts-setting-online\" type=\"checkbox\" />\n        <span data-i18n=\"onlineEnable\"></span>\n      </label>\n      <button class=\"ts-btn ts-clear-cache\" data-i18n=\"clearCache\"></button>\n      <div class=\"ts-cache-stats\"></div>\n      <div class=\"ts-about\" data-i18n=\"cedictAbout\"></div>\n    </section>\n    <footer class=\"ts-footer\">\n      <div class=\"ts-status\"></div>\n    </footer>\n    <div class=\"ts-toast\"></div>\n    <div class=\"ts-tutorial\" aria-hidden=\"true\">\n      <div class=\"ts-tutorial-backdrop\"></div>\n      <div class=\"ts-tutorial-card\" role=\"dialog\" aria-modal=\"true\">\n        <div class=\"ts-tutorial-header\">\n          <div class=\"ts-tutorial-icon\" aria-hidden=\"true\">\n            <svg viewBox=\"0 0 24 24\" width=\"24\" height=\"24\" fill=\"none\">\n              <circle cx=\"12\" cy=\"12\" r=\"10\" stroke=\"currentColor\" stroke-width=\"1.5\"></circle>\n              <path d=\"M12 7.2a1.2 1.2 0 1 0 0 2.4a1.2 1.2 0 0 0 0-2.4Z\" fill=\"currentColor\"></path>\n              <path d=\"M11 11.2h2V16h-2z\" fill=\"currentColor\"></path>\n            </svg>\n          </div>\n          <div class=\"ts-tutorial-title\" data-i18n=\"tutorialTitle\"></div>\n        </div>\n        <div class=\"ts-tutorial-body\">\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep1\"></div>\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep2\"></div>\n          <div class=\"ts-tutorial-item\" data-i18n=\"tutorialStep3\"></div>\n        </div>\n        <button class=\"ts-btn ts-tutorial-close\" data-i18n=\"tutorialStart\"></button>\n      </div>\n    </div>\n  </aside>\n</div>\n";
+const sidebarCss = ":host {\n  --ts-bg: #ffffff;\n  --ts-text: #111827;\n  --ts-muted: #6b7280;\n  --ts-border: #e5e7eb;\n  --ts-accent: #2563eb;\n  --ts-accent-hover: #1d4ed8;\n  --ts-surface: #f9fafb;\n  --ts-sidebar-width: 380px;\n  --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);\n  font-family: system-ui, -apple-system, \"Segoe UI\", sans-serif;\n}\n\n:host([data-theme=\"dark\"]) {\n  --ts-bg: #0f172a;\n  --ts-text: #e2e8f0;\n  --ts-muted: #94a3b8;\n  --ts-border: #1f2937;\n  --ts-accent: #60a5fa;\n  --ts-accent-hover: #3b82f6;\n  --ts-surface: #1e293b;\n  --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3), 0 2px 4px -1px rgba(0, 0, 0, 0.18);\n}\n\n:host([data-theme=\"auto\"]) {\n  color-scheme: light dark;\n}\n\n@media (prefers-color-scheme: dark) {\n  :host([data-theme=\"auto\"]) {\n    --ts-bg: #0f172a;\n    --ts-text: #e2e8f0;\n    --ts-muted: #94a3b8;\n    --ts-border: #1f2937;\n    --ts-accent: #60a5fa;\n    --ts-accent-hover: #3b82f6;\n    --ts-surface: #1e293b;\n    --ts-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3), 0 2px 4px -1px rgba(0, 0, 0, 0.18);\n  }\n}\n\n.ts-container {\n  position: fixed;\n  right: 0;\n  bottom: 0;\n  z-index: 2147483646;\n  pointer-events: none;\n}\n\n.ts-resize-handle {\n  position: absolute;\n  left: 0;\n  top: 0;\n  bottom: 0;\n  width: 14px;\n  cursor: ew-resize;\n  z-index: 2147483647;\n  background: transparent;\n  transition: background 0.2s;\n  pointer-events: auto;\n  transform: translateX(-50%);\n}\n\n.ts-resize-handle:hover {\n  background: rgba(0, 0, 0, 0.05);\n}\n\n:host([data-theme=\"dark\"]) .ts-resize-handle:hover {\n  background: rgba(255, 255, 255, 0.1);\n}\n\n\n.ts-float-toggle {\n  \n  position: fixed;\n  right: 20px;\n  bottom: 20px;\n  width: 44px;\n  height: 44px;\n  border-radius: 22px;\n  border: 1px solid var(--ts-border);\n  background: var(--ts-accent);\n  color: #fff;\n  font-weight: 700;\n  cursor: pointer;\n  pointer-events: auto;\n  box-shadow: 0 6px 18px rgba(0, 0, 0, 0.18);\n  transition: transform 0.3s cubic-bezier(0.34, 1.56, 0.64, 1), box-shadow 0.3s ease, background-color 0.2s;\n  display: flex;\n  align-items: center;\n  justify-content: center;\n  will-change: transform;\n}\n\n.ts-float-toggle:hover {\n  transform: scale(1.1);\n  box-shadow: 0 8px 24px rgba(0, 0, 0, 0.25);\n  background: var(--ts-accent-hover);\n}\n\n.ts-float-toggle:active {\n  transform: scale(0.95);\n}\n\n\n.ts-sidebar {\n  position: fixed;\n  right: 0;\n  top: 0;\n  height: 100vh;\n  width: var(--ts-sidebar-width);\n  background: var(--ts-bg);\n  border-left: 1px solid var(--ts-border);\n  box-shadow: -8px 0 20px rgba(0, 0, 0, 0.12);\n  display: flex;\n  flex-direction: column;\n  transform: translate3d(100%, 0, 0); \n  transition: transform 0.35s cubic-bezier(0.16, 1, 0.3, 1); \n  will-change: transform;\n  pointer-events: auto;\n}\n\n:host([data-open=\"true\"]) .ts-sidebar {\n  transform: translate3d(0, 0, 0);\n}\n\n.ts-header {\n  padding: 14px;\n  border-bottom: 1px solid var(--ts-border);\n  background: var(--ts-surface);\n}\n\n.ts-title {\n  font-size: 16px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 8px;\n}\n\n.ts-controls {\n  display: flex;\n  gap: 6px;\n  margin-bottom: 8px;\n}\n\n.ts-search-row {\n  display: flex;\n  gap: 6px;\n  align-items: center;\n}\n\n.ts-language,\n.ts-search,\n.ts-btn,\n.ts-setting select {\n  border: 1px solid var(--ts-border);\n  background: var(--ts-bg);\n  color: var(--ts-text);\n  border-radius: 6px;\n  padding: 6px 8px;\n  font-size: 12px;\n  transition: border-color 0.2s, background-color 0.2s, transform 0.1s;\n}\n\n.ts-language:hover,\n.ts-search:hover,\n.ts-btn:hover:not([disabled]),\n.ts-setting select:hover {\n  border-color: var(--ts-muted);\n}\n\n.ts-search {\n  flex: 1;\n  min-width: 0;\n}\n\n.ts-search:focus {\n  outline: 2px solid var(--ts-accent);\n  outline-offset: -1px;\n  border-color: transparent;\n}\n\n.ts-btn {\n  cursor: pointer;\n  white-space: nowrap;\n  user-select: none;\n}\n\n.ts-btn:hover:not([disabled]) {\n  background: var(--ts-surface);\n}\n\n.ts-btn:active:not([disabled]) {\n  background: var(--ts-border);\n  transform: translateY(1px);\n}\n\n.ts-btn[disabled] {\n  opacity: 0.5;\n  cursor: not-allowed;\n}\n\n.ts-summary {\n  margin-top: 6px;\n  font-size: 11px;\n  color: var(--ts-muted);\n}\n\n.ts-list {\n  flex: 1;\n  overflow: auto;\n  padding: 10px 12px;\n  display: block;\n}\n\n.ts-empty {\n  display: none;\n  padding: 20px;\n  font-size: 13px;\n  color: var(--ts-muted);\n  text-align: center;\n}\n\n\n.ts-item {\n  box-sizing: border-box;\n  height: 56px;\n  border: 1px solid transparent;\n  border-bottom: 1px solid var(--ts-border);\n  border-radius: 6px;\n  padding: 8px 10px;\n  background: transparent;\n  display: grid;\n  gap: 2px;\n  cursor: pointer;\n  \n  transition: background-color 0.15s ease, transform 0.15s cubic-bezier(0.2, 0, 0, 1);\n  margin-bottom: 8px;\n  will-change: transform; \n}\n\n.ts-item:hover {\n  background: var(--ts-surface);\n  transform: translate3d(4px, 0, 0); \n}\n\n\n.ts-item-detail-container {\n  margin-top: 4px;\n  padding: 8px 16px 16px 16px;\n  background: transparent; \n  border-radius: 8px;\n  border: none; \n  font-size: 14px;\n  line-height: 1.6;\n  cursor: default;\n  overflow-y: auto; \n  box-shadow: none; \n  \n}\n\n\n.ts-detail-enter {\n  animation: ts-slide-down 0.3s cubic-bezier(0.16, 1, 0.3, 1);\n}\n\n@keyframes ts-slide-down {\n  from { opacity: 0; transform: translateY(-8px); max-height: 0; }\n  to { opacity: 1; transform: translateY(0); max-height: 500px; }\n}\n\n.ts-item-expanded {\n  \n  border-color: var(--ts-accent);\n  background: var(--ts-surface);\n  box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);\n  z-index: 1; \n}\n\n.ts-item-expanded:hover {\n  transform: none; \n}\n\n.ts-item-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  width: 100%;\n}\n\n.ts-detail-definition {\n  color: var(--ts-text);\n  margin-bottom: 16px;\n  font-weight: 500;\n  font-size: 16px; \n  line-height: 1.7; \n}\n\n.ts-badge {\n  display: inline-block;\n  padding: 2px 8px;\n  border-radius: 4px;\n  font-size: 11px;\n  font-weight: 600;\n  background: var(--ts-accent);\n  color: #fff;\n  margin-bottom: 8px;\n  opacity: 0.9;\n}\n\n.ts-detail-examples {\n  margin-bottom: 16px;\n  background: var(--ts-bg); \n  padding: 12px;\n  border-radius: 6px;\n  border: 1px solid var(--ts-border); \n}\n\n.ts-detail-label {\n  font-size: 11px;\n  text-transform: uppercase;\n  letter-spacing: 0.5px;\n  color: var(--ts-muted);\n  margin-bottom: 8px;\n  font-weight: 600;\n}\n\n.ts-detail-examples ul {\n  margin: 0;\n  padding-left: 20px;\n  list-style-type: disc;\n}\n\n.ts-detail-examples li {\n  margin-bottom: 4px;\n  color: var(--ts-text);\n  font-style: italic;\n  font-size: 13px;\n}\n\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  margin-bottom: 12px;\n  justify-content: flex-end; \n}\n\n\n.ts-icon-btn {\n  background: transparent;\n  border: 1px solid transparent;\n  color: var(--ts-muted);\n  padding: 6px;\n  border-radius: 6px;\n  display: flex;\n  align-items: center;\n  justify-content: center;\n  transition: all 0.2s;\n}\n\n.ts-icon-btn:hover {\n  background: var(--ts-surface);\n  color: var(--ts-accent);\n  border-color: var(--ts-border);\n}\n\n\n.ts-badge {\n  display: inline-block;\n  padding: 2px 8px;\n  border-radius: 12px;\n  font-size: 11px;\n  font-weight: 600;\n  margin-bottom: 8px;\n}\n\n.ts-badge-category {\n  background: var(--ts-accent);\n  color: #fff;\n  background: color-mix(in srgb, var(--ts-accent), white 80%); \n  color: var(--ts-accent-hover);\n  border: 1px solid color-mix(in srgb, var(--ts-accent), transparent 80%);\n}\n\n:host([data-theme=\"dark\"]) .ts-badge-category {\n  background: color-mix(in srgb, var(--ts-accent), black 60%);\n  color: var(--ts-accent);\n}\n\n.ts-detail-sources {\n  font-size: 11px;\n  color: var(--ts-muted);\n  border-top: 1px solid var(--ts-border);\n  padding-top: 12px;\n  display: flex;\n  flex-direction: column;\n  gap: 4px;\n}\n\n.ts-online-def {\n  margin-top: 4px;\n  color: var(--ts-text);\n  background: var(--ts-surface);\n  padding: 4px 8px;\n  border-radius: 4px;\n}\n\n.ts-item-active {\n  background: var(--ts-surface);\n  border-left: 3px solid var(--ts-accent);\n  border-bottom-color: var(--ts-border);\n}\n\n.ts-item-term {\n  font-weight: 600;\n  color: var(--ts-text);\n  display: flex;\n  align-items: center;\n  gap: 6px;\n  white-space: nowrap;\n  overflow: hidden;\n  text-overflow: ellipsis;\n  font-size: 14px;\n}\n\n.ts-item-count {\n  font-size: 10px;\n  padding: 1px 6px;\n  border-radius: 10px;\n  background: var(--ts-border);\n  color: var(--ts-text);\n  flex-shrink: 0;\n  font-weight: 500;\n}\n\n.ts-item-category {\n  font-size: 11px;\n  color: var(--ts-muted);\n  white-space: nowrap;\n  overflow: hidden;\n  text-overflow: ellipsis;\n}\n\n.ts-detail-drawer {\n  position: absolute;\n  inset: 0;\n  display: none;\n  z-index: 50;\n}\n.ts-detail-drawer.open {\n  display: block;\n}\n.ts-detail-backdrop {\n  position: absolute;\n  inset: 0;\n  background: rgba(0,0,0,0.25);\n}\n.ts-detail-panel {\n  position: absolute;\n  top: 8px;\n  left: 8px;\n  right: 8px;\n  bottom: 8px;\n  display: grid;\n  grid-template-rows: auto 1fr auto;\n  background: var(--ts-bg);\n  border: 1px solid var(--ts-border);\n  border-radius: 10px;\n  box-shadow: 0 8px 28px rgba(0,0,0,0.2);\n}\n.ts-detail-top {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  padding: 12px 14px;\n  border-bottom: 1px solid var(--ts-border);\n}\n.ts-detail-title-zh {\n  font-size: 20px;\n  font-weight: 700;\n  color: var(--ts-text);\n}\n.ts-detail-title-en {\n  font-size: 14px;\n  color: var(--ts-muted);\n}\n.ts-detail-top-actions {\n  display: flex;\n  gap: 8px;\n}\n.ts-detail-meta {\n  padding: 10px 14px;\n  font-size: 12px;\n  color: var(--ts-muted);\n  border-bottom: 1px solid var(--ts-border);\n}\n.ts-detail-body {\n  padding: 12px 14px;\n  overflow: auto;\n  min-height: 70vh;\n}\n.ts-detail-state { display: none; }\n.ts-detail-state.show { display: block; }\n.ts-detail-content { display: none; }\n.ts-detail-content.show { display: block; }\n.ts-detail-section { margin-bottom: 16px; }\n.ts-detail-section-title {\n  font-size: 12px;\n  font-weight: 700;\n  color: var(--ts-muted);\n  text-transform: uppercase;\n  letter-spacing: .6px;\n  margin-bottom: 8px;\n}\n.ts-detail-explanation {\n  font-size: 14px;\n  line-height: 1.7;\n  color: var(--ts-text);\n}\n.ts-detail-scenarios {\n  display: grid;\n  grid-template-columns: 1fr 1fr;\n  gap: 12px;\n}\n.ts-detail-scenario-title {\n  font-size: 12px;\n  font-weight: 600;\n  color: var(--ts-text);\n  margin-bottom: 6px;\n}\n.ts-detail-examples pre {\n  background: var(--ts-surface);\n  border: 1px solid var(--ts-border);\n  border-radius: 8px;\n  padding: 10px;\n  overflow: auto;\n  margin: 8px 0;\n}\n.ts-detail-example-title {\n  font-weight: 600;\n  margin-bottom: 4px;\n  color: var(--ts-text);\n}\n.ts-detail-example-desc {\n  font-size: 13px;\n  color: var(--ts-muted);\n  margin-bottom: 6px;\n}\n.ts-detail-pitfalls li {\n  margin-bottom: 6px;\n  color: var(--ts-text);\n}\n.ts-detail-related .ts-related-term {\n  border: 1px solid var(--ts-border);\n  background: transparent;\n  color: var(--ts-accent);\n  border-radius: 12px;\n  padding: 2px 8px;\n  cursor: pointer;\n  font-size: 12px;\n}\n.ts-detail-related .ts-related-term:hover {\n  background: var(--ts-surface);\n}\n.ts-detail-related a {\n  display: inline-block;\n  margin-right: 8px;\n  margin-bottom: 6px;\n  padding: 2px 8px;\n  border-radius: 12px;\n  border: 1px solid var(--ts-border);\n  color: var(--ts-accent);\n  text-decoration: none;\n}\n.ts-detail-examples .ts-detail-example {\n  margin-bottom: 12px;\n}\n@media (max-width: 640px) {\n  .ts-detail-scenarios {\n    grid-template-columns: 1fr;\n  }\n}\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  justify-content: flex-end;\n  padding: 10px 14px;\n  border-top: 1px solid var(--ts-border);\n}\n\n@keyframes ts-fade-in {\n  from { opacity: 0; transform: translateY(5px); }\n  to { opacity: 1; transform: translateY(0); }\n}\n\n.ts-detail-header {\n  margin-bottom: 16px;\n  padding-bottom: 16px;\n  border-bottom: 1px solid var(--ts-border);\n}\n\n.ts-detail-term {\n  font-size: 24px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 6px;\n  line-height: 1.2;\n}\n\n.ts-detail-meta {\n  font-size: 12px;\n  color: var(--ts-muted);\n}\n\n.ts-detail-definition {\n  font-size: 15px;\n  line-height: 1.6;\n  color: var(--ts-text);\n  margin-bottom: 20px;\n}\n\n.ts-detail-examples {\n  margin-bottom: 20px;\n}\n\n.ts-example {\n  background: var(--ts-surface);\n  padding: 10px 12px;\n  border-radius: 6px;\n  margin-bottom: 8px;\n  font-size: 13px;\n  color: var(--ts-text);\n  border-left: 3px solid var(--ts-accent);\n  line-height: 1.5;\n}\n\n.ts-detail-actions {\n  display: flex;\n  gap: 8px;\n  margin-top: auto;\n  padding-top: 16px;\n  border-top: 1px solid var(--ts-border);\n}\n\n.ts-detail-sources {\n  margin-top: 12px;\n  font-size: 11px;\n  color: var(--ts-muted);\n}\n\n.ts-tutorial {\n  position: fixed;\n  inset: 0;\n  z-index: 9999;\n  display: none;\n  align-items: center;\n  justify-content: center;\n}\n\n.ts-tutorial.show {\n  display: flex;\n}\n\n.ts-tutorial-backdrop {\n  position: absolute;\n  inset: 0;\n  background: rgba(0, 0, 0, 0.45);\n  backdrop-filter: blur(6px);\n}\n\n.ts-tutorial-card {\n  position: relative;\n  width: min(92vw, 420px);\n  background: var(--ts-surface);\n  border: 1px solid var(--ts-border);\n  border-radius: 16px;\n  padding: 18px;\n  box-shadow: 0 16px 40px rgba(0, 0, 0, 0.18);\n  color: var(--ts-text);\n  display: flex;\n  flex-direction: column;\n  gap: 14px;\n}\n\n.ts-tutorial-header {\n  display: flex;\n  align-items: center;\n  gap: 10px;\n}\n\n.ts-tutorial-icon {\n  width: 36px;\n  height: 36px;\n  border-radius: 10px;\n  background: rgba(79, 70, 229, 0.12);\n  color: var(--ts-accent);\n  display: inline-flex;\n  align-items: center;\n  justify-content: center;\n}\n\n.ts-tutorial-title {\n  font-size: 16px;\n  font-weight: 700;\n}\n\n.ts-tutorial-body {\n  display: grid;\n  gap: 8px;\n  font-size: 13px;\n  color: var(--ts-muted);\n  line-height: 1.6;\n}\n\n.ts-tutorial-item {\n  padding: 8px 10px;\n  border-radius: 10px;\n  background: var(--ts-surface-strong, rgba(148, 163, 184, 0.08));\n  border: 1px solid var(--ts-border);\n}\n\n.ts-tutorial-close {\n  align-self: flex-end;\n}\n\n\n\n.ts-skeleton {\n  background: linear-gradient(90deg, var(--ts-surface) 25%, var(--ts-border) 40%, var(--ts-surface) 75%);\n  background-size: 200% 100%;\n  animation: ts-shimmer 1.5s infinite linear; \n  border-radius: 4px;\n  display: inline-block;\n  will-change: background-position;\n}\n\n@keyframes ts-shimmer {\n  0% { background-position: 200% 0; }\n  100% { background-position: -200% 0; }\n}\n\n.ts-skeleton-text {\n  height: 14px;\n  width: 100%;\n  margin-bottom: 8px;\n}\n\n.ts-skeleton-title {\n  height: 24px;\n  width: 60%;\n  margin-bottom: 12px;\n}\n\n\n.ts-toast {\n  position: absolute;\n  bottom: 20px;\n  left: 50%;\n  transform: translateX(-50%) translateY(20px);\n  background: var(--ts-text);\n  color: var(--ts-bg);\n  padding: 8px 16px;\n  border-radius: 20px;\n  font-size: 12px;\n  font-weight: 500;\n  opacity: 0;\n  pointer-events: none;\n  transition: opacity 0.3s, transform 0.3s;\n  box-shadow: 0 4px 12px rgba(0,0,0,0.15);\n  z-index: 100;\n}\n\n.ts-toast.show {\n  opacity: 1;\n  transform: translateX(-50%) translateY(0);\n}\n\n.ts-settings-panel {\n  display: none;\n  flex: 1;\n  padding: 16px;\n  overflow: auto;\n  animation: ts-fade-in 0.2s ease-out;\n}\n\n.ts-settings-title {\n  font-size: 18px;\n  font-weight: 700;\n  color: var(--ts-text);\n  margin-bottom: 20px;\n  padding-bottom: 10px;\n  border-bottom: 1px solid var(--ts-border);\n}\n\n.ts-setting {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  margin-bottom: 16px;\n  font-size: 14px;\n  color: var(--ts-text);\n}\n\n.ts-cache-stats {\n  margin-top: 8px;\n  font-size: 12px;\n  color: var(--ts-muted);\n}\n\n.ts-about {\n  margin-top: 32px;\n  font-size: 12px;\n  color: var(--ts-muted);\n  line-height: 1.6;\n  padding-top: 16px;\n  border-top: 1px solid var(--ts-border);\n}\n\n.ts-footer {\n  padding: 10px 16px;\n  border-top: 1px solid var(--ts-border);\n  background: var(--ts-surface);\n  font-size: 11px;\n  color: var(--ts-muted);\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n}\n\n\n\n::-webkit-scrollbar {\n  width: 8px; \n  height: 8px;\n}\n\n::-webkit-scrollbar-thumb {\n  background: var(--ts-border);\n  border-radius: 4px;\n  border: 2px solid var(--ts-bg); \n}\n\n::-webkit-scrollbar-thumb:hover {\n  background: var(--ts-muted);\n}\n";
 // --- Main Logic ---
 const resolveText = (value, langKey) => (typeof value === "string" ? value : value?.[langKey]);
 const buildExamples = (detail, entry, langKey) => {
@@ -720,11 +1316,11 @@ const buildExamples = (detail, entry, langKey) => {
   return fallback.filter(Boolean).map((text) => ({ title: "", description: text }));
 };
 const getDetailEntry = (term) => {
-  const { listItems, detailMap } = store.getState();
-  const item = listItems.find((entry) => entry.term === term);
+  const item = findListItem(term);
   let entry = item?.entry || null;
-  if (entry?.id && detailMap?.[entry.id]) {
-    entry = detailMap[entry.id];
+  const detail = entry?.id ? getCachedDetail(entry.id) : null;
+  if (detail) {
+    entry = detail;
   }
   return entry;
 };
@@ -736,6 +1332,13 @@ const needsOnlineFill = (entry, langKey) => {
   const examples = buildExamples(detail, entry, langKey);
   return !defText || !explanationText || examples.length === 0;
 };
+// Wikipedia summaries fetched at build time (build_glossary.py --summaries),
+// shaped like the background's online results.
+const buildTimeResults = (entry, lang) => {
+  const summary = entry?.summaries?.[lang];
+  if (!summary) return [];
+  return [{ ...summary, examples: [], cached: true }];
+};
 const handleOnlineResolve = async (term, force = false) => {
   const settings = store.getState().settings;
   if (!settings.onlineEnabled) return;
@@ -757,15 +1360,28 @@ const handleOnlineResolve = async (term, force = false) => {
 const ensureOnlineDetail = async (term) => {
   if (!term) return;
   const { settings, onlineResults } = store.getState();
-  if (!settings.onlineEnabled) return;
   const lang = getLanguage(settings);
   const langKey = lang === "zh" ? "zh_CN" : "en";
   const entry = getDetailEntry(term);
   if (!entry) return;
   if (!needsOnlineFill(entry, langKey)) return;
   if ((onlineResults[term] || []).length) return;
+  const prebuilt = buildTimeResults(entry, lang);
+  if (prebuilt.length) {
+    store.setState({ onlineResults: { ...onlineResults, [term]: prebuilt } });
+    await updateDetail(term);
+    return;
+  }
+  if (!settings.onlineEnabled) return;
   await handleOnlineResolve(term, true);
 };
+const sendCacheStats = async () => {
+  const response = await chrome.runtime.sendMessage({ type: MESSAGE_TYPES.cacheStats });
+  const port = store.getState().port;
+  if (response?.ok && port) {
+    port.postMessage({ type: MESSAGE_TYPES.cacheStats, stats: response.stats });
+  }
+};
 const handleMessage = async (message) => {
   if (!message) return;
   if (message.type === MESSAGE_TYPES.action) {
@@ -803,10 +1419,17 @@ const handleMessage = async (message) => {
       await chrome.runtime.sendMessage({ type: MESSAGE_TYPES.clearCache });
       store.setState({ onlineResults: {} });
       await updateDetail(message.term);
+      await sendCacheStats();
+    }
+    if (message.action === "cacheStats") {
+      await sendCacheStats();
     }
     if (message.action === "settings") {
       await saveSettings(message.settings || {});
       applySettings();
+      if (message.settings?.allDomains && store.getState().siteDomain) {
+        await attachFullGlossary();
+      }
     }
   }
 };
@@ -920,12 +1543,26 @@ const initObservers = () => {
     window.removeEventListener("scroll", scrollHandler);
   };
 };
+// Injection only compiles the hot tier; the full glossary waits for an idle
+// moment. Sites with a domain pack keep it unless allDomains is set.
+const scheduleFullGlossary = () => {
+  if (store.getState().siteDomain) return;
+  const load = () => attachFullGlossary().catch((error) => {
+    console.warn("Terminology Sidebar: failed to load the full glossary:", error);
+  });
+  if (typeof requestIdleCallback === "function") {
+    requestIdleCallback(load, { timeout: GLOSSARY_CONFIG.FULL_GLOSSARY_IDLE_TIMEOUT_MS });
+  } else {
+    setTimeout(load, 0);
+  }
+};
 const init = async () => {
   await loadSettings();
   await loadGlossary();
   await setupShadowRoot();
   await applySettings();
   await ensureTutorialOpen();
+  scheduleFullGlossary();
   const cleanup = initObservers();
   store.setState({ cleanup });
   window.addEventListener("pagehide", () => {
@@ -1,5 +1,50 @@
 // Built by tools/bundle.js
-const PROJECT_PREFIX = "ts";const STORAGE_KEYS = {  settings: `${PROJECT_PREFIX}:settings`,  onlineCache: `${PROJECT_PREFIX}:onlineCache`,  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`};const MESSAGE_TYPES = {  action: `${PROJECT_PREFIX}:action`,  list: `${PROJECT_PREFIX}:list`,  detail: `${PROJECT_PREFIX}:detail`,  status: `${PROJECT_PREFIX}:status`,  settings: `${PROJECT_PREFIX}:settings`,  visibility: `${PROJECT_PREFIX}:visibility`,  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,  clearCache: `${PROJECT_PREFIX}:clear-online-cache`};const CACHE_CONFIG = {  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days  VERSION: 'v1'};const DEFAULT_SETTINGS = {  schemaVersion: 1,  language: "auto",  includeCode: false,  sidebarWidth: 380,  theme: "auto",  listLimit: 40,  onlineEnabled: true};const renderList = (listEl, items = [], currentTerm, sendAction, formatSource, virtual = {}) => {
+const PROJECT_PREFIX = "ts";
+const STORAGE_KEYS = {
+  settings: `${PROJECT_PREFIX}:settings`,
+  onlineCache: `${PROJECT_PREFIX}:onlineCache`,
+  tutorialSeen: `${PROJECT_PREFIX}:tutorialSeen`
+};
+const MESSAGE_TYPES = {
+  action: `${PROJECT_PREFIX}:action`,
+  list: `${PROJECT_PREFIX}:list`,
+  detail: `${PROJECT_PREFIX}:detail`,
+  status: `${PROJECT_PREFIX}:status`,
+  settings: `${PROJECT_PREFIX}:settings`,
+  visibility: `${PROJECT_PREFIX}:visibility`,
+  toggle: `${PROJECT_PREFIX}:toggle-sidebar`,
+  onlineResolve: `${PROJECT_PREFIX}:online-resolve`,
+  clearCache: `${PROJECT_PREFIX}:clear-online-cache`,
+  cacheStats: `${PROJECT_PREFIX}:online-cache-stats`
+};
+const CACHE_CONFIG = {
+  TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days
+  VERSION: 'v1',
+  MEMORY_ENTRIES: 200, // results kept in the service worker's LRU
+  MAX_ENTRIES: 5000, // results kept in IndexedDB; the least recently used go first
+  TOUCH_INTERVAL_MS: 60 * 1000 // a hit rewrites a record's lastUsed at most this often
+};
+const DETAIL_CONFIG = {
+  SHARD_CACHE_SIZE: 8 // decoded detail shards kept per tab
+};
+const GLOSSARY_CONFIG = {
+  FULL_GLOSSARY_IDLE_TIMEOUT_MS: 5000 // swap in the full packs by then even if the page never idles
+};
+const SEARCH_CONFIG = {
+  RESULT_LIMIT: 50, // glossary hits per language and query
+  FUZZY_RATIO: 0.6 // share of the query's n-grams a typo match must contain
+};
+const DEFAULT_SETTINGS = {
+  schemaVersion: 1,
+  language: "auto",
+  includeCode: false,
+  sidebarWidth: 380,
+  theme: "auto",
+  listLimit: 40,
+  onlineEnabled: true,
+  allDomains: false // on sites with a domain pack, match the whole glossary anyway
+};
+const renderList = (listEl, items = [], currentTerm, sendAction, formatSource, virtual = {}) => {
   if (virtual.totalHeight !== undefined) {
       let phantom = listEl.querySelector(".ts-virtual-phantom");
       let content = listEl.querySelector(".ts-virtual-content");
@@ -194,7 +239,7 @@ const renderDetail = ({
       const sourceText = formatSource(item.source);
       const cacheText = item.cached ? i18n.getMessage("cacheHit") : i18n.getMessage("cacheMiss");
       const timeText = item.cacheTime ? new Date(item.cacheTime).toLocaleString() : "";
-      line.textContent = `${sourceText} · ${cacheText} · ${timeText}`;
+      line.textContent = [sourceText, cacheText, timeText].filter(Boolean).join(" · ");
       detailSources.appendChild(line);
       if (item.definition) {
         const def = document.createElement("div");
@@ -249,6 +294,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     btnOnline: qs(".ts-online"),
     btnOnlineRefresh: qs(".ts-online-refresh"),
     btnClearCache: qs(".ts-clear-cache"),
+    cacheStatsEl: qs(".ts-cache-stats"),
     inputSearch: qs(".ts-search"),
     btnClearSearch: qs(".ts-clear-search"),
     summaryEl: qs(".ts-summary"),
@@ -258,6 +304,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     selectLimit: qs(".ts-setting-limit"),
     selectTheme: qs(".ts-setting-theme"),
     checkIncludeCode: qs(".ts-setting-include-code"),
+    checkAllDomains: qs(".ts-setting-all-domains"),
     checkOnline: qs(".ts-setting-online"),
     toastEl: qs(".ts-toast"),
     tutorialEl: qs(".ts-tutorial"),
@@ -414,6 +461,13 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     }
     elements.summaryEl.textContent = `${label}: ${state.currentShown}/${state.currentTotal}`;
   };
+  const updateCacheStats = (stats) => {
+    if (!elements.cacheStatsEl) return;
+    const parts = [`${i18n.getMessage("cacheStatsLabel")}: ${stats.storedEntries ?? "?"} ${i18n.getMessage("cacheStatsEntries")}`];
+    parts.push(`${i18n.getMessage("cacheStatsHits")} ${stats.hits}`);
+    parts.push(`${i18n.getMessage("cacheStatsMisses")} ${stats.misses}`);
+    elements.cacheStatsEl.textContent = parts.join(" · ");
+  };
   const updateEmptyState = () => {
     if (!elements.emptyEl) return;
     if (state.currentShown > 0) {
@@ -437,6 +491,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     elements.selectLimit.value = String(settings.listLimit || 40);
     elements.selectTheme.value = settings.theme || "auto";
     elements.checkIncludeCode.checked = Boolean(settings.includeCode);
+    elements.checkAllDomains.checked = Boolean(settings.allDomains);
     elements.checkOnline.checked = Boolean(settings.onlineEnabled);
     renderDetail({ 
       elements, 
@@ -560,6 +615,9 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     if (message.type === MESSAGE_TYPES.settings) {
       applySettings(message.settings || {});
     }
+    if (message.type === MESSAGE_TYPES.cacheStats) {
+      updateCacheStats(message.stats || {});
+    }
     if (message.type === MESSAGE_TYPES.status) {
       const statusMap = {
         scanning: i18n.getMessage("statusScanning"),
@@ -579,6 +637,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
   elements.btnSettings.addEventListener("click", () => {
     const open = elements.settingsPanel.style.display !== "grid";
     elements.settingsPanel.style.display = open ? "grid" : "none";
+    if (open) sendAction("cacheStats");
   });
   elements.inputSearch.addEventListener("input", (event) => {
     const value = event.target.value || "";
@@ -606,6 +665,9 @@ export const initSidebar = ({ root, port, language, i18n }) => {
   elements.checkIncludeCode.addEventListener("change", (event) => {
     sendAction("settings", { settings: { includeCode: event.target.checked } });
   });
+  elements.checkAllDomains.addEventListener("change", (event) => {
+    sendAction("settings", { settings: { allDomains: event.target.checked } });
+  });
   elements.checkOnline.addEventListener("change", (event) => {
     sendAction("settings", { settings: { onlineEnabled: event.target.checked } });
   });
@@ -1,38 +1,223 @@
 import { STORAGE_KEYS, CACHE_CONFIG } from '../shared/constants.js';
+import { openDatabase, requestResult, transactionDone } from './idb.js';
 
-// Prefix for individual cache keys to avoid collision
-const CACHE_PREFIX = "ts:cache:";
+// Online results live in two levels: a small LRU in the service worker and
+// an IndexedDB store behind it. Writes go straight to a transaction; writes
+// that arrive while one is committing share the next. Each transaction also
+// drops expired records (expiresAt index) and evicts the least recently used
+// ones (lastUsed index) beyond CACHE_CONFIG.MAX_ENTRIES.
+const CACHE_DB_NAME = "ts-online-cache";
+const CACHE_DB_VERSION = 2;
+// entries: {key, value, ts, expiresAt, lastUsed}
+const CACHE_STORE = "entries";
+const CACHE_EXPIRES_INDEX = "expiresAt";
+const CACHE_LAST_USED_INDEX = "lastUsed";
+// Keys of the chrome.storage.local cache this module replaced.
+const LEGACY_PREFIX = "ts:cache:";
 
-export const buildCacheKey = (term, lang, source) => `${CACHE_PREFIX}${CACHE_CONFIG.VERSION}|${term}|${lang}|${source}`;
+let cacheDbPromise = null;
+let flushPromise = Promise.resolve();
+let nextFlush = null;
+const memory = new Map(); // key -> record, least recently used first
+const pending = new Map(); // key -> record waiting for the next transaction
+const stats = { memoryHits: 0, diskHits: 0, misses: 0, writes: 0, flushes: 0, evictions: 0 };
 
+// One full read of chrome.storage.local, when the database is first created.
+const removeLegacyEntries = async () => {
+  const keys = Object.keys(await chrome.storage.local.get(null)).filter((key) => key.startsWith(LEGACY_PREFIX));
+  await chrome.storage.local.remove([...keys, STORAGE_KEYS.onlineCache]);
+};
+
+const openCacheDb = () => {
+  if (!cacheDbPromise) {
+    cacheDbPromise = openDatabase(CACHE_DB_NAME, CACHE_DB_VERSION, (db, oldVersion, tx) => {
+      if (!db.objectStoreNames.contains(CACHE_STORE)) {
+        db.createObjectStore(CACHE_STORE, { keyPath: "key" }).createIndex(CACHE_EXPIRES_INDEX, CACHE_EXPIRES_INDEX);
+      }
+      if (oldVersion < 2) {
+        const store = tx.objectStore(CACHE_STORE);
+        store.createIndex(CACHE_LAST_USED_INDEX, CACHE_LAST_USED_INDEX);
+        // Version 1 records have no lastUsed; their write time stands in.
+        store.openCursor().onsuccess = (event) => {
+          const cursor = event.target.result;
+          if (!cursor) return;
+          cursor.update({ ...cursor.value, lastUsed: cursor.value.ts });
+          cursor.continue();
+        };
+      }
+      if (oldVersion === 0) {
+        removeLegacyEntries().catch((error) => console.warn("Removing the old online cache failed:", error));
+      }
+    }).catch((error) => {
+      cacheDbPromise = null;
+      throw error;
+    });
+  }
+  return cacheDbPromise;
+};
+
+const remember = (record) => {
+  memory.delete(record.key);
+  memory.set(record.key, record);
+  if (memory.size > CACHE_CONFIG.MEMORY_ENTRIES) {
+    memory.delete(memory.keys().next().value);
+  }
+};
+
+const isFresh = (record) => record && record.expiresAt > Date.now();
+
+// Marks a hit. lastUsed only moves when it is written back, at most once per
+// CACHE_CONFIG.TOUCH_INTERVAL_MS for each record, with the next transaction.
+const touch = (record) => {
+  const current = memory.get(record.key);
+  // A disk read that raced a newer write must not queue the old value again.
+  if (current && current.ts > record.ts) return;
+  const now = Date.now();
+  if (now - (record.lastUsed || 0) < CACHE_CONFIG.TOUCH_INTERVAL_MS) {
+    remember(record);
+    return;
+  }
+  record = { ...record, lastUsed: now };
+  remember(record);
+  pending.set(record.key, record);
+  scheduleFlush();
+};
+
+export const buildCacheKey = (term, lang, source) => `${CACHE_CONFIG.VERSION}|${term}|${lang}|${source}`;
+
+/**
+ * @param {string} key - See buildCacheKey.
+ * @returns {Promise<{value: Object, ts: number}|null>}
+ */
 export const getCachedEntry = async (key) => {
-  const result = await chrome.storage.local.get(key);
-  const entry = result[key];
-  if (!entry) return null;
-  
-  if (Date.now() - entry.ts > CACHE_CONFIG.TTL_MS) {
-    // Lazy expiration
-    await chrome.storage.local.remove(key);
+  let record = memory.get(key) || pending.get(key);
+  if (isFresh(record)) {
+    stats.memoryHits += 1;
+    touch(record);
+    return { value: record.value, ts: record.ts };
+  }
+  try {
+    const db = await openCacheDb();
+    record = await requestResult(db.transaction(CACHE_STORE, "readonly").objectStore(CACHE_STORE).get(key));
+  } catch (error) {
+    console.warn("Online cache read failed:", error);
+    record = null;
+  }
+  // Expired records are left to the next write transaction.
+  if (!isFresh(record)) {
+    stats.misses += 1;
     return null;
   }
-  return entry.value;
+  stats.diskHits += 1;
+  touch(record);
+  return { value: record.value, ts: record.ts };
+};
+
+// Drops expired records, then the least recently used ones beyond the cap.
+const pruneStore = (store) => {
+  store.index(CACHE_EXPIRES_INDEX).openCursor(IDBKeyRange.upperBound(Date.now())).onsuccess = (event) => {
+    const cursor = event.target.result;
+    if (!cursor) {
+      store.count().onsuccess = (countEvent) => {
+        let excess = countEvent.target.result - CACHE_CONFIG.MAX_ENTRIES;
+        if (excess <= 0) return;
+        store.index(CACHE_LAST_USED_INDEX).openCursor().onsuccess = (evictEvent) => {
+          const oldest = evictEvent.target.result;
+          if (!oldest || excess <= 0) return;
+          memory.delete(oldest.primaryKey);
+          oldest.delete();
+          stats.evictions += 1;
+          excess -= 1;
+          oldest.continue();
+        };
+      };
+      return;
+    }
+    memory.delete(cursor.primaryKey);
+    cursor.delete();
+    cursor.continue();
+  };
 };
 
-export const setCachedEntry = async (key, value) => {
-  // Store individually
-  await chrome.storage.local.set({ 
-      [key]: { ts: Date.now(), value } 
-  });
+const flush = async () => {
+  nextFlush = null;
+  if (!pending.size) return;
+  const records = Array.from(pending.values());
+  pending.clear();
+  try {
+    const db = await openCacheDb();
+    const tx = db.transaction(CACHE_STORE, "readwrite");
+    const store = tx.objectStore(CACHE_STORE);
+    records.forEach((record) => store.put(record));
+    pruneStore(store);
+    await transactionDone(tx);
+    stats.flushes += 1;
+  } catch (error) {
+    // The results stay in memory for this session; losing them only costs a refetch.
+    console.warn("Online cache write failed:", error);
+  }
+};
+
+// Queues the next transaction behind the one in flight; records queued before
+// it starts are written together.
+const scheduleFlush = () => {
+  if (!nextFlush) {
+    nextFlush = flushPromise.then(flush);
+    flushPromise = nextFlush;
+  }
+  return nextFlush;
+};
+
+/**
+ * Writes any queued records now, e.g. before the service worker is suspended.
+ * @returns {Promise<void>}
+ */
+export const flushOnlineCache = () => scheduleFlush();
+
+/**
+ * Caches a result in memory and resolves once it is committed to IndexedDB,
+ * so a service worker shut down after answering loses nothing. Writes queued
+ * while another transaction commits share the next one.
+ * @param {string} key
+ * @param {Object} value
+ * @returns {Promise<void>}
+ */
+export const setCachedEntry = (key, value) => {
+  const ts = Date.now();
+  const record = { key, value, ts, expiresAt: ts + CACHE_CONFIG.TTL_MS, lastUsed: ts };
+  remember(record);
+  pending.set(key, record);
+  stats.writes += 1;
+  return scheduleFlush();
 };
 
 export const clearOnlineCache = async () => {
-  // Clear all keys starting with prefix
-  const all = await chrome.storage.local.get(null);
-  const keysToRemove = Object.keys(all).filter(k => k.startsWith(CACHE_PREFIX));
-  if (keysToRemove.length > 0) {
-      await chrome.storage.local.remove(keysToRemove);
-  }
-  
-  // Also clear legacy large object if exists
-  await chrome.storage.local.remove(STORAGE_KEYS.onlineCache);
+  memory.clear();
+  pending.clear();
+  await flushPromise;
+  const db = await openCacheDb();
+  const tx = db.transaction(CACHE_STORE, "readwrite");
+  tx.objectStore(CACHE_STORE).clear();
+  await transactionDone(tx);
+};
+
+/**
+ * Counters since the service worker started, plus the stored entry count.
+ * @returns {Promise<Object>}
+ */
+export const getCacheStats = async () => {
+  let stored = null;
+  try {
+    const db = await openCacheDb();
+    stored = await requestResult(db.transaction(CACHE_STORE, "readonly").objectStore(CACHE_STORE).count());
+  } catch (error) {
+    console.warn("Online cache count failed:", error);
+  }
+  return {
+    ...stats,
+    hits: stats.memoryHits + stats.diskHits,
+    memoryEntries: memory.size,
+    pendingWrites: pending.size,
+    storedEntries: stored
+  };
 };
@@ -0,0 +1,36 @@
+// Minimal promise wrappers around IndexedDB for the service worker.
+
+/**
+ * @param {IDBRequest} request
+ * @returns {Promise<any>}
+ */
+export const requestResult = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+
+/**
+ * Resolves once the transaction commits, rejects when it aborts.
+ * @param {IDBTransaction} tx
+ * @returns {Promise<void>}
+ */
+export const transactionDone = (tx) => new Promise((resolve, reject) => {
+  tx.oncomplete = () => resolve();
+  tx.onerror = () => reject(tx.error);
+  tx.onabort = () => reject(tx.error || new Error("IndexedDB transaction aborted"));
+});
+
+/**
+ * @param {string} name
+ * @param {number} version
+ * @param {function(IDBDatabase, number, IDBTransaction): void} upgrade - Called with the old
+ *   version and the versionchange transaction.
+ * @returns {Promise<IDBDatabase>}
+ */
+export const openDatabase = (name, version, upgrade) => new Promise((resolve, reject) => {
+  const request = indexedDB.open(name, version);
+  request.onupgradeneeded = (event) => upgrade(request.result, event.oldVersion, request.transaction);
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+  request.onblocked = () => reject(new Error(`IndexedDB ${name} is blocked by an open connection`));
+});
@@ -1,5 +1,5 @@
 import { MESSAGE_TYPES } from '../shared/constants.js';
-import { buildCacheKey, getCachedEntry, setCachedEntry, clearOnlineCache } from './cache.js';
+import { buildCacheKey, getCachedEntry, setCachedEntry, clearOnlineCache, flushOnlineCache, getCacheStats } from './cache.js';
 import { enqueueRequest, requestWithRetry } from './network.js';
 import { fetchWiktionary, fetchWikipedia } from './api.js';
 
@@ -57,6 +57,9 @@ chrome.runtime.onMessage.addListener((message, _sender, sendResponse) => {
       await clearOnlineCache();
       return { ok: true };
     }
+    if (message?.type === MESSAGE_TYPES.cacheStats) {
+      return { ok: true, stats: await getCacheStats() };
+    }
     return { ok: false };
   };
 
@@ -66,6 +69,18 @@ chrome.runtime.onMessage.addListener((message, _sender, sendResponse) => {
   return true;
 });
 
+// Earlier versions mirrored the packaged glossary into this database; the
+// content script always read the packaged files, so it is only dropped now.
+chrome.runtime.onInstalled.addListener(() => {
+  indexedDB.deleteDatabase("ts-glossary");
+});
+
+// Results are written through already; this only commits lastUsed updates
+// still waiting for a transaction.
+chrome.runtime.onSuspend.addListener(() => {
+  flushOnlineCache();
+});
+
 chrome.commands.onCommand.addListener(async (command) => {
   if (command === "toggle-sidebar") {
     const tabs = await chrome.tabs.query({ active: true, currentWindow: true });
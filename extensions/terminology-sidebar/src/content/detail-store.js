@@ -0,0 +1,112 @@
+import { DETAIL_CONFIG } from '../shared/constants.js';
+import { store } from './state.js';
+
+// FNV-1a over the QID's characters; QIDs are ASCII, so this matches
+// fnv1a32() over UTF-8 bytes in tools/build_glossary.py.
+const hashDetailKey = (key) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < key.length; i++) {
+    hash ^= key.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+};
+
+const shardNameFor = (id, shardCount) => {
+  const width = (shardCount - 1).toString(16).length;
+  return (hashDetailKey(id) % shardCount).toString(16).padStart(width, "0");
+};
+
+const fetchData = (path) =>
+  fetch(chrome.runtime.getURL(path)).then((r) => {
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    return r.json();
+  });
+
+// Resolves to the shard index, or null when the build has no shards and the
+// monolithic glossary_detail.json has to be used instead.
+const loadDetailIndex = () => {
+  const { detailIndexPromise } = store.getState();
+  if (detailIndexPromise) return detailIndexPromise;
+  const promise = fetchData("data/detail/index.json")
+    .then((index) => (index?.shardCount > 0 ? index : null))
+    .catch(() => null);
+  store.setState({ detailIndexPromise: promise });
+  return promise;
+};
+
+const loadDetailMap = async () => {
+  const state = store.getState();
+  if (state.detailMap) return state.detailMap;
+  if (state.detailPromise) return state.detailPromise;
+
+  const promise = fetchData("data/glossary_detail.json")
+    .then((data) => {
+      const detailMap = data.items || {};
+      store.setState({ detailMap });
+      return detailMap;
+    })
+    .finally(() => {
+      store.setState({ detailPromise: null });
+    });
+
+  store.setState({ detailPromise: promise });
+  return promise;
+};
+
+// Decoded shards are kept in a small LRU (Map insertion order = recency).
+const touchShard = (name, items) => {
+  const { detailShards } = store.getState();
+  detailShards.delete(name);
+  detailShards.set(name, items);
+  while (detailShards.size > DETAIL_CONFIG.SHARD_CACHE_SIZE) {
+    detailShards.delete(detailShards.keys().next().value);
+  }
+  return items;
+};
+
+const loadShard = (name) => {
+  const { detailShards, detailShardPromises } = store.getState();
+  if (detailShards.has(name)) return Promise.resolve(touchShard(name, detailShards.get(name)));
+  if (detailShardPromises.has(name)) return detailShardPromises.get(name);
+
+  const promise = fetchData(`data/detail/${name}.json`)
+    .then((data) => touchShard(name, data.items || {}))
+    .finally(() => {
+      detailShardPromises.delete(name);
+    });
+  detailShardPromises.set(name, promise);
+  return promise;
+};
+
+/**
+ * Loads the detail record for one QID, fetching only the shard that holds it.
+ * @param {string} id
+ * @returns {Promise<Object|null>}
+ */
+export const loadDetail = async (id) => {
+  store.setState({ detailLoadError: false });
+  try {
+    const index = await loadDetailIndex();
+    const items = index
+      ? await loadShard(shardNameFor(id, index.shardCount))
+      : await loadDetailMap();
+    return items[id] || null;
+  } catch (error) {
+    store.setState({ detailLoadError: true });
+    return null;
+  }
+};
+
+/**
+ * Synchronous lookup among details that are already decoded.
+ * @param {string} id
+ * @returns {Object|null}
+ */
+export const getCachedDetail = (id) => {
+  const { detailShards, detailMap } = store.getState();
+  for (const items of detailShards.values()) {
+    if (items[id]) return items[id];
+  }
+  return detailMap?.[id] || null;
+};
@@ -1,73 +1,205 @@
 import { store } from './state.js';
+import { PackedGlossary } from '../shared/packed-glossary.js';
 // Worker is now initialized in scanner.js or index.js, but we need to pass data to it.
 // We will store the patterns in the store, and let scanner init the worker.
 
+/**
+ * Wraps a JSON index item list in the same interface as PackedGlossary.
+ * @param {Array<Object>} items
+ */
+const createListGlossary = (items) => {
+  let byId = null;
+  return {
+    length: items.length,
+    getEntry: (index) => items[index],
+    findEntry: (id) => {
+      byId = byId || new Map(items.map((item) => [item.id, item]));
+      return byId.get(id);
+    }
+  };
+};
+
+const loadPacked = async (name) => {
+  const response = await fetch(chrome.runtime.getURL(`data/${name}`));
+  if (!response.ok) throw new Error(`HTTP ${response.status}`);
+  return new PackedGlossary(await response.arrayBuffer());
+};
+
+const loadJsonIndex = async (lang) => {
+  const index = await fetch(chrome.runtime.getURL(`data/glossary_${lang}_index.json`)).then((r) => r.json());
+  return index.items || index;
+};
+
+// Create lightweight patterns for Worker (avoid sending full entry objects)
+// { p: pattern, i: entry index, l: term length }
+const buildPatterns = (items, lowercase) => {
+  const patterns = [];
+  items.forEach((entry, index) => {
+    patterns.push({
+      p: lowercase ? entry.term.toLowerCase() : entry.term,
+      i: index,
+      l: entry.term.length
+    });
+    (entry.aliases || []).forEach((alias) => {
+      patterns.push({
+        p: lowercase ? alias.toLowerCase() : alias,
+        i: index,
+        l: alias.length
+      });
+    });
+  });
+  return patterns;
+};
+
+const loadDomainIndex = async () => {
+  try {
+    const response = await fetch(chrome.runtime.getURL("data/glossary_domains.json"));
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return await response.json();
+  } catch (error) {
+    console.warn("Domain packs unavailable, loading the whole glossary:", error);
+    return null;
+  }
+};
+
+/**
+ * Domain pack for a host or one of its parent domains (SITE_DOMAINS in
+ * tools/build_glossary.py).
+ * @param {Object|null} index - data/glossary_domains.json
+ * @param {string} hostname
+ * @returns {string|null} Domain slug, e.g. "software_engineering".
+ */
+export const findSiteDomain = (index, hostname) => {
+  if (!index?.sites) return null;
+  const labels = hostname.toLowerCase().split(".");
+  for (let i = 0; i < labels.length - 1; i++) {
+    const domain = index.sites[labels.slice(i).join(".")];
+    if (domain && index.domains?.[domain]) return domain;
+  }
+  return null;
+};
+
+/**
+ * Loads one language, preferring the packed binary index.
+ * Injection only waits for a partial pack: the site's domain pack, or else
+ * the hot tier (the most popular entries, a prefix of the full pack with the
+ * same entry indexes); useFullGlossary() swaps in the full pack later. The
+ * packed buffer is handed to the worker as-is; the JSON fallback still builds
+ * the `{p,i,l}` pattern list.
+ */
+const loadLanguage = async (lang, domain) => {
+  const packs = [[`glossary_${lang}_hot.bin`, true], [`glossary_${lang}.bin`, false]];
+  if (domain) packs.unshift([`glossary_${lang}_${domain}.bin`, true]);
+  for (const [name, partial] of packs) {
+    try {
+      const packed = await loadPacked(name);
+      return { glossary: packed, pack: packed.buffer, patterns: null, partial };
+    } catch (error) {
+      console.warn(`Packed ${lang} glossary ${name} unavailable:`, error);
+    }
+  }
+  const items = await loadJsonIndex(lang);
+  return {
+    glossary: createListGlossary(items),
+    pack: null,
+    patterns: buildPatterns(items, lang === "en"),
+    partial: false
+  };
+};
+
 export const loadGlossary = async () => {
-  const results = await Promise.allSettled([
-    fetch(chrome.runtime.getURL("data/glossary_en_index.json")).then((r) => r.json()),
-    fetch(chrome.runtime.getURL("data/glossary_zh_index.json")).then((r) => r.json())
-  ]);
+  const { settings } = store.getState();
+  const siteDomain = settings.allDomains ? null : findSiteDomain(await loadDomainIndex(), location.hostname);
+  const results = await Promise.allSettled([loadLanguage("en", siteDomain), loadLanguage("zh", siteDomain)]);
 
-  const enIndex = results[0].status === 'fulfilled' ? results[0].value : { items: [] };
+  const empty = { glossary: createListGlossary([]), pack: null, patterns: [], partial: false };
+  const en = results[0].status === 'fulfilled' ? results[0].value : empty;
   if (results[0].status === 'rejected') {
     console.warn('Failed to load English glossary:', results[0].reason);
   }
 
-  const zhIndex = results[1].status === 'fulfilled' ? results[1].value : { items: [] };
+  const zh = results[1].status === 'fulfilled' ? results[1].value : empty;
   if (results[1].status === 'rejected') {
     console.warn('Failed to load Chinese glossary:', results[1].reason);
   }
 
   store.setState({
-    glossaryEn: enIndex.items || enIndex,
-    glossaryZh: zhIndex.items || zhIndex
+    glossaryEn: en.glossary,
+    glossaryZh: zh.glossary,
+    enPack: en.pack,
+    zhPack: zh.pack,
+    enPatterns: en.patterns,
+    zhPatterns: zh.patterns,
+    siteDomain,
+    partialLangs: [["en", en], ["zh", zh]].filter(([, result]) => result.partial).map(([lang]) => lang),
+    glossaryLoaded: true
   });
-  
-  const state = store.getState();
-  const enPatterns = [];
-  
-  // Create lightweight patterns for Worker (avoid sending full entry objects)
-  state.glossaryEn.forEach((entry, index) => {
-    // 0: pattern, 1: id (index), 2: term (for length check in worker if needed, or just pattern length)
-    // Actually worker needs pattern string to build trie.
-    // We pass: { p: pattern, i: index, t: term }
-    // Minify property names to save slightly on serialization
-    
-    enPatterns.push({
-      p: entry.term.toLowerCase(),
-      i: index,
-      l: entry.term.length 
-    });
-    
-    (entry.aliases || []).forEach((alias) => {
-      enPatterns.push({
-        p: alias.toLowerCase(),
-        i: index,
-        l: alias.length
-      });
-    });
+};
+
+/**
+ * Loads the full packs of the languages on a partial pack, once. Search
+ * needs them (its indexes cover every entry) even where the page keeps
+ * scanning with its domain pack.
+ * @returns {Promise<{en?: PackedGlossary, zh?: PackedGlossary}>}
+ */
+export const loadFullGlossary = () => {
+  const { fullGlossaryPromise, partialLangs } = store.getState();
+  if (fullGlossaryPromise) return fullGlossaryPromise;
+  const load = (lang) => loadPacked(`glossary_${lang}.bin`).catch((error) => {
+    console.warn(`Full ${lang} glossary unavailable, keeping the partial pack:`, error);
+    return null;
   });
-  
-  const zhPatterns = [];
-  state.glossaryZh.forEach((entry, index) => {
-    zhPatterns.push({
-      p: entry.term,
-      i: index,
-      l: entry.term.length
-    });
-    
-    (entry.aliases || []).forEach((alias) => {
-      zhPatterns.push({
-        p: alias,
-        i: index,
-        l: alias.length
-      });
+  const promise = Promise.all(partialLangs.map(load)).then((packed) => {
+    const full = {};
+    partialLangs.forEach((lang, index) => {
+      if (packed[index]) full[lang] = packed[index];
     });
+    return full;
   });
-  
+  store.setState({ fullGlossaryPromise: promise });
+  return promise;
+};
+
+/**
+ * Entries for the QIDs in a detail's `related` list (computed at build time),
+ * in `lang`. They are looked up in the full glossary, so neighbours outside a
+ * partial pack still resolve; ids missing from it are skipped.
+ * @param {string[]} ids
+ * @param {string} lang - "en" or "zh"
+ * @returns {Promise<Array<Object>>}
+ */
+export const findRelatedEntries = async (ids, lang) => {
+  if (!ids?.length) return [];
+  const full = await loadFullGlossary();
+  const glossary = full[lang] || store.getState()[lang === "en" ? "glossaryEn" : "glossaryZh"];
+  return ids.map((id) => glossary?.findEntry(id)).filter(Boolean);
+};
+
+/**
+ * Replaces the partial packs with the full ones. The hot tier is a prefix of
+ * the full pack, so scans in flight stay valid; a domain pack numbers its
+ * entries differently, so those scans are dropped. The new buffers also
+ * become enPack/zhPack, so a worker started later gets them.
+ * @returns {Promise<{enPack?: ArrayBuffer, zhPack?: ArrayBuffer}>} The packs
+ *   that were swapped in.
+ */
+export const useFullGlossary = async () => {
+  const full = await loadFullGlossary();
+  const { partialLangs, scanToken, siteDomain } = store.getState();
+  const update = {};
+  const packs = {};
+  partialLangs.forEach((lang) => {
+    if (!full[lang]) return;
+    update[lang === "en" ? "glossaryEn" : "glossaryZh"] = full[lang];
+    packs[`${lang}Pack`] = full[lang].buffer;
+  });
+  if (!Object.keys(packs).length) return packs;
   store.setState({
-    enPatterns,
-    zhPatterns,
-    glossaryLoaded: true
+    ...update,
+    ...packs,
+    siteDomain: null,
+    partialLangs: partialLangs.filter((lang) => !full[lang]),
+    scanToken: siteDomain ? scanToken + 1 : scanToken
   });
+  return packs;
 };
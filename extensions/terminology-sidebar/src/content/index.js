@@ -1,10 +1,11 @@
-import { MESSAGE_TYPES, STORAGE_KEYS } from '../shared/constants.js';
+import { GLOSSARY_CONFIG, MESSAGE_TYPES, STORAGE_KEYS } from '../shared/constants.js';
 import { store } from './state.js';
 import { getLanguage } from './utils.js';
 import { loadGlossary } from './glossary.js';
 import { loadSettings, saveSettings, applySettings } from './settings.js';
-import { scanPage } from './scanner.js';
-import { updateDetail, updateSidebarList, updateStatus, setSidebarWidth, updateTheme } from './sidebar-manager.js';
+import { attachFullGlossary, scanPage } from './scanner.js';
+import { getCachedDetail } from './detail-store.js';
+import { findListItem, updateDetail, updateSidebarList, updateStatus, setSidebarWidth, updateTheme } from './sidebar-manager.js';
 import { clearHighlights, applyHighlights, scrollToTerm } from './highlighter.js';
 
 // Import resources directly (will be inlined by bundler)
@@ -23,11 +24,11 @@ const buildExamples = (detail, entry, langKey) => {
 };
 
 const getDetailEntry = (term) => {
-  const { listItems, detailMap } = store.getState();
-  const item = listItems.find((entry) => entry.term === term);
+  const item = findListItem(term);
   let entry = item?.entry || null;
-  if (entry?.id && detailMap?.[entry.id]) {
-    entry = detailMap[entry.id];
+  const detail = entry?.id ? getCachedDetail(entry.id) : null;
+  if (detail) {
+    entry = detail;
   }
   return entry;
 };
@@ -41,6 +42,14 @@ const needsOnlineFill = (entry, langKey) => {
   return !defText || !explanationText || examples.length === 0;
 };
 
+// Wikipedia summaries fetched at build time (build_glossary.py --summaries),
+// shaped like the background's online results.
+const buildTimeResults = (entry, lang) => {
+  const summary = entry?.summaries?.[lang];
+  if (!summary) return [];
+  return [{ ...summary, examples: [], cached: true }];
+};
+
 const handleOnlineResolve = async (term, force = false) => {
   const settings = store.getState().settings;
   if (!settings.onlineEnabled) return;
@@ -63,16 +72,30 @@ const handleOnlineResolve = async (term, force = false) => {
 const ensureOnlineDetail = async (term) => {
   if (!term) return;
   const { settings, onlineResults } = store.getState();
-  if (!settings.onlineEnabled) return;
   const lang = getLanguage(settings);
   const langKey = lang === "zh" ? "zh_CN" : "en";
   const entry = getDetailEntry(term);
   if (!entry) return;
   if (!needsOnlineFill(entry, langKey)) return;
   if ((onlineResults[term] || []).length) return;
+  const prebuilt = buildTimeResults(entry, lang);
+  if (prebuilt.length) {
+    store.setState({ onlineResults: { ...onlineResults, [term]: prebuilt } });
+    await updateDetail(term);
+    return;
+  }
+  if (!settings.onlineEnabled) return;
   await handleOnlineResolve(term, true);
 };
 
+const sendCacheStats = async () => {
+  const response = await chrome.runtime.sendMessage({ type: MESSAGE_TYPES.cacheStats });
+  const port = store.getState().port;
+  if (response?.ok && port) {
+    port.postMessage({ type: MESSAGE_TYPES.cacheStats, stats: response.stats });
+  }
+};
+
 const handleMessage = async (message) => {
   if (!message) return;
   if (message.type === MESSAGE_TYPES.action) {
@@ -110,10 +133,17 @@ const handleMessage = async (message) => {
       await chrome.runtime.sendMessage({ type: MESSAGE_TYPES.clearCache });
       store.setState({ onlineResults: {} });
       await updateDetail(message.term);
+      await sendCacheStats();
+    }
+    if (message.action === "cacheStats") {
+      await sendCacheStats();
     }
     if (message.action === "settings") {
       await saveSettings(message.settings || {});
       applySettings();
+      if (message.settings?.allDomains && store.getState().siteDomain) {
+        await attachFullGlossary();
+      }
     }
   }
 };
@@ -248,12 +278,27 @@ const initObservers = () => {
   };
 };
 
+// Injection only compiles the hot tier; the full glossary waits for an idle
+// moment. Sites with a domain pack keep it unless allDomains is set.
+const scheduleFullGlossary = () => {
+  if (store.getState().siteDomain) return;
+  const load = () => attachFullGlossary().catch((error) => {
+    console.warn("Terminology Sidebar: failed to load the full glossary:", error);
+  });
+  if (typeof requestIdleCallback === "function") {
+    requestIdleCallback(load, { timeout: GLOSSARY_CONFIG.FULL_GLOSSARY_IDLE_TIMEOUT_MS });
+  } else {
+    setTimeout(load, 0);
+  }
+};
+
 const init = async () => {
   await loadSettings();
   await loadGlossary();
   await setupShadowRoot();
   await applySettings();
   await ensureTutorialOpen();
+  scheduleFullGlossary();
   
   const cleanup = initObservers();
   store.setState({ cleanup });
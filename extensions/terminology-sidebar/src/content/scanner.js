@@ -2,6 +2,7 @@ import { store } from './state.js';
 import { getScanModes, sleep } from './utils.js';
 import { extractVisibleTextNodes } from './dom.js';
 import { rankMatches } from './matcher.js';
+import { useFullGlossary } from './glossary.js';
 import { updateSidebarList, updateStatus } from './sidebar-manager.js';
 
 // Worker Blob URL (injected by bundler, or we use a separate file if possible)
@@ -57,11 +58,11 @@ const initWorker = async () => {
 
     workerInstance = proxy;
     
-    // Send init data
-    const { enPatterns, zhPatterns } = store.getState();
+    // Send init data (packed buffers when available, pattern lists otherwise)
+    const { enPack, zhPack, enPatterns, zhPatterns } = store.getState();
     workerInstance.postMessage({
       type: 'INIT',
-      payload: { enPatterns, zhPatterns }
+      payload: { enPack, zhPack, enPatterns, zhPatterns }
     });
     
     return workerInstance;
@@ -138,7 +139,7 @@ const finalizeScan = (task) => {
   const hydrate = (matches, lang) => matches.map(m => {
     const chunk = chunkMap.get(m.chunkId);
     // Lookup entry from store using index
-    const entry = lang === 'en' ? state.glossaryEn[m.i] : state.glossaryZh[m.i];
+    const entry = lang === 'en' ? state.glossaryEn.getEntry(m.i) : state.glossaryZh.getEntry(m.i);
     
     return {
       term: entry ? entry.term : "Unknown", // Reconstruct term
@@ -256,7 +257,10 @@ export const scanPage = async (options = {}) => {
 
   let i = 0;
   for (const node of nodeGenerator) {
-    if (token !== store.getState().scanToken) return;
+    if (token !== store.getState().scanToken) {
+      scanTasks.delete(token);
+      return;
+    }
     
     // node can be null if generator yields for time slicing
     if (!node) {
@@ -310,3 +314,19 @@ export const scanPage = async (options = {}) => {
       }
   }
 };
+
+/**
+ * Swaps the full glossary into a running worker once it is loaded; a worker
+ * started later gets it with INIT. The page is rescanned when the sidebar is
+ * open or a scan was in flight (it may have been dropped, or only matched the
+ * partial pack), so terms outside the partial pack show up without waiting
+ * for the next page change.
+ */
+export const attachFullGlossary = async () => {
+  const packs = await useFullGlossary();
+  if (!workerInstance || !Object.keys(packs).length) return;
+  workerInstance.postMessage({ type: 'LOAD_PACKS', payload: packs });
+  if (store.getState().sidebarOpen || scanTasks.size) {
+    await scanPage();
+  }
+};
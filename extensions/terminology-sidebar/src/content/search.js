@@ -0,0 +1,82 @@
+import { SEARCH_CONFIG } from '../shared/constants.js';
+import { SearchIndex } from '../shared/search-index.js';
+import { store } from './state.js';
+import { loadFullGlossary } from './glossary.js';
+
+const loadSearchPack = async (lang) => {
+  const response = await fetch(chrome.runtime.getURL(`data/search_${lang}.bin`));
+  if (!response.ok) throw new Error(`HTTP ${response.status}`);
+  return new SearchIndex(await response.arrayBuffer());
+};
+
+/**
+ * Loads both search indexes once; a missing or stale index resolves to null
+ * and search falls back to the terms found on the page. The indexes cover
+ * the full glossary, so pages on a partial pack load the full one as well.
+ * @returns {Promise<{en: SearchIndex|null, zh: SearchIndex|null}>}
+ */
+export const loadSearchIndexes = () => {
+  const { searchIndexPromise } = store.getState();
+  if (searchIndexPromise) return searchIndexPromise;
+  const load = (lang, glossary) => loadSearchPack(lang)
+    .then((index) => (index.entryCount === glossary?.length ? index : null))
+    .catch((error) => {
+      console.warn(`Search index for ${lang} unavailable:`, error);
+      return null;
+    });
+  const promise = loadFullGlossary()
+    .then(async (full) => {
+      const { glossaryEn, glossaryZh } = store.getState();
+      const searchGlossaries = { en: full.en || glossaryEn, zh: full.zh || glossaryZh };
+      const [en, zh] = await Promise.all([load("en", searchGlossaries.en), load("zh", searchGlossaries.zh)]);
+      const searchIndexes = { en, zh };
+      store.setState({ searchIndexes, searchGlossaries });
+      return searchIndexes;
+    });
+  store.setState({ searchIndexPromise: promise });
+  return promise;
+};
+
+const normalizeQuery = (query, lang) => {
+  const collapsed = query.trim().split(/\s+/).join(" ");
+  return lang === "en" ? collapsed.toLowerCase() : collapsed;
+};
+
+/**
+ * Searches the whole glossary (English terms/aliases and Chinese terms).
+ * @param {string} query
+ * @returns {Array<Object>|null} List items ordered by match quality, or null
+ *   while the indexes are not loaded yet (see loadSearchIndexes).
+ */
+export const searchGlossary = (query) => {
+  const { searchIndexes, searchGlossaries } = store.getState();
+  if (!searchIndexes) return null;
+  const options = { limit: SEARCH_CONFIG.RESULT_LIMIT, fuzzyRatio: SEARCH_CONFIG.FUZZY_RATIO };
+  const hits = [];
+  [["en", searchGlossaries.en], ["zh", searchGlossaries.zh]].forEach(([lang, glossary]) => {
+    const index = searchIndexes[lang];
+    const normalized = normalizeQuery(query, lang);
+    if (!index || !normalized) return;
+    index.search(normalized, options).forEach((hit) => {
+      hits.push({ ...hit, entry: glossary.getEntry(hit.entry) });
+    });
+  });
+  hits.sort((a, b) => a.rank - b.rank || b.score - a.score);
+
+  const seen = new Set();
+  const items = [];
+  hits.forEach(({ entry }) => {
+    if (!entry) return;
+    const key = entry.term.toLowerCase();
+    if (seen.has(key)) return;
+    seen.add(key);
+    items.push({
+      term: entry.term,
+      count: 0,
+      category: entry.category || "",
+      source: "local",
+      entry
+    });
+  });
+  return items;
+};
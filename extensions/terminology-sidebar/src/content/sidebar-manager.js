@@ -1,6 +1,9 @@
 import { MESSAGE_TYPES } from '../shared/constants.js';
 import { store } from './state.js';
 import { getLanguage } from './utils.js';
+import { loadDetail } from './detail-store.js';
+import { findRelatedEntries } from './glossary.js';
+import { loadSearchIndexes, searchGlossary } from './search.js';
 import { scanPage } from './scanner.js'; // Circular dependency?
 // scanPage imports updateSidebarList from sidebar-manager.
 // sidebar-manager imports scanPage for toggleSidebar.
@@ -22,50 +25,70 @@ export const updateStatus = (status) => {
   port.postMessage({ type: MESSAGE_TYPES.status, status });
 };
 
+/**
+ * Page items first, then glossary-wide search hits that are not on the page.
+ */
 export const updateSidebarList = () => {
   const { port, searchQuery, listItems, settings } = store.getState();
   if (!port) return;
-  const filtered = searchQuery
-    ? listItems.filter((item) => item.term.toLowerCase().includes(searchQuery.toLowerCase()))
-    : listItems;
+  let items = listItems;
+  let searchItems = [];
+  if (searchQuery) {
+    const query = searchQuery.toLowerCase();
+    items = listItems.filter((item) => item.term.toLowerCase().includes(query));
+    const hits = searchGlossary(searchQuery);
+    if (hits) {
+      const onPage = new Set(listItems.map((item) => item.term.toLowerCase()));
+      searchItems = hits.filter((item) => !onPage.has(item.term.toLowerCase()));
+    } else {
+      loadSearchIndexes().then(() => {
+        if (store.getState().searchQuery === searchQuery) updateSidebarList();
+      });
+    }
+  }
+  store.setState({ searchItems });
   port.postMessage({
     type: MESSAGE_TYPES.list,
-    items: filtered,
-    total: listItems.length,
+    items: searchItems.length ? [...items, ...searchItems] : items,
+    total: listItems.length + searchItems.length,
     language: getLanguage(settings),
     query: searchQuery
   });
 };
 
-export const loadDetailMap = async () => {
-  const state = store.getState();
-  if (state.detailMap) return state.detailMap;
-  if (state.detailPromise) return state.detailPromise;
-  
-  store.setState({ detailLoadError: false });
-  const promise = fetch(chrome.runtime.getURL("data/glossary_detail.json"))
-    .then((r) => r.json())
-    .then((data) => {
-      const detailMap = data.items || {};
-      store.setState({ detailMap, detailLoadError: false });
-      return detailMap;
-    })
-    .catch(() => {
-      store.setState({ detailMap: {}, detailLoadError: true });
-      return {};
-    })
-    .finally(() => {
-      store.setState({ detailPromise: null });
-    });
-    
-  store.setState({ detailPromise: promise });
-  return promise;
+/**
+ * @param {string} term
+ * @returns {Object|undefined} The page item, search hit or related term shown for `term`.
+ */
+export const findListItem = (term) => {
+  const { listItems, searchItems, relatedItems } = store.getState();
+  return listItems.find((item) => item.term === term)
+    || searchItems.find((item) => item.term === term)
+    || relatedItems.find((item) => item.term === term);
+};
+
+/**
+ * Turns the related QIDs of a detail into terms the sidebar can show and
+ * select; the matching list items are kept for findListItem.
+ */
+const withRelatedTerms = async (entry, lang) => {
+  const ids = entry?.detail?.related;
+  if (!ids?.length) return entry;
+  const relatedItems = (await findRelatedEntries(ids, lang)).map((related) => ({
+    term: related.term,
+    count: 0,
+    category: related.category || "",
+    source: "local",
+    entry: related
+  }));
+  store.setState({ relatedItems });
+  return { ...entry, detail: { ...entry.detail, related: relatedItems.map((item) => item.term) } };
 };
 
 export const updateDetail = async (term) => {
-  const { port, listItems, onlineResults, settings } = store.getState();
+  const { port, onlineResults, settings } = store.getState();
   if (!port) return;
-  const item = listItems.find((entry) => entry.term === term);
+  const item = findListItem(term);
   let entry = item?.entry || null;
   const online = onlineResults[term] || [];
   const count = item?.count || 0;
@@ -82,9 +105,9 @@ export const updateDetail = async (term) => {
     });
   }
   if (entry?.id) {
-    const detailMap = await loadDetailMap();
-    if (detailMap[entry.id]) {
-      entry = detailMap[entry.id];
+    const detail = await loadDetail(entry.id);
+    if (detail) {
+      entry = await withRelatedTerms(detail, lang);
     }
   }
   const { detailLoadError } = store.getState();
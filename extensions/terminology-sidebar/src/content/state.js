@@ -3,14 +3,27 @@ import { Store } from '../shared/store.js';
 
 const initialState = {
   settings: { ...DEFAULT_SETTINGS },
-  glossaryEn: [],
-  glossaryZh: [],
-  enPatterns: [], // Raw patterns for worker
-  zhPatterns: [], // Raw patterns for worker
+  glossaryEn: null, // PackedGlossary (hot tier or full) or JSON list wrapper ({ length, getEntry, findEntry })
+  glossaryZh: null,
+  enPack: null, // Packed glossary buffer for worker (hot tier until the full pack loads)
+  zhPack: null,
+  enPatterns: [], // Raw patterns for worker (JSON fallback)
+  zhPatterns: [], // Raw patterns for worker (JSON fallback)
+  siteDomain: null, // Domain pack picked for this host (glossary_domains.json)
+  partialLangs: [], // Languages on a hot tier or domain pack (see useFullGlossary)
+  fullGlossaryPromise: null,
   glossaryLoaded: false,
-  detailMap: null,
+  detailIndexPromise: null, // data/detail/index.json (null result = no shards)
+  detailShards: new Map(), // LRU of decoded detail shards
+  detailShardPromises: new Map(),
+  detailMap: null, // Full glossary_detail.json, only when shards are unavailable
   detailPromise: null,
   detailLoadError: false,
+  searchIndexPromise: null, // data/search_{en,zh}.bin, loaded on the first query
+  searchIndexes: null, // { en: SearchIndex|null, zh: SearchIndex|null }
+  searchGlossaries: null, // { en, zh } full glossaries the search indexes point into
+  searchItems: [], // Glossary-wide hits of the current query (not on the page)
+  relatedItems: [], // Related terms of the entry in the detail view
   worker: null, // Web Worker instance
   matches: [],
   listItems: [],
@@ -15,12 +15,29 @@ export const MESSAGE_TYPES = {
   visibility: `${PROJECT_PREFIX}:visibility`,
   toggle: `${PROJECT_PREFIX}:toggle-sidebar`,
   onlineResolve: `${PROJECT_PREFIX}:online-resolve`,
-  clearCache: `${PROJECT_PREFIX}:clear-online-cache`
+  clearCache: `${PROJECT_PREFIX}:clear-online-cache`,
+  cacheStats: `${PROJECT_PREFIX}:online-cache-stats`
 };
 
 export const CACHE_CONFIG = {
   TTL_MS: 7 * 24 * 60 * 60 * 1000, // 7 days
-  VERSION: 'v1'
+  VERSION: 'v1',
+  MEMORY_ENTRIES: 200, // results kept in the service worker's LRU
+  MAX_ENTRIES: 5000, // results kept in IndexedDB; the least recently used go first
+  TOUCH_INTERVAL_MS: 60 * 1000 // a hit rewrites a record's lastUsed at most this often
+};
+
+export const DETAIL_CONFIG = {
+  SHARD_CACHE_SIZE: 8 // decoded detail shards kept per tab
+};
+
+export const GLOSSARY_CONFIG = {
+  FULL_GLOSSARY_IDLE_TIMEOUT_MS: 5000 // swap in the full packs by then even if the page never idles
+};
+
+export const SEARCH_CONFIG = {
+  RESULT_LIMIT: 50, // glossary hits per language and query
+  FUZZY_RATIO: 0.6 // share of the query's n-grams a typo match must contain
 };
 
 export const DEFAULT_SETTINGS = {
@@ -30,5 +47,6 @@ export const DEFAULT_SETTINGS = {
   sidebarWidth: 380,
   theme: "auto",
   listLimit: 40,
-  onlineEnabled: true
+  onlineEnabled: true,
+  allDomains: false // on sites with a domain pack, match the whole glossary anyway
 };
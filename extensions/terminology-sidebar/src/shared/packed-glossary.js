@@ -0,0 +1,146 @@
+// Reader for the packed binary glossary written by tools/build_glossary.py.
+// Layout: a header of little-endian uint32 fields (PACK_HEADER_FIELDS order)
+// followed by 4-byte aligned typed-array sections.
+
+export const PACK_FORMAT_VERSION = 3;
+
+const PACK_MAGIC = 0x50475354; // "TSGP"
+
+const PACK_HEADER_FIELDS = [
+  "magic",
+  "formatVersion",
+  "schemaVersion",
+  "entryCount",
+  "stringCount",
+  "aliasCount",
+  "patternCount",
+  "categoryCount",
+  "stateCount",
+  "transitionCount",
+  "outputCount",
+  "stringOffsets",
+  "stringData",
+  "entryIds",
+  "entryTerms",
+  "entryCategories",
+  "aliasOffsets",
+  "aliasStrings",
+  "patternEntries",
+  "patternLengths",
+  "categoryStrings",
+  "stateTransitions",
+  "transitionCodes",
+  "stateFail",
+  "stateOutputs",
+  "stateOutputLink",
+  "outputPatterns",
+  "byteLength"
+];
+
+const utf16Decoder = new TextDecoder("utf-16le");
+
+/**
+ * Zero-copy view over a packed glossary buffer.
+ * Entries are materialized lazily (and memoized) only when requested,
+ * so loading the glossary allocates a handful of typed-array views.
+ */
+export class PackedGlossary {
+  /**
+   * @param {ArrayBuffer} buffer
+   */
+  constructor(buffer) {
+    if (buffer.byteLength < PACK_HEADER_FIELDS.length * 4) {
+      throw new Error("Packed glossary is truncated");
+    }
+    const raw = new Uint32Array(buffer, 0, PACK_HEADER_FIELDS.length);
+    const header = {};
+    PACK_HEADER_FIELDS.forEach((name, index) => {
+      header[name] = raw[index];
+    });
+    if (header.magic !== PACK_MAGIC) {
+      throw new Error("Not a packed glossary");
+    }
+    if (header.formatVersion !== PACK_FORMAT_VERSION) {
+      throw new Error(`Unsupported packed glossary version ${header.formatVersion}`);
+    }
+    if (header.byteLength !== buffer.byteLength) {
+      throw new Error("Packed glossary size mismatch");
+    }
+    this.buffer = buffer;
+    this.header = header;
+    this.schemaVersion = header.schemaVersion;
+    this.length = header.entryCount;
+    this.patternCount = header.patternCount;
+
+    this.stringOffsets = new Uint32Array(buffer, header.stringOffsets, header.stringCount + 1);
+    this.stringData = new Uint16Array(buffer, header.stringData, this.stringOffsets[header.stringCount]);
+    this.entryIds = new Uint32Array(buffer, header.entryIds, header.entryCount);
+    this.entryTerms = new Uint32Array(buffer, header.entryTerms, header.entryCount);
+    this.entryCategories = new Uint16Array(buffer, header.entryCategories, header.entryCount);
+    this.aliasOffsets = new Uint32Array(buffer, header.aliasOffsets, header.entryCount + 1);
+    this.aliasStrings = new Uint32Array(buffer, header.aliasStrings, header.aliasCount);
+    this.patternEntries = new Uint32Array(buffer, header.patternEntries, header.patternCount);
+    this.patternLengths = new Uint16Array(buffer, header.patternLengths, header.patternCount);
+    this.categoryStrings = new Uint32Array(buffer, header.categoryStrings, header.categoryCount);
+
+    // Precompiled Aho-Corasick automaton (see compile_automaton in build_glossary.py)
+    this.stateTransitions = new Uint32Array(buffer, header.stateTransitions, header.stateCount + 1);
+    this.transitionCodes = new Uint16Array(buffer, header.transitionCodes, header.transitionCount);
+    this.stateFail = new Uint32Array(buffer, header.stateFail, header.stateCount);
+    this.stateOutputs = new Uint32Array(buffer, header.stateOutputs, header.stateCount + 1);
+    this.stateOutputLink = new Uint32Array(buffer, header.stateOutputLink, header.stateCount);
+    this.outputPatterns = new Uint32Array(buffer, header.outputPatterns, header.outputCount);
+
+    this.entryCache = new Map();
+    this.idIndex = null;
+  }
+
+  /**
+   * @param {number} index - String table index.
+   * @returns {string}
+   */
+  getString(index) {
+    const start = this.stringOffsets[index];
+    const end = this.stringOffsets[index + 1];
+    return utf16Decoder.decode(this.stringData.subarray(start, end));
+  }
+
+  /**
+   * @param {number} index - Entry index.
+   * @returns {{id: string, term: string, aliases: string[], category: string}|undefined}
+   */
+  getEntry(index) {
+    if (index < 0 || index >= this.length) return undefined;
+    let entry = this.entryCache.get(index);
+    if (!entry) {
+      const aliases = [];
+      for (let a = this.aliasOffsets[index]; a < this.aliasOffsets[index + 1]; a++) {
+        aliases.push(this.getString(this.aliasStrings[a]));
+      }
+      entry = {
+        id: this.getString(this.entryIds[index]),
+        term: this.getString(this.entryTerms[index]),
+        aliases,
+        category: this.getString(this.categoryStrings[this.entryCategories[index]])
+      };
+      this.entryCache.set(index, entry);
+    }
+    return entry;
+  }
+
+  /**
+   * Looks an entry up by QID; the id map is built on the first call.
+   * @param {string} id
+   * @returns {{id: string, term: string, aliases: string[], category: string}|undefined}
+   */
+  findEntry(id) {
+    if (!this.idIndex) {
+      this.idIndex = new Map();
+      for (let index = 0; index < this.length; index++) {
+        this.idIndex.set(this.getString(this.entryIds[index]), index);
+      }
+    }
+    const index = this.idIndex.get(id);
+    return index === undefined ? undefined : this.getEntry(index);
+  }
+}
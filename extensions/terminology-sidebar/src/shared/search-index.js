@@ -0,0 +1,200 @@
+// Reader for the sidebar search index written by tools/build_glossary.py
+// (build_search_index). Layout: a header of little-endian uint32 fields
+// (SEARCH_HEADER_FIELDS order) followed by 4-byte aligned typed-array sections.
+
+export const SEARCH_FORMAT_VERSION = 1;
+
+const SEARCH_MAGIC = 0x53475354; // "TSGS"
+
+const SEARCH_HEADER_FIELDS = [
+  "magic",
+  "formatVersion",
+  "schemaVersion",
+  "entryCount",
+  "keyCount",
+  "gramSize",
+  "gramCount",
+  "postingCount",
+  "postingBytes",
+  "keyOffsets",
+  "keyData",
+  "keyEntries",
+  "gramUnits",
+  "gramPostingOffsets",
+  "gramPostings",
+  "byteLength"
+];
+
+// Result ranks, best first.
+export const SEARCH_RANK = {
+  exact: 0,
+  prefix: 1,
+  infix: 2,
+  fuzzy: 3
+};
+
+const searchDecoder = new TextDecoder("utf-16le");
+
+/**
+ * Prefix, infix and typo-tolerant lookup over the sorted keys of one language.
+ * Keys are compared as UTF-16 code units directly in the buffer; only the
+ * keys that end up in a result are decoded.
+ */
+export class SearchIndex {
+  /**
+   * @param {ArrayBuffer} buffer
+   */
+  constructor(buffer) {
+    if (buffer.byteLength < SEARCH_HEADER_FIELDS.length * 4) {
+      throw new Error("Search index is truncated");
+    }
+    const raw = new Uint32Array(buffer, 0, SEARCH_HEADER_FIELDS.length);
+    const header = {};
+    SEARCH_HEADER_FIELDS.forEach((name, index) => {
+      header[name] = raw[index];
+    });
+    if (header.magic !== SEARCH_MAGIC) {
+      throw new Error("Not a search index");
+    }
+    if (header.formatVersion !== SEARCH_FORMAT_VERSION) {
+      throw new Error(`Unsupported search index version ${header.formatVersion}`);
+    }
+    if (header.byteLength !== buffer.byteLength) {
+      throw new Error("Search index size mismatch");
+    }
+    this.schemaVersion = header.schemaVersion;
+    this.entryCount = header.entryCount;
+    this.keyCount = header.keyCount;
+    this.gramSize = header.gramSize;
+    this.gramCount = header.gramCount;
+
+    this.keyOffsets = new Uint32Array(buffer, header.keyOffsets, header.keyCount + 1);
+    this.keyData = new Uint16Array(buffer, header.keyData, this.keyOffsets[header.keyCount]);
+    this.keyEntries = new Uint32Array(buffer, header.keyEntries, header.keyCount);
+    this.gramUnits = new Uint16Array(buffer, header.gramUnits, header.gramCount * header.gramSize);
+    this.gramPostingOffsets = new Uint32Array(buffer, header.gramPostingOffsets, header.gramCount + 1);
+    // Varint-encoded gaps between ascending key indexes, byte ranges per gram.
+    this.gramPostings = new Uint8Array(buffer, header.gramPostings, header.postingBytes);
+
+    // Per-key n-gram hit counters, reset after every query.
+    this.hits = new Uint16Array(header.keyCount);
+  }
+
+  /**
+   * @param {number} key - Key index.
+   * @returns {string}
+   */
+  getKey(key) {
+    return searchDecoder.decode(this.keyData.subarray(this.keyOffsets[key], this.keyOffsets[key + 1]));
+  }
+
+  // Compares key `key` with the first `length` code units of `query`:
+  // negative when the key sorts first, 0 when the key starts with them.
+  comparePrefix(key, query, length) {
+    const start = this.keyOffsets[key];
+    const keyLength = this.keyOffsets[key + 1] - start;
+    for (let i = 0; i < length; i++) {
+      if (i >= keyLength) return -1;
+      const diff = this.keyData[start + i] - query.charCodeAt(i);
+      if (diff) return diff;
+    }
+    return 0;
+  }
+
+  findGram(gram) {
+    const size = this.gramSize;
+    let lo = 0;
+    let hi = this.gramCount - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >> 1;
+      let diff = 0;
+      for (let i = 0; i < size && !diff; i++) {
+        diff = this.gramUnits[mid * size + i] - gram.charCodeAt(i);
+      }
+      if (!diff) return mid;
+      if (diff < 0) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return -1;
+  }
+
+  /**
+   * @param {string} query - Already normalized (see build_search_index).
+   * @param {{limit: number, fuzzyRatio: number}} options
+   * @returns {Array<{entry: number, key: number, rank: number, score: number}>}
+   *   Best key per entry, ordered by rank, n-gram hits, key length and key order.
+   */
+  search(query, { limit, fuzzyRatio }) {
+    const results = new Map();
+    const add = (key, rank, score) => {
+      const entry = this.keyEntries[key];
+      const previous = results.get(entry);
+      if (!previous || rank < previous.rank || (rank === previous.rank && score > previous.score)) {
+        results.set(entry, { entry, key, rank, score });
+      }
+    };
+
+    // Prefix range: lower bound, then walk while keys keep the prefix.
+    let lo = 0;
+    let hi = this.keyCount;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.comparePrefix(mid, query, query.length) < 0) lo = mid + 1;
+      else hi = mid;
+    }
+    for (let key = lo; key < this.keyCount && results.size < limit; key++) {
+      if (this.comparePrefix(key, query, query.length) !== 0) break;
+      const exact = this.keyOffsets[key + 1] - this.keyOffsets[key] === query.length;
+      add(key, exact ? SEARCH_RANK.exact : SEARCH_RANK.prefix, query.length);
+    }
+
+    // n-gram postings: all grams present = infix candidate, enough of them = fuzzy match.
+    const grams = new Set();
+    for (let offset = 0; offset + this.gramSize <= query.length; offset++) {
+      grams.add(query.substr(offset, this.gramSize));
+    }
+    if (grams.size) {
+      const touched = [];
+      for (const text of grams) {
+        const gram = this.findGram(text);
+        if (gram < 0) continue;
+        const postings = this.gramPostings;
+        const end = this.gramPostingOffsets[gram + 1];
+        let key = 0;
+        for (let p = this.gramPostingOffsets[gram]; p < end;) {
+          let gap = 0;
+          let shift = 0;
+          let byte;
+          do {
+            byte = postings[p++];
+            gap |= (byte & 0x7f) << shift;
+            shift += 7;
+          } while (byte & 0x80);
+          key += gap;
+          if (this.hits[key]++ === 0) touched.push(key);
+        }
+      }
+      const required = Math.max(1, Math.ceil(grams.size * fuzzyRatio));
+      for (const key of touched) {
+        const hits = this.hits[key];
+        this.hits[key] = 0;
+        if (hits < required) continue;
+        if (hits === grams.size && this.getKey(key).includes(query)) {
+          add(key, SEARCH_RANK.infix, hits);
+        } else {
+          add(key, SEARCH_RANK.fuzzy, hits);
+        }
+      }
+    }
+
+    const ranked = Array.from(results.values());
+    const keyLength = (key) => this.keyOffsets[key + 1] - this.keyOffsets[key];
+    ranked.sort((a, b) => (
+      a.rank - b.rank ||
+      b.score - a.score ||
+      keyLength(a.key) - keyLength(b.key) ||
+      a.key - b.key
+    ));
+    return ranked.slice(0, limit);
+  }
+}
@@ -40,6 +40,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     btnOnline: qs(".ts-online"),
     btnOnlineRefresh: qs(".ts-online-refresh"),
     btnClearCache: qs(".ts-clear-cache"),
+    cacheStatsEl: qs(".ts-cache-stats"),
     inputSearch: qs(".ts-search"),
     btnClearSearch: qs(".ts-clear-search"),
     summaryEl: qs(".ts-summary"),
@@ -49,6 +50,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     selectLimit: qs(".ts-setting-limit"),
     selectTheme: qs(".ts-setting-theme"),
     checkIncludeCode: qs(".ts-setting-include-code"),
+    checkAllDomains: qs(".ts-setting-all-domains"),
     checkOnline: qs(".ts-setting-online"),
     toastEl: qs(".ts-toast"),
     tutorialEl: qs(".ts-tutorial"),
@@ -230,6 +232,14 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     elements.summaryEl.textContent = `${label}: ${state.currentShown}/${state.currentTotal}`;
   };
 
+  const updateCacheStats = (stats) => {
+    if (!elements.cacheStatsEl) return;
+    const parts = [`${i18n.getMessage("cacheStatsLabel")}: ${stats.storedEntries ?? "?"} ${i18n.getMessage("cacheStatsEntries")}`];
+    parts.push(`${i18n.getMessage("cacheStatsHits")} ${stats.hits}`);
+    parts.push(`${i18n.getMessage("cacheStatsMisses")} ${stats.misses}`);
+    elements.cacheStatsEl.textContent = parts.join(" · ");
+  };
+
   const updateEmptyState = () => {
     if (!elements.emptyEl) return;
     if (state.currentShown > 0) {
@@ -255,6 +265,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     elements.selectLimit.value = String(settings.listLimit || 40);
     elements.selectTheme.value = settings.theme || "auto";
     elements.checkIncludeCode.checked = Boolean(settings.includeCode);
+    elements.checkAllDomains.checked = Boolean(settings.allDomains);
     elements.checkOnline.checked = Boolean(settings.onlineEnabled);
     renderDetail({ 
       elements, 
@@ -383,6 +394,9 @@ export const initSidebar = ({ root, port, language, i18n }) => {
     if (message.type === MESSAGE_TYPES.settings) {
       applySettings(message.settings || {});
     }
+    if (message.type === MESSAGE_TYPES.cacheStats) {
+      updateCacheStats(message.stats || {});
+    }
     if (message.type === MESSAGE_TYPES.status) {
       const statusMap = {
         scanning: i18n.getMessage("statusScanning"),
@@ -403,6 +417,7 @@ export const initSidebar = ({ root, port, language, i18n }) => {
   elements.btnSettings.addEventListener("click", () => {
     const open = elements.settingsPanel.style.display !== "grid";
     elements.settingsPanel.style.display = open ? "grid" : "none";
+    if (open) sendAction("cacheStats");
   });
   elements.inputSearch.addEventListener("input", (event) => {
     const value = event.target.value || "";
@@ -430,6 +445,9 @@ export const initSidebar = ({ root, port, language, i18n }) => {
   elements.checkIncludeCode.addEventListener("change", (event) => {
     sendAction("settings", { settings: { includeCode: event.target.checked } });
   });
+  elements.checkAllDomains.addEventListener("change", (event) => {
+    sendAction("settings", { settings: { allDomains: event.target.checked } });
+  });
   elements.checkOnline.addEventListener("change", (event) => {
     sendAction("settings", { settings: { onlineEnabled: event.target.checked } });
   });
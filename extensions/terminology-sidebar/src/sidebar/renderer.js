@@ -224,7 +224,7 @@ export const renderDetail = ({
       const sourceText = formatSource(item.source);
       const cacheText = item.cached ? i18n.getMessage("cacheHit") : i18n.getMessage("cacheMiss");
       const timeText = item.cacheTime ? new Date(item.cacheTime).toLocaleString() : "";
-      line.textContent = `${sourceText} · ${cacheText} · ${timeText}`;
+      line.textContent = [sourceText, cacheText, timeText].filter(Boolean).join(" · ");
       detailSources.appendChild(line);
       if (item.definition) {
         const def = document.createElement("div");
@@ -0,0 +1,390 @@
+"""Benchmark the glossary builder and the content matcher at scale.
+
+Usage:
+    python tools/bench_glossary.py [--sizes 3000,30000,150000] [--repeat 3]
+                                   [--update-baseline] [--tolerance 0.25]
+
+For every size a synthetic corpus of SPARQL rows (English/Chinese labels,
+descriptions, MeSH IDs, alias overrides and MeSH/FIBO definitions) is
+generated once and cached under tools/.cache/bench, then replayed through
+merge_rows, build_entry, resolve_variants and the JSON/packed writers in a fresh subprocess so
+wall time, CPU time and peak RSS are measured independently; each size runs
+--repeat times and the best value of every metric is kept. The packed and
+JSON outputs are then fed to tools/bench_matcher.js (when node is available)
+to time loading, compiling and scanning with the worker's matcher.
+
+Results are compared with tools/bench_baseline.json; any time, memory or
+size metric that grows by more than --tolerance is reported and the script
+exits with status 1. --update-baseline rewrites the baseline instead.
+
+Peak RSS grows roughly linearly (about 14 KiB per term), so the 500000-term
+run (--sizes 500000) needs around 7 GiB and is not part of the default set.
+"""
+import argparse
+import gzip
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import build_glossary  # noqa: E402
+
+DEFAULT_SIZES = (3000, 30000, 150000)
+CORPUS_VERSION = 2
+CORPUS_SEED = 20260101
+BENCH_CACHE_DIR = os.path.join(build_glossary.CACHE_DIR, "bench")
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+MATCHER_BENCH = os.path.join(os.path.dirname(__file__), "bench_matcher.js")
+# Timings below this are dominated by noise and never count as regressions.
+MIN_COMPARED_SECONDS = 0.25
+
+SYLLABLES = (
+    "al", "an", "bio", "car", "cel", "chro", "con", "cryp", "da", "de", "dyn", "en",
+    "ex", "fer", "gen", "graph", "hy", "in", "ka", "lin", "lo", "log", "ma", "ment",
+    "mi", "mo", "neu", "ni", "no", "on", "pa", "pha", "po", "pro", "qua", "ra", "ri",
+    "ro", "sa", "sen", "sor", "sta", "syn", "ta", "ter", "ti", "to", "tra", "tro", "un",
+    "va", "vel", "vi", "xo", "za"
+)
+ZH_CHARS = (
+    "数据结构算法网络协议系统模型分析管理金融资本市场风险投资法律合同责任诉讼医学疾病"
+    "诊断治疗药物细胞基因蛋白免疫神经心脏血液肿瘤软件工程测试编译函数变量接口服务器"
+    "存储缓存安全加密认证权限交易结算清算债券股票期货利率汇率信用审计税务监管证券"
+)
+PARENTS_PER_CLASS = 40  # average number of items per synthetic parent class
+FILLER = (
+    "the", "of", "and", "a", "to", "in", "is", "that", "for", "with", "as", "on", "by",
+    "this", "are", "from", "at", "which", "be", "or"
+)
+
+
+def make_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 4)))
+
+
+def make_term(rng):
+    words = [make_word(rng) for _ in range(rng.choice((1, 1, 2, 2, 2, 3)))]
+    style = rng.random()
+    if style < 0.05:
+        return "".join(word[0] for word in words).upper() + make_word(rng)[:2].upper()
+    if style < 0.35:
+        return " ".join(word.capitalize() for word in words)
+    return " ".join(words)
+
+
+def make_sentence(rng, words):
+    tokens = [make_word(rng) if rng.random() < 0.5 else rng.choice(FILLER) for _ in range(words)]
+    return " ".join(tokens).capitalize() + "."
+
+
+def make_zh(rng, low, high):
+    return "".join(rng.choice(ZH_CHARS) for _ in range(rng.randint(low, high)))
+
+
+def generate_corpus(size, seed=CORPUS_SEED):
+    """Synthetic harvest: SPARQL rows per domain plus the side inputs of build_entry."""
+    rng = random.Random(seed + size)
+    # Parent classes draw from their own generator so adding them left the
+    # rest of the corpus unchanged.
+    class_rng = random.Random(seed - size)
+    classes = [f"Q{size + index + 1}" for index in range(max(1, size // PARENTS_PER_CLASS))]
+    domains = [domain["name"] for domain in build_glossary.DOMAINS]
+    rows = {name: [] for name in domains}
+    aliases = {}
+    mesh = {}
+    fibo = {}
+    terms = set()
+    zh_terms = set()
+    for index in range(size):
+        term = make_term(rng)
+        while term.lower() in terms:
+            term = make_term(rng)
+        terms.add(term.lower())
+        zh_term = make_zh(rng, 2, 6)
+        while zh_term in zh_terms:
+            zh_term = make_zh(rng, 2, 7)
+        zh_terms.add(zh_term)
+        domain = domains[index % len(domains)]
+        row = {
+            "item": {"value": f"{build_glossary.WIKIDATA_ENTITY_PREFIX}Q{index + 1}"},
+            "itemLabelEn": {"value": term},
+            "itemLabelZh": {"value": zh_term},
+            "enDesc": {"value": " ".join(make_sentence(rng, rng.randint(6, 18)) for _ in range(rng.randint(1, 3)))},
+            "zhDesc": {"value": "。".join(make_zh(rng, 8, 30) for _ in range(rng.randint(1, 3))) + "。"},
+            "parents": {"value": " ".join(class_rng.sample(classes, min(len(classes), class_rng.randint(1, 3))))}
+        }
+        if domain == "Medical":
+            mesh_id = f"D{index + 1:06d}"
+            row["meshId"] = {"value": mesh_id}
+            if rng.random() < 0.6:
+                mesh[mesh_id] = make_sentence(rng, rng.randint(10, 24))
+        elif domain == "Finance" and rng.random() < 0.3:
+            fibo[build_glossary.fibo_key(term)] = make_sentence(rng, rng.randint(10, 24))
+        if rng.random() < 0.2:
+            words = term.split()
+            candidates = [make_term(rng)]
+            if len(words) > 2:
+                candidates.append("".join(word[0] for word in words).upper())
+            aliases[term.lower()] = candidates[:rng.randint(1, 2)]
+        rows[domain].append(row)
+    return {
+        "version": CORPUS_VERSION,
+        "size": size,
+        "rows": rows,
+        "aliases": aliases,
+        "mesh": mesh,
+        "fibo": fibo
+    }
+
+
+def load_corpus(size):
+    path = os.path.join(BENCH_CACHE_DIR, f"corpus_{size}_{CORPUS_SEED}_v{CORPUS_VERSION}.json.gz")
+    if os.path.exists(path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    corpus = generate_corpus(size)
+    os.makedirs(BENCH_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+        json.dump(corpus, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return corpus
+
+
+def time_calls(func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return time.perf_counter() - start
+
+
+def run_pipeline(size, out_dir):
+    """Run in a subprocess: one corpus size through the Python pipeline."""
+    corpus = load_corpus(size)
+    build_glossary.DATA_DIR = out_dir
+    build_glossary.DOMAIN_LIMIT = size
+    profiler = build_glossary.BuildProfiler()
+    metrics = {}
+
+    with profiler.stage("merge"):
+        items = {}
+        for domain, rows in corpus["rows"].items():
+            build_glossary.merge_rows(items, domain, rows, set())
+
+    descriptions = [row["enDesc"]["value"] for rows in corpus["rows"].values() for row in rows]
+    terms = [item["en"] for item in items.values()]
+    metrics["extractSentence.seconds"] = time_calls(build_glossary.extract_sentence, descriptions)
+    metrics["isEnTermClean.seconds"] = time_calls(build_glossary.is_en_term_clean, terms)
+    metrics["generateVariants.seconds"] = time_calls(build_glossary.generate_variants, terms)
+    metrics["fiboKey.seconds"] = time_calls(build_glossary.fibo_key, terms)
+
+    with profiler.stage("entries"):
+        survivors, _ = build_glossary.screen_items(items)
+        entries = [
+            build_glossary.build_entry(
+                item, corpus["aliases"], corpus["mesh"], corpus["fibo"], {}, screened=True
+            )
+            for item in survivors
+        ]
+        build_glossary.rank_entries(entries)
+    with profiler.stage("variants"):
+        entries, collisions = build_glossary.resolve_variants(entries)
+    metrics["variantCollisions"] = len(collisions)
+    with profiler.stage("related"):
+        metrics["relatedLinked"] = build_glossary.compute_related(entries)
+
+    report = build_glossary.ArtifactReport()
+    meta = build_glossary.build_meta({name: len(rows) for name, rows in corpus["rows"].items()})
+    with profiler.stage("write-json"):
+        build_glossary.write_glossary_outputs(entries, meta, {}, report, indent=2)
+    with profiler.stage("write-packed"):
+        build_glossary.write_packed_glossaries(entries, report)
+    with profiler.stage("write-search"):
+        build_glossary.write_search_indexes(entries, report)
+
+    for record in profiler.stages:
+        metrics[f"{record['name']}.seconds"] = record["seconds"]
+        metrics[f"{record['name']}.peakRssKiB"] = record["peakRssKiB"]
+    metrics["entries"] = len(entries)
+    metrics["patterns"] = sum(1 + len(entry["aliases"]) for entry in entries)
+    metrics["peakRssKiB"] = build_glossary.peak_rss_kib()
+    for name, _, size_bytes, _ in report.rows:
+        metrics[f"bytes.{name}"] = size_bytes
+    metrics["bytes.total"] = sum(row[2] for row in report.rows)
+    print(json.dumps(metrics))
+
+
+def run_matcher(out_dir):
+    node = shutil.which("node")
+    if not node:
+        return {}
+    output = subprocess.run(
+        [node, "--expose-gc", MATCHER_BENCH, out_dir],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_once(size):
+    out_dir = tempfile.mkdtemp(prefix=f"glossary-bench-{size}-")
+    try:
+        output = subprocess.run(
+            [sys.executable, __file__, "--run", str(size), out_dir],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        metrics = json.loads(output.strip().splitlines()[-1])
+        for key, value in run_matcher(out_dir).items():
+            metrics[f"matcher.{key}"] = value
+        return metrics
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def bench_size(size, repeat):
+    """Best (lowest) value of every metric over `repeat` runs."""
+    # Build the corpus fixture up front so generation is not timed.
+    load_corpus(size)
+    best = {}
+    for _ in range(repeat):
+        for key, value in bench_once(size).items():
+            best[key] = min(best[key], value) if key in best else value
+    return best
+
+
+def is_compared(key):
+    return key.endswith((".seconds", "Seconds", "KiB")) or key.startswith("bytes.")
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, metrics in results.items():
+        previous = baseline.get("sizes", {}).get(size)
+        if not previous:
+            print(f"- {size}: no baseline")
+            continue
+        for key, value in sorted(metrics.items()):
+            old = previous.get(key)
+            if not is_compared(key) or not old or not isinstance(value, (int, float)):
+                continue
+            if key.endswith("econds") and max(old, value) < MIN_COMPARED_SECONDS:
+                continue
+            ratio = value / old
+            if ratio > 1 + tolerance:
+                regressions.append((size, key, old, value, ratio))
+    return regressions
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+
+def print_results(results):
+    for size, metrics in results.items():
+        entries = metrics["entries"]
+        print(f"{size} terms ({entries} entries, {metrics['patterns']} patterns)")
+        for stage in ("merge", "entries", "variants", "related", "write-json", "write-packed", "write-search"):
+            seconds = metrics[f"{stage}.seconds"]
+            print(f"- {stage:<13} {seconds:8.2f}s {entries / seconds:10.0f} entries/s")
+        for name in ("extractSentence", "isEnTermClean", "generateVariants", "fiboKey"):
+            seconds = metrics[f"{name}.seconds"]
+            print(f"- {name:<16} {seconds:5.2f}s {entries / seconds:10.0f} calls/s")
+        print(
+            f"- peak RSS {metrics['peakRssKiB'] / 1024:.1f} MiB, "
+            f"artifacts {metrics['bytes.total'] / (1024 * 1024):.1f} MiB "
+            f"(en.bin {metrics['bytes.glossary_en.bin'] / 1024:.0f} KiB, "
+            f"detail {metrics['bytes.glossary_detail.json'] / 1024:.0f} KiB)"
+        )
+        for lang in ("en", "zh"):
+            prefix = f"matcher.{lang}."
+            if f"{prefix}scanSeconds" not in metrics:
+                continue
+            chars = metrics[f"{prefix}chars"]
+            print(
+                f"- matcher {lang}: pack load {metrics[f'{prefix}loadSeconds'] * 1000:.1f} ms "
+                f"(hot tier {metrics.get(f'{prefix}hotLoadSeconds', 0) * 1000:.1f} ms), "
+                f"JSON compile {metrics[f'{prefix}compileSeconds'] * 1000:.0f} ms, "
+                f"scan {chars / metrics[f'{prefix}scanSeconds'] / 1e6:.1f} M chars/s "
+                f"({metrics[f'{prefix}matches']} matches)"
+            )
+        if "matcher.retainedKiB" in metrics:
+            print(f"- matcher retained {metrics['matcher.retainedKiB'] / 1024:.1f} MiB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the glossary builder and matcher.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated corpus sizes (number of harvested terms)"
+    )
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="runs per size; the best value of each metric is kept"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative growth before a metric counts as a regression"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "--run":
+        run_pipeline(int(sys.argv[2]), sys.argv[3])
+        return
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = {}
+    for size in sizes:
+        results[str(size)] = bench_size(size, max(1, args.repeat))
+    print_results(results)
+
+    if args.update_baseline:
+        baseline = {"machine": machine_info(), "sizes": results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            # Keep sizes that were not part of this run.
+            baseline["sizes"] = {**previous.get("sizes", {}), **results}
+        build_glossary.write_json(args.baseline, baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to record one.")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != machine_info():
+        print(f"Note: baseline was recorded on {baseline.get('machine')}")
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline.")
+        return
+    print("Regressions")
+    for size, key, old, value, ratio in regressions:
+        print(f"- {size} {key}: {old:.4g} -> {value:.4g} ({ratio:.2f}x)")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
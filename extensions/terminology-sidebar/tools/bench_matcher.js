@@ -0,0 +1,119 @@
+// Matcher benchmark used by tools/bench_glossary.py.
+// Usage: node --expose-gc tools/bench_matcher.js <dir with glossary_*.bin and glossary_*_index.json>
+// Prints one JSON line with load/compile/scan timings per language; hotLoadSeconds
+// times the hot tier (glossary_<lang>_hot.bin) that injection waits for.
+const fs = require('fs');
+const path = require('path');
+
+const SRC_DIR = path.resolve(__dirname, '../src');
+const SCAN_CHARS = 1 << 20;
+const SCAN_ROUNDS = 3;
+const CHUNK_CHARS = 2000;
+
+// Evaluate an ES module source in a function scope, the way bundle.js flattens it.
+const loadModule = (file, names, deps = {}) => {
+    const source = fs.readFileSync(path.join(SRC_DIR, file), 'utf8')
+        .replace(/^import .*$/mg, '')
+        .replace(/^export /mg, '')
+        .replace(/^self\.onmessage[\s\S]*$/m, '');
+    const body = `${source}\nreturn { ${names.join(', ')} };`;
+    return new Function(...Object.keys(deps), body)(...Object.values(deps));
+};
+
+const { PackedGlossary } = loadModule('shared/packed-glossary.js', ['PackedGlossary']);
+const { compileAutomaton, loadAutomaton, findMatches } = loadModule(
+    'content/worker.js',
+    ['compileAutomaton', 'loadAutomaton', 'findMatches'],
+    { PackedGlossary }
+);
+
+const toArrayBuffer = (buffer) => buffer.buffer.slice(buffer.byteOffset, buffer.byteOffset + buffer.length);
+
+// Deterministic page text: glossary terms interleaved with filler words.
+const buildChunks = (items, lang) => {
+    let seed = 12345;
+    const random = () => {
+        seed = (seed * 1103515245 + 12345) & 0x7fffffff;
+        return seed / 0x80000000;
+    };
+    const filler = lang === 'en' ? ['the', 'of', 'and', 'results', 'in', 'a', 'new'] : ['的', '和', '在', '研究', '是'];
+    const separator = lang === 'en' ? ' ' : '';
+    const parts = [];
+    let length = 0;
+    while (length < SCAN_CHARS) {
+        const word = random() < 0.2
+            ? items[Math.floor(random() * items.length)].term
+            : filler[Math.floor(random() * filler.length)];
+        parts.push(word);
+        length += word.length + separator.length;
+    }
+    const text = parts.join(separator);
+    const chunks = [];
+    for (let start = 0; start < text.length; start += CHUNK_CHARS) {
+        chunks.push({ id: chunks.length, text: text.slice(start, start + CHUNK_CHARS) });
+    }
+    return { chunks, chars: text.length };
+};
+
+const time = (fn) => {
+    const start = process.hrtime.bigint();
+    const result = fn();
+    return [result, Number(process.hrtime.bigint() - start) / 1e9];
+};
+
+const benchLanguage = (dir, lang) => {
+    const pack = toArrayBuffer(fs.readFileSync(path.join(dir, `glossary_${lang}.bin`)));
+    const index = JSON.parse(fs.readFileSync(path.join(dir, `glossary_${lang}_index.json`), 'utf8'));
+    const items = index.items || index;
+    const lowercase = lang === 'en';
+    const patterns = [];
+    items.forEach((entry, i) => {
+        [entry.term, ...(entry.aliases || [])].forEach((text) => {
+            patterns.push({ p: lowercase ? text.toLowerCase() : text, i, l: text.length });
+        });
+    });
+
+    const [automaton, loadSeconds] = time(() => loadAutomaton(pack, null));
+    const hotPath = path.join(dir, `glossary_${lang}_hot.bin`);
+    const hotPack = fs.existsSync(hotPath) ? toArrayBuffer(fs.readFileSync(hotPath)) : null;
+    const [, hotLoadSeconds] = hotPack ? time(() => loadAutomaton(hotPack, null)) : [null, 0];
+    const [compiled, compileSeconds] = time(() => compileAutomaton(patterns));
+    const { chunks, chars } = buildChunks(items, lang);
+    let scanSeconds = Infinity;
+    let matches = 0;
+    for (let round = 0; round < SCAN_ROUNDS; round++) {
+        const [result, seconds] = time(() => findMatches(automaton, chunks, { caseInsensitive: lowercase }));
+        scanSeconds = Math.min(scanSeconds, seconds);
+        matches = result.length;
+    }
+    return {
+        metrics: { loadSeconds, hotLoadSeconds, compileSeconds, scanSeconds, chars, matches },
+        retained: [automaton, compiled]
+    };
+};
+
+const main = () => {
+    const dir = process.argv[2];
+    if (!dir) {
+        console.error('Usage: node tools/bench_matcher.js <data dir>');
+        process.exit(2);
+    }
+    const result = {};
+    const retained = [];
+    for (const lang of ['en', 'zh']) {
+        const { metrics, retained: automata } = benchLanguage(dir, lang);
+        for (const [key, value] of Object.entries(metrics)) {
+            result[`${lang}.${key}`] = value;
+        }
+        retained.push(...automata);
+    }
+    // Memory kept by the loaded and compiled automata after a full GC (typed
+    // arrays live outside the JS heap); heapUsed alone depends on GC timing.
+    if (global.gc) global.gc();
+    const { heapUsed, arrayBuffers } = process.memoryUsage();
+    result.retainedKiB = Math.round((heapUsed + arrayBuffers) / 1024);
+    console.log(JSON.stringify(result));
+    return retained;
+};
+
+main();
@@ -0,0 +1,111 @@
+"""Compare the MeSH descriptor parsers on a real descriptor file.
+
+Usage:
+    python tools/bench_mesh.py [path/to/descYYYY.gz]
+
+Each parser runs in its own subprocess so wall time, throughput and peak RSS
+are measured independently. The default path is the file downloaded by
+build_glossary.py into tools/.cache.
+"""
+import gzip
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import build_glossary  # noqa: E402
+
+
+def parse_legacy(path):
+    # The iterparse + full-subtree walk used before iter_mesh_scope_notes.
+    definitions = {}
+    with gzip.open(path, "rb") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if not isinstance(elem.tag, str):
+                continue
+            if elem.tag.split("}")[-1] != "DescriptorRecord":
+                continue
+            mesh_id = build_glossary._text_by_localname(elem, "DescriptorUI")
+            scope_note = build_glossary._text_by_localname(elem, "ScopeNote")
+            if mesh_id and scope_note:
+                definitions[mesh_id] = build_glossary.extract_sentence(scope_note)
+            elem.clear()
+    return definitions
+
+
+def parse_streaming(path):
+    with gzip.open(path, "rb") as f:
+        return {
+            mesh_id: build_glossary.extract_sentence(scope_note)
+            for mesh_id, scope_note in build_glossary.iter_mesh_scope_notes(f)
+        }
+
+
+PARSERS = {
+    "legacy": parse_legacy,
+    "streaming": parse_streaming
+}
+
+
+def run_one(name, path):
+    start = time.perf_counter()
+    definitions = PARSERS[name](path)
+    elapsed = time.perf_counter() - start
+    digest = hashlib.sha256(
+        json.dumps(sorted(definitions.items()), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+    print(json.dumps({
+        "parser": name,
+        "seconds": elapsed,
+        "descriptors": len(definitions),
+        "peakRssKiB": peak,
+        "digest": digest
+    }))
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "--run":
+        run_one(sys.argv[2], sys.argv[3])
+        return
+    path = sys.argv[1] if len(sys.argv) > 1 else build_glossary.MESH_CACHE_FILE
+    if not os.path.exists(path):
+        build_glossary.download_file(build_glossary.MESH_DESC_URL, path)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    results = []
+    for name in PARSERS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--run", name, path],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"MeSH descriptors: {path} ({size_mb:.1f} MB compressed)")
+    for result in results:
+        print(
+            f"- {result['parser']:<10} {result['seconds']:7.2f}s "
+            f"{size_mb / result['seconds']:6.1f} MB/s "
+            f"{result['descriptors'] / result['seconds']:9.0f} records/s "
+            f"peak RSS {result['peakRssKiB'] / 1024:7.1f} MB"
+        )
+    baseline, candidate = results[0], results[1]
+    print(f"Speedup: {baseline['seconds'] / candidate['seconds']:.2f}x")
+    if baseline["digest"] != candidate["digest"]:
+        print("WARNING: parsers produced different definitions")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,180 @@
+import argparse
+import array
+import collections
+import contextlib
+import cProfile
+import email.message
+import email.utils
 import gzip
+import heapq
 import io
 import json
+import math
+import multiprocessing
 import os
+import queue
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
 import time
 import hashlib
+import html
 import urllib.parse
 import urllib.request
 import urllib.error
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(ROOT_DIR, "data")
 CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
 
-def clean_old_cache():
-    """Clean cache files older than 14 days."""
-    if not os.path.exists(CACHE_DIR):
-        return
-    
-    print("Checking for old cache files...")
-    now = time.time()
-    ttl = 14 * 24 * 3600  # 14 days
-    count = 0
-    
-    for filename in os.listdir(CACHE_DIR):
-        file_path = os.path.join(CACHE_DIR, filename)
-        if os.path.isfile(file_path):
-            try:
-                if now - os.path.getmtime(file_path) > ttl:
-                    os.remove(file_path)
-                    count += 1
-            except OSError:
-                pass
-    
-    if count > 0:
-        print(f"Cleaned {count} old cache files.")
-
-clean_old_cache()
-
 USER_AGENT = "TerminologySidebarBuild/1.0 (data build script)"
 SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
+WIKIDATA_API = "https://www.wikidata.org/w/api.php"
+WIKIPEDIA_API = "https://{lang}.wikipedia.org/w/api.php"
+WIKIDATA_ENTITY_PREFIX = "http://www.wikidata.org/entity/"
 MESH_YEAR = 2026
 MESH_DESC_URL = f"https://nlmpubs.nlm.nih.gov/projects/mesh/MESH_FILES/xmlmesh/desc{MESH_YEAR}.gz"
 FIBO_TBOX_URL = "https://raw.githubusercontent.com/edmcouncil/fibo/master/AboutFIBOProd-TBoxOnly.rdf"
 
 TARGET_TOTAL = 3000
+HOT_TIER_SIZE = 1000  # most popular entries per language, packed into glossary_<lang>_hot.bin
+# popularity_score(): log2(1 + sitelinks) plus these bonuses.
+POPULARITY_WEIGHTS = {
+    "domainFile": 4.0,  # curated in data/domains/*.json
+    "aliasOverride": 3.0,  # listed in aliases_en.json
+    "extraDomain": 1.0  # per domain beyond the first
+}
+RELATED_LIMIT = 8  # neighbours kept in detail.related
+RELATED_MIN_SCORE = 0.12  # cosine similarity below this is not worth showing
+RELATED_MAX_DF = 30  # features shared by more entries are too common to link them
+RELATED_MAX_FEATURES = 16  # heaviest features kept per entry
+RELATED_PARENT_WEIGHT = 2.0  # a shared parent class counts this much more than a shared word
 DOMAIN_LIMIT = 800
-ROOT_LIMIT = 300
+ROOT_LIMIT = 300  # items per root
+SPARQL_PAGE_SIZE = 100
 REQUEST_DELAY_SEC = 0.6
+RATE_LIMIT_BURST = 2
+HARVEST_WORKERS = 4
+HARVEST_PREFETCH_PAGES = 2  # pages a root may fetch ahead of the merge
 RETRY_LIMIT = 4
 RETRY_BACKOFF_SEC = 1.2
 HTTP_TIMEOUT_SEC = 60
-SCHEMA_VERSION = 2
+HTTP_READ_SIZE = 1024 * 1024
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+HTTP_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+HTTP_REVALIDATE_AFTER_SEC = 24 * 3600
+SPARQL_CACHE_MAX_AGE_SEC = 14 * 24 * 3600
+ENTITY_BATCH_SIZE = 50  # wbgetentities limit for ids per request
+ENTITY_CACHE_MAX_AGE_SEC = 14 * 24 * 3600
+WIKIDATA_MAXLAG = 5  # seconds of replica lag at which wbgetentities refuses the batch
+MIN_WIKIDATA_ALIAS_LENGTH = {"en": 3, "zh": 2}
+SUMMARY_BATCH_SIZE = 50  # titles per query; intro extracts still come 20 at a time
+SUMMARY_CACHE_MAX_AGE_SEC = 14 * 24 * 3600
+GZIP_MAGIC = b"\x1f\x8b"
+FIXTURE_VERSION = 1
+FIXTURE_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+BUILD_TIMESTAMP = None  # replayed builds reuse the recording time
+SCHEMA_VERSION = 3
+PACK_MAGIC = b"TSGP"
+PACK_FORMAT_VERSION = 3
+PACK_HEADER_FIELDS = (
+    "magic",
+    "formatVersion",
+    "schemaVersion",
+    "entryCount",
+    "stringCount",
+    "aliasCount",
+    "patternCount",
+    "categoryCount",
+    "stateCount",
+    "transitionCount",
+    "outputCount",
+    "stringOffsets",
+    "stringData",
+    "entryIds",
+    "entryTerms",
+    "entryCategories",
+    "aliasOffsets",
+    "aliasStrings",
+    "patternEntries",
+    "patternLengths",
+    "categoryStrings",
+    "stateTransitions",
+    "transitionCodes",
+    "stateFail",
+    "stateOutputs",
+    "stateOutputLink",
+    "outputPatterns",
+    "byteLength"
+)
+SEARCH_MAGIC = b"TSGS"
+SEARCH_FORMAT_VERSION = 1
+SEARCH_HEADER_FIELDS = (
+    "magic",
+    "formatVersion",
+    "schemaVersion",
+    "entryCount",
+    "keyCount",
+    "gramSize",
+    "gramCount",
+    "postingCount",
+    "postingBytes",
+    "keyOffsets",
+    "keyData",
+    "keyEntries",
+    "gramUnits",
+    "gramPostingOffsets",
+    "gramPostings",
+    "byteLength"
+)
+# Output languages: the Wikidata language tags harvested for labels and
+# descriptions, the key used in detail definitions, whether matching and
+# search fold case, and the search index n-gram size. Only languages the
+# extension loads (loadLanguage in src/content/glossary.js) belong here;
+# the outputs of any other row would only add package size.
+LANGUAGES = {
+    "en": {"tags": ("en",), "detailKey": "en", "caseFold": True, "gramSize": 3},
+    "zh": {"tags": ("zh", "zh-hans", "zh-hant"), "detailKey": "zh_CN", "caseFold": False, "gramSize": 2}
+}
+BASE_LANGUAGES = ("en", "zh")  # required by every entry and by the extension
+OUTPUT_LANGUAGES = BASE_LANGUAGES  # plus the extra languages from --languages
 ALIASES_FILE = os.path.join(DATA_DIR, "aliases_en.json")
-MAX_AUTO_ALIASES = 1
+MAX_AUTO_ALIASES = 8  # generated variants kept per entry
+VARIANT_COLLISION_EXAMPLES = 10
 MESH_CACHE_FILE = os.path.join(CACHE_DIR, f"mesh_desc_{MESH_YEAR}.gz")
 FIBO_CACHE_FILE = os.path.join(CACHE_DIR, "fibo_prod_tbox.rdf")
 FIBO_IMPORT_FILTERS = ("/FND/", "/FBC/", "/SEC/")
 FIBO_IMPORT_LIMIT = 25
+FIBO_IMPORT_DEPTH = 3
 FIBO_MAX_BYTES = 8 * 1024 * 1024
+FIBO_TOTAL_MAX_BYTES = 64 * 1024 * 1024
+FIBO_FETCH_WORKERS = 4
+FIBO_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+OWL_IMPORTS_TAG = "{http://www.w3.org/2002/07/owl#}imports"
+RDF_RESOURCE_ATTR = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource"
 DOMAIN_DATA_DIR = os.path.join(DATA_DIR, "domains")
+BUILD_MANIFEST_FILE = os.path.join(CACHE_DIR, "build_manifest.json")
+DETAIL_SHARD_SIZE = 64
+FNV32_OFFSET = 0x811C9DC5
+FNV32_PRIME = 0x01000193
+# Outputs of earlier builds that nothing ships any more.
+RETIRED_OUTPUTS = ("glossary_delta.json",)
+RETIRED_LANGUAGES = ("ja", "ko", "de")
+DOMAIN_PACKS_FILE = "glossary_domains.json"
+DEFINITION_STORE_FILE = os.path.join(CACHE_DIR, "definitions.sqlite")
+ENTITY_STORE_FILE = os.path.join(CACHE_DIR, "entities.sqlite")
+SUMMARY_STORE_FILE = os.path.join(CACHE_DIR, "summaries.sqlite")
 
 DOMAINS = [
     {
@@ -80,165 +195,741 @@ DOMAINS = [
     }
 ]
 
+# Hosts (and their subdomains) that only need one domain's pack; see
+# write_domain_packs(). Every other host gets the whole glossary.
+SITE_DOMAINS = {
+    "github.com": "Software Engineering",
+    "gitlab.com": "Software Engineering",
+    "stackoverflow.com": "Software Engineering",
+    "stackexchange.com": "Software Engineering",
+    "developer.mozilla.org": "Software Engineering",
+    "docs.python.org": "Software Engineering",
+    "npmjs.com": "Software Engineering",
+    "pypi.org": "Software Engineering",
+    "readthedocs.io": "Software Engineering",
+    "dev.to": "Software Engineering",
+    "news.ycombinator.com": "Software Engineering",
+    "investopedia.com": "Finance",
+    "bloomberg.com": "Finance",
+    "ft.com": "Finance",
+    "wsj.com": "Finance",
+    "sec.gov": "Finance",
+    "finance.yahoo.com": "Finance",
+    "law.cornell.edu": "Legal",
+    "justia.com": "Legal",
+    "findlaw.com": "Legal",
+    "eur-lex.europa.eu": "Legal",
+    "supremecourt.gov": "Legal",
+    "pubmed.ncbi.nlm.nih.gov": "Medical",
+    "ncbi.nlm.nih.gov": "Medical",
+    "medlineplus.gov": "Medical",
+    "mayoclinic.org": "Medical",
+    "who.int": "Medical",
+    "nejm.org": "Medical",
+    "thelancet.com": "Medical"
+}
+
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(CACHE_DIR, exist_ok=True)
 
 
-def _cache_path(url):
-    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
-    return os.path.join(CACHE_DIR, f"{digest}.json")
+def peak_rss_kib(who=None):
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class BuildProfiler:
+    """Per-stage and per-request timings for one build.
+
+    Stages nest; HTTP activity counts toward every open stage and each
+    request is tagged with the innermost one. When cprofile_dir is set,
+    stages opened with cpu=True also dump a cProfile .pstats file.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stack = []
+        self.stages = []
+        self.requests = []
+        self.cprofile_dir = None
+        self.profiling = False
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, cpu=False):
+        record = {
+            "name": name,
+            "parent": self.stack[-1]["name"] if self.stack else None,
+            "seconds": 0.0,
+            "cpuSeconds": 0.0,
+            "requests": 0,
+            "bytes": 0,
+            "cacheHits": 0,
+            "cacheMisses": 0,
+            "retries": 0,
+            "rateLimitWait": 0.0,
+            "peakRssKiB": None
+        }
+        with self.lock:
+            self.stack.append(record)
+            self.stages.append(record)
+        profile = None
+        if cpu and self.cprofile_dir and not self.profiling:
+            # Only one cProfile hook can be active at a time.
+            profile = cProfile.Profile()
+            self.profiling = True
+            profile.enable()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 4)
+            record["cpuSeconds"] = round(time.process_time() - cpu_start, 4)
+            record["peakRssKiB"] = peak_rss_kib()
+            if profile is not None:
+                profile.disable()
+                self.profiling = False
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                profile.dump_stats(os.path.join(self.cprofile_dir, f"{name}.pstats"))
+            with self.lock:
+                self.stack.remove(record)
+
+    def record_request(self, url, outcome, size, seconds, retries, wait):
+        """outcome is hit, revalidated, stale (no body transferred), miss, refreshed or error."""
+        with self.lock:
+            self.requests.append({
+                "url": url,
+                "stage": self.stack[-1]["name"] if self.stack else None,
+                "outcome": outcome,
+                "bytes": size,
+                "seconds": round(seconds, 4),
+                "retries": retries,
+                "rateLimitWait": round(wait, 4)
+            })
+            for record in self.stack:
+                record["requests"] += 1
+                record["bytes"] += size
+                record["retries"] += retries
+                record["rateLimitWait"] = round(record["rateLimitWait"] + wait, 4)
+                if outcome in ("hit", "revalidated", "stale"):
+                    record["cacheHits"] += 1
+                elif outcome in ("miss", "refreshed"):
+                    record["cacheMisses"] += 1
+
+    def print_summary(self):
+        print("Stages")
+        for record in self.stages:
+            indent = "  " if record["parent"] else ""
+            line = f"{indent}- {record['name']}: {record['seconds']:.2f}s wall, {record['cpuSeconds']:.2f}s CPU"
+            if record["requests"]:
+                line += (
+                    f", {record['requests']} requests ({record['cacheHits']} cached), "
+                    f"{record['bytes'] / 1024:.1f} KiB, {record['retries']} retries, "
+                    f"{record['rateLimitWait']:.2f}s rate-limited"
+                )
+            print(line)
+
+    def write_trace(self, path):
+        write_json(path, {
+            "totalSeconds": round(time.perf_counter() - self.started, 4),
+            "peakRssKiB": peak_rss_kib(),
+            "childPeakRssKiB": peak_rss_kib(resource.RUSAGE_CHILDREN) if resource else None,
+            "stages": self.stages,
+            "requests": self.requests
+        })
 
 
-def download_file(url, dest_path, delay_sec=REQUEST_DELAY_SEC):
-    if os.path.exists(dest_path):
-        return dest_path
-    attempt = 0
-    while True:
-        attempt += 1
-        time.sleep(delay_sec)
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": USER_AGENT
-            }
-        )
+_profiler = BuildProfiler()
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every request sent to one host."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    elapsed = max(0.0, now - self.updated)
+                    self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        # A 429 or Retry-After from one worker stalls every worker on the host.
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until > self.blocked_until:
+                self.blocked_until = until
+            self.tokens = 0
+            self.updated = max(self.updated, until - 1.0 / self.rate)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url):
+    host = urllib.parse.urlsplit(url).netloc
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(1.0 / REQUEST_DELAY_SEC, RATE_LIMIT_BURST)
+            _limiters[host] = limiter
+        return limiter
+
+
+def _retry_after_seconds(exc):
+    value = exc.headers.get("Retry-After") if exc.headers else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _backoff(limiter, exc, attempt):
+    if isinstance(exc, urllib.error.HTTPError) and exc.code in (429, 503):
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is None:
+            retry_after = RETRY_BACKOFF_SEC * attempt * (3 if exc.code == 429 else 1)
+        limiter.pause(retry_after)
+        return
+    time.sleep(RETRY_BACKOFF_SEC * attempt)
+
+
+class HttpCache:
+    """Content-addressed store for HTTP response bodies.
+
+    Each body is written once under objects/ by SHA-256, gzip-compressed
+    unless it already is gzip data. An SQLite index maps URLs to objects
+    together with their ETag/Last-Modified validators, and the least recently
+    used URLs are evicted once the objects exceed max_bytes.
+    """
+
+    def __init__(self, root=None, max_bytes=HTTP_CACHE_MAX_BYTES):
+        root = root or HTTP_CACHE_DIR
+        self.objects_dir = os.path.join(root, "objects")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self.conn.executescript("""
+CREATE TABLE IF NOT EXISTS objects (
+  digest TEXT PRIMARY KEY,
+  encoding TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+  url TEXT PRIMARY KEY,
+  digest TEXT NOT NULL,
+  etag TEXT,
+  last_modified TEXT,
+  checked_at REAL NOT NULL,
+  used_at REAL NOT NULL
+);
+""")
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT r.digest, r.etag, r.last_modified, r.checked_at, o.encoding, o.size "
+                "FROM responses r JOIN objects o ON o.digest = r.digest WHERE r.url = ?",
+                (url,)
+            ).fetchone()
+        if not row or not os.path.exists(self._object_path(row[0])):
+            return None
+        keys = ("digest", "etag", "last_modified", "checked_at", "encoding", "size")
+        return dict(zip(keys, row), url=url)
+
+    def touch(self, url, checked=False):
+        now = time.time()
+        with self.lock, self.conn:
+            if checked:
+                self.conn.execute(
+                    "UPDATE responses SET checked_at = ?, used_at = ? WHERE url = ?", (now, now, url)
+                )
+            else:
+                self.conn.execute("UPDATE responses SET used_at = ? WHERE url = ?", (now, url))
+
+    def store(self, url, response, max_bytes=None):
+        """Stream a 200 response into the cache; None if it exceeds max_bytes."""
+        length = response.headers.get("Content-Length")
+        if max_bytes is not None and length and int(length) > max_bytes:
+            return None
+        chunk = response.read(HTTP_READ_SIZE)
+        encoding = "identity" if chunk.startswith(GZIP_MAGIC) else "gzip"
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, suffix=".tmp")
         try:
-            with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT_SEC) as response:
-                with open(dest_path, "wb") as f:
-                    while True:
-                        chunk = response.read(1024 * 1024)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-            return dest_path
-        except urllib.error.HTTPError as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            if exc.code == 429:
-                time.sleep(RETRY_BACKOFF_SEC * attempt * 3)
+            with os.fdopen(fd, "wb") as raw:
+                out = raw if encoding == "identity" else gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+                while chunk:
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        return None
+                    digest.update(chunk)
+                    out.write(chunk)
+                    chunk = response.read(HTTP_READ_SIZE)
+                if out is not raw:
+                    out.close()
+            digest = digest.hexdigest()
+            path = self._object_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            stored_size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO objects (digest, encoding, size, stored_size) VALUES (?, ?, ?, ?)",
+                (digest, encoding, size, stored_size)
+            )
+            previous = self.conn.execute("SELECT digest FROM responses WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, digest, etag, last_modified, checked_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, digest, response.headers.get("ETag"), response.headers.get("Last-Modified"), now, now)
+            )
+            if previous:
+                self._drop_unreferenced(previous[0])
+            self._evict(keep=url)
+        return {
+            "url": url,
+            "digest": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": now,
+            "encoding": encoding,
+            "size": size
+        }
+
+    def discard(self, url):
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT digest FROM responses WHERE url = ?", (url,)).fetchone()
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            if row:
+                self._drop_unreferenced(row[0])
+
+    def _drop_unreferenced(self, digest):
+        if self.conn.execute("SELECT 1 FROM responses WHERE digest = ?", (digest,)).fetchone():
+            return 0
+        row = self.conn.execute("SELECT stored_size FROM objects WHERE digest = ?", (digest,)).fetchone()
+        self.conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
+        return row[0] if row else 0
+
+    def _evict(self, keep):
+        total = self.conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM objects").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = self.conn.execute(
+            "SELECT url, digest FROM responses WHERE url != ? ORDER BY used_at", (keep,)
+        ).fetchall()
+        for url, digest in victims:
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= self._drop_unreferenced(digest)
+            if total <= self.max_bytes:
+                break
+
+    def open(self, record):
+        path = self._object_path(record["digest"])
+        if record["encoding"] == "gzip":
+            return gzip.open(path, "rb")
+        return open(path, "rb")
+
+    def read(self, record):
+        with self.open(record) as f:
+            return f.read()
+
+    def materialize(self, record, dest_path):
+        """Make dest_path hold the body, hard-linking uncompressed objects."""
+        path = self._object_path(record["digest"])
+        if record["encoding"] == "identity":
+            if os.path.exists(dest_path) and os.path.samefile(path, dest_path):
+                return
+        elif os.path.exists(dest_path) and fingerprint_file(dest_path) == record["digest"]:
+            return
+        tmp_path = dest_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            if record["encoding"] == "identity":
+                os.link(path, tmp_path)
             else:
-                time.sleep(RETRY_BACKOFF_SEC * attempt)
-        except urllib.error.URLError as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
-        except Exception as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
+                raise OSError("compressed object")
+        except OSError:
+            with self.open(record) as src, open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, HTTP_READ_SIZE)
+        os.replace(tmp_path, dest_path)
 
 
-def fetch_json(url, delay_sec=REQUEST_DELAY_SEC):
-    cache_file = _cache_path(url)
-    if os.path.exists(cache_file):
-        with open(cache_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+class FixtureMissError(Exception):
+    """A replayed build asked for a URL the fixture bundle does not contain."""
+
+
+class FixtureResponse:
+    """File-backed stand-in for the urllib response object."""
+
+    def __init__(self, path, headers):
+        self.file = open(path, "rb")
+        self.headers = email.message.Message()
+        for name, value in headers.items():
+            self.headers[name] = value
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.file.close()
+
+
+class LiveTransport:
+    throttled = True
+
+    def open(self, request):
+        return urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SEC)
 
+    def close(self):
+        pass
+
+
+class RecordingTransport(LiveTransport):
+    """Live transport that also captures every 200 response into a fixture bundle.
+
+    Bodies go to <bundle>/bodies/<sha256>; close() writes manifest.json with
+    each URL's body digest, size, validators and observed latency, sealed by
+    a hash over the entries.
+    """
+
+    def __init__(self, bundle_dir):
+        self.bundle_dir = bundle_dir
+        self.bodies_dir = os.path.join(bundle_dir, "bodies")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.recorded_at = int(time.time())
+        manifest_path = os.path.join(bundle_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.entries.update(json.load(f).get("entries", {}))
+
+    def open(self, request):
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.bodies_dir, suffix=".tmp")
+        try:
+            with super().open(request) as response, os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = response.read(HTTP_READ_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    digest.update(chunk)
+                    f.write(chunk)
+                headers = {
+                    name: response.headers.get(name)
+                    for name in FIXTURE_HEADERS
+                    if response.headers.get(name)
+                }
+            body_path = os.path.join(self.bodies_dir, digest.hexdigest())
+            os.replace(tmp_path, body_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self.lock:
+            self.entries[request.full_url] = {
+                "body": digest.hexdigest(),
+                "size": size,
+                "headers": headers,
+                "elapsed": round(time.perf_counter() - start, 4)
+            }
+        return FixtureResponse(body_path, headers)
+
+    def close(self):
+        entries = dict(sorted(self.entries.items()))
+        write_json(os.path.join(self.bundle_dir, "manifest.json"), {
+            "version": FIXTURE_VERSION,
+            "recordedAt": self.recorded_at,
+            "seal": fingerprint_value(entries),
+            "entries": entries
+        })
+
+
+class ReplayTransport:
+    """Serves a sealed fixture bundle instead of the network.
+
+    With latency_scale > 0 each response is delayed by its recorded latency
+    times the scale and the per-host rate limiters apply as in a live build;
+    with 0 the build runs as fast as the local disk allows.
+    """
+
+    def __init__(self, bundle_dir, latency_scale=0.0):
+        with open(os.path.join(bundle_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported fixture bundle version in {bundle_dir}")
+        if fingerprint_value(manifest.get("entries", {})) != manifest.get("seal"):
+            raise ValueError(f"Fixture bundle {bundle_dir} was modified after recording")
+        self.bodies_dir = os.path.join(bundle_dir, "bodies")
+        self.entries = manifest["entries"]
+        self.recorded_at = manifest["recordedAt"]
+        self.latency_scale = latency_scale
+        self.throttled = latency_scale > 0
+
+    def open(self, request):
+        entry = self.entries.get(request.full_url)
+        if entry is None:
+            raise FixtureMissError(f"{request.full_url} is not in the fixture bundle")
+        path = os.path.join(self.bodies_dir, entry["body"])
+        if not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+            raise ValueError(f"Fixture body for {request.full_url} is missing or truncated")
+        if self.latency_scale:
+            time.sleep(entry["elapsed"] * self.latency_scale)
+        etag = entry["headers"].get("ETag")
+        if etag and request.get_header("If-none-match") == etag:
+            raise urllib.error.HTTPError(request.full_url, 304, "Not Modified", None, None)
+        return FixtureResponse(path, entry["headers"])
+
+    def close(self):
+        pass
+
+
+_transport = LiveTransport()
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def set_transport(transport):
+    global _transport
+    _transport = transport
+
+
+def set_cache_dir(path):
+    """Point every builder cache (HTTP, checkpoints, definitions, manifest) at `path`."""
+    global CACHE_DIR, HTTP_CACHE_DIR, MESH_CACHE_FILE, FIBO_CACHE_FILE
+    global BUILD_MANIFEST_FILE, DEFINITION_STORE_FILE, ENTITY_STORE_FILE, SUMMARY_STORE_FILE, _http_cache
+    CACHE_DIR = path
+    HTTP_CACHE_DIR = os.path.join(path, "http")
+    MESH_CACHE_FILE = os.path.join(path, os.path.basename(MESH_CACHE_FILE))
+    FIBO_CACHE_FILE = os.path.join(path, os.path.basename(FIBO_CACHE_FILE))
+    BUILD_MANIFEST_FILE = os.path.join(path, os.path.basename(BUILD_MANIFEST_FILE))
+    DEFINITION_STORE_FILE = os.path.join(path, os.path.basename(DEFINITION_STORE_FILE))
+    ENTITY_STORE_FILE = os.path.join(path, os.path.basename(ENTITY_STORE_FILE))
+    SUMMARY_STORE_FILE = os.path.join(path, os.path.basename(SUMMARY_STORE_FILE))
+    os.makedirs(path, exist_ok=True)
+    with _http_cache_lock:
+        _http_cache = None
+
+
+def get_http_cache():
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache()
+        return _http_cache
+
+
+def cached_fetch(url, accept=None, max_bytes=None, max_age=HTTP_REVALIDATE_AFTER_SEC):
+    """Return the cache record for `url`, revalidating it once older than max_age.
+
+    Revalidation sends If-None-Match / If-Modified-Since, so an unchanged
+    resource costs a 304 instead of a download. None means the body exceeded
+    max_bytes. If the server stays unreachable a stale copy is served; with
+    no copy the last error is raised.
+    """
+    cache = get_http_cache()
+    record = cache.lookup(url)
+    start = time.perf_counter()
+    if record and time.time() - record["checked_at"] < max_age:
+        cache.touch(url)
+        _profiler.record_request(url, "hit", 0, time.perf_counter() - start, 0, 0.0)
+        return record
+    headers = {"User-Agent": USER_AGENT}
+    if accept:
+        headers["Accept"] = accept
+    if record and record["etag"]:
+        headers["If-None-Match"] = record["etag"]
+    if record and record["last_modified"]:
+        headers["If-Modified-Since"] = record["last_modified"]
+
+    limiter = get_rate_limiter(url)
     attempt = 0
+    wait = 0.0
     while True:
         attempt += 1
-        time.sleep(delay_sec)
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "application/json"
-            }
-        )
+        if _transport.throttled:
+            wait += limiter.acquire()
+        req = urllib.request.Request(url, headers=headers)
         try:
-            with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT_SEC) as response:
-                raw = response.read().decode("utf-8")
-                data = json.loads(raw)
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False)
-            return data
+            with _transport.open(req) as response:
+                stored = cache.store(url, response, max_bytes)
+            _profiler.record_request(
+                url,
+                "refreshed" if record else "miss",
+                stored["size"] if stored else 0,
+                time.perf_counter() - start,
+                attempt - 1,
+                wait
+            )
+            return stored
+        except FixtureMissError:
+            _profiler.record_request(url, "error", 0, time.perf_counter() - start, attempt - 1, wait)
+            raise
         except urllib.error.HTTPError as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            if exc.code == 429:
-                time.sleep(RETRY_BACKOFF_SEC * attempt * 3)
-            else:
-                time.sleep(RETRY_BACKOFF_SEC * attempt)
-        except urllib.error.URLError as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
+            if exc.code == 304 and record:
+                cache.touch(url, checked=True)
+                _profiler.record_request(
+                    url, "revalidated", 0, time.perf_counter() - start, attempt - 1, wait
+                )
+                return record
+            error = exc
         except Exception as exc:
-            if attempt >= RETRY_LIMIT:
-                raise exc
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
+            error = exc
+        if attempt >= RETRY_LIMIT:
+            outcome = "stale" if record else "error"
+            _profiler.record_request(url, outcome, 0, time.perf_counter() - start, attempt - 1, wait)
+            if record:
+                print(f"Using cached copy of {url}: {error}")
+                return record
+            raise error
+        _backoff(limiter, error, attempt)
+
+
+def download_file(url, dest_path):
+    record = cached_fetch(url)
+    get_http_cache().materialize(record, dest_path)
+    return dest_path
+
+
+def fetch_json(url):
+    record = cached_fetch(url, "application/json", max_age=SPARQL_CACHE_MAX_AGE_SEC)
+    cache = get_http_cache()
+    try:
+        with cache.open(record) as f:
+            return json.load(f)
+    except ValueError:
+        cache.discard(url)
+        raise
 
 
 def fetch_bytes(url, accept, max_bytes):
-    attempt = 0
-    while True:
-        attempt += 1
-        time.sleep(REQUEST_DELAY_SEC)
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": accept
-            }
-        )
-        try:
-            with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT_SEC) as response:
-                length = response.headers.get("Content-Length")
-                if length and int(length) > max_bytes:
-                    return b""
-                chunks = []
-                total = 0
-                while True:
-                    chunk = response.read(1024 * 512)
-                    if not chunk:
-                        break
-                    total += len(chunk)
-                    if total > max_bytes:
-                        return b""
-                    chunks.append(chunk)
-                return b"".join(chunks)
-        except urllib.error.HTTPError as exc:
-            if attempt >= RETRY_LIMIT:
-                return b""
-            if exc.code == 429:
-                time.sleep(RETRY_BACKOFF_SEC * attempt * 3)
-            else:
-                time.sleep(RETRY_BACKOFF_SEC * attempt)
-        except urllib.error.URLError:
-            if attempt >= RETRY_LIMIT:
-                return b""
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
-        except Exception:
-            if attempt >= RETRY_LIMIT:
-                return b""
-            time.sleep(RETRY_BACKOFF_SEC * attempt)
+    try:
+        record = cached_fetch(url, accept, max_bytes)
+    except Exception:
+        return b""
+    if record is None or record["size"] > max_bytes:
+        return b""
+    return get_http_cache().read(record)
+
+
+# Sentence separators in priority order, with the length of the separator
+# that stays in the sentence ("." is followed by a space that is dropped).
+SENTENCE_SEPARATORS = (("。", 1), (". ", 0), ("！", 1), ("!", 1), ("？", 1), ("?", 1))
+CJK_RE = re.compile("[\u4e00-\u9fff]")
+NON_ALNUM_RUN_RE = re.compile(r"[\W_]+")
+ACRONYM_RE = re.compile(r"\b[A-Z][A-Z0-9]{2,7}\b")
+PARENTHESIZED_ACRONYM_RE = re.compile(r"(.+?)\s*\(([A-Z][A-Za-z0-9]{2,7})\)")
+VOWELS = "aeiou"
+# Heads of phrases like "theory of computation" are not the last word.
+FUNCTION_WORDS = frozenset(("of", "in", "on", "for", "and", "or", "at", "to", "with", "the", "by", "from"))
+# Mass nouns and -s singulars that have no other number.
+UNCOUNTED_ENDINGS = ("ogy", "ism", "istry", "ics", "ware", "emia")
+INVARIANT_NOUNS = frozenset(("series", "species", "rabies", "means", "news", "herpes", "diabetes", "measles"))
+# Heads that get no plural: mass nouns without one of the endings above,
+# and plurals that do not end in -s or whose singular is not a plain -s off.
+UNCOUNTABLE_NOUNS = frozenset((
+    "influenza", "malaria", "cholera", "pneumonia", "asthma", "diarrhea", "insulin", "oxygen", "hydrogen",
+    "nitrogen", "information", "equipment", "research", "knowledge", "evidence", "advice", "feedback",
+    "traffic", "bandwidth", "inflation", "liquidity", "machinery"
+))
+PLURAL_HEADS = frozenset((
+    "data", "metadata", "criteria", "phenomena", "media", "bacteria", "alumni", "fungi", "cacti", "algae",
+    "larvae", "vertebrae", "people", "children", "men", "women", "mice", "geese", "teeth", "feet",
+    "indices", "matrices", "vertices", "appendices", "analyses", "hypotheses", "theses", "crises"
+))
+# Sibilant "-es" plurals whose singular keeps the "e"; the others drop "es".
+E_STEM_PLURALS = frozenset((
+    "caches", "niches", "aches", "headaches", "avalanches", "moustaches", "quiches", "creches", "microfiches",
+    "crevasses", "finesses", "impasses", "posses"
+))
+# Single-word terms that are also regular verbs and get -ing/-ed aliases;
+# Wikidata items carry no part of speech, so other nouns get none.
+VERB_TERMS = frozenset((
+    "cache", "hash", "parse", "compile", "debug", "render", "stream", "index", "encrypt", "decrypt", "deploy",
+    "merge", "fork", "patch", "clone", "sort", "search", "query", "scan", "crawl", "route", "sample", "model",
+    "code", "encode", "decode", "compress", "backup", "benchmark", "refactor", "cluster", "filter", "hedge",
+    "lease", "trade", "invest", "mortgage", "leverage", "audit", "vaccinate", "diagnose", "screen", "test",
+    "commit", "submit", "program", "control", "transmit", "bitmap"
+))
+# Verbs that double their final consonant ("committing", "bitmapped").
+DOUBLING_VERBS = frozenset(("commit", "submit", "program", "control", "transmit", "bitmap"))
+MAX_GERUND_PLURAL_LENGTH = 6  # "strings" but not "engineerings"
+MAX_CLOSED_PART_LENGTH = 6  # "e-mail" -> "email", "data base" -> "database"
 
 
 def extract_sentence(text):
     if not text:
         return ""
-    normalized = " ".join(str(text).split()).strip()
+    normalized = " ".join(str(text).split())
     if not normalized:
         return ""
-    for sep in ["。", ". ", "！", "!", "？", "?"]:
+    for sep, keep in SENTENCE_SEPARATORS:
         idx = normalized.find(sep)
         if idx > 0:
-            return normalized[:idx + (1 if sep in ["。", "！", "!", "？", "?"] else 0)].strip()
+            return normalized[:idx + keep].strip()
     return normalized[:240]
 
 
 def has_cjk(text):
-    for ch in text:
-        if "\u4e00" <= ch <= "\u9fff":
-            return True
-    return False
+    return CJK_RE.search(text) is not None
 
 
 def is_en_term_clean(text):
     if not text or has_cjk(text):
         return False
-    letters = sum(1 for ch in text if ch.isalpha())
-    alnum = sum(1 for ch in text if ch.isalnum())
+    letters = sum(map(str.isalpha, text))
+    alnum = sum(map(str.isalnum, text))
     if letters < 2:
         return False
     if alnum == 0:
@@ -261,56 +952,102 @@ def _text_by_localname(elem, localname, lang=None):
     return ""
 
 
+MESH_RECORD_END = b"</DescriptorRecord>"
+MESH_READ_SIZE = 1024 * 1024
+
+
+def _mesh_field(record, open_tag, close_tag):
+    start = record.find(open_tag)
+    if start == -1:
+        return ""
+    start += len(open_tag)
+    end = record.find(close_tag, start)
+    if end == -1:
+        return ""
+    value = record[start:end].decode("utf-8", errors="replace")
+    if "&" in value:
+        value = html.unescape(value)
+    return value.strip()
+
+
+def iter_mesh_scope_notes(fileobj):
+    """Yield (DescriptorUI, first ScopeNote) for every DescriptorRecord.
+
+    The descriptor file is scanned in fixed-size chunks for record end tags;
+    inside each record only the DescriptorUI and ScopeNote start/end tags are
+    located. No element tree is built, so memory stays flat. The record's own
+    DescriptorUI is always its first child, ahead of the nested references.
+    """
+    buffer = b""
+    while True:
+        chunk = fileobj.read(MESH_READ_SIZE)
+        if chunk:
+            buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(MESH_RECORD_END, start)
+            if end == -1:
+                break
+            record = buffer[start:end]
+            start = end + len(MESH_RECORD_END)
+            mesh_id = _mesh_field(record, b"<DescriptorUI>", b"</DescriptorUI>")
+            if not mesh_id:
+                continue
+            scope_note = _mesh_field(record, b"<ScopeNote>", b"</ScopeNote>")
+            if scope_note:
+                yield mesh_id, scope_note
+        buffer = buffer[start:]
+        if not chunk:
+            return
+
+
 def load_mesh_definitions():
     try:
         download_file(MESH_DESC_URL, MESH_CACHE_FILE)
     except Exception:
         return {}
 
-    definitions = {}
     try:
         with gzip.open(MESH_CACHE_FILE, "rb") as f:
-            context = ET.iterparse(f, events=("end",))
-            for _, elem in context:
-                if not isinstance(elem.tag, str):
-                    continue
-                if elem.tag.split("}")[-1] != "DescriptorRecord":
-                    continue
-                mesh_id = _text_by_localname(elem, "DescriptorUI")
-                scope_note = _text_by_localname(elem, "ScopeNote")
-                if mesh_id and scope_note:
-                    definitions[mesh_id] = extract_sentence(scope_note)
-                elem.clear()
+            return {
+                mesh_id: extract_sentence(scope_note)
+                for mesh_id, scope_note in iter_mesh_scope_notes(f)
+            }
     except Exception:
         return {}
-    return definitions
 
 
-def load_fibo_definitions():
+def normalize_label(text):
+    if not text:
+        return ""
+    cleaned = []
+    for ch in text.lower():
+        if ch.isalnum():
+            cleaned.append(ch)
+        else:
+            cleaned.append(" ")
+    return " ".join("".join(cleaned).split()).strip()
+
+
+def parse_rdf_bytes(content):
+    """Parse one RDF/XML ontology into ([(label key, sentence)], [import url]).
+
+    Definitions keep document order and the first label wins, so callers can
+    merge several ontologies in a fixed order. Runs in worker processes.
+    """
+    pairs = []
+    seen = set()
+    imports = []
     try:
-        download_file(FIBO_TBOX_URL, FIBO_CACHE_FILE)
-    except Exception:
-        return {}
-
-    def normalize_label(text):
-        if not text:
-            return ""
-        cleaned = []
-        for ch in text.lower():
-            if ch.isalnum():
-                cleaned.append(ch)
-            else:
-                cleaned.append(" ")
-        return " ".join("".join(cleaned).split()).strip()
-
-    def parse_rdf_bytes(content, definitions):
-        try:
-            context = ET.iterparse(io.BytesIO(content), events=("end",))
-        except Exception:
-            return
+        context = ET.iterparse(io.BytesIO(content), events=("end",))
         for _, elem in context:
             if not isinstance(elem.tag, str):
                 continue
+            if elem.tag == OWL_IMPORTS_TAG:
+                resource = elem.attrib.get(RDF_RESOURCE_ATTR)
+                if resource:
+                    imports.append(resource)
+                continue
             local = elem.tag.split("}")[-1]
             if local not in ("Description", "Class", "NamedIndividual"):
                 continue
@@ -323,9 +1060,31 @@ def load_fibo_definitions():
                 definition = _text_by_localname(elem, "comment", lang="en")
             if definition:
                 key = normalize_label(label)
-                if key and key not in definitions:
-                    definitions[key] = extract_sentence(definition)
+                if key and key not in seen:
+                    seen.add(key)
+                    pairs.append((key, extract_sentence(definition)))
             elem.clear()
+    except Exception:
+        pass
+    return pairs, imports
+
+
+def _fetch_fibo_ontology(url):
+    return fetch_bytes(url, "application/rdf+xml", FIBO_MAX_BYTES)
+
+
+def load_fibo_definitions(parse_workers=FIBO_PARSE_WORKERS):
+    """Parse the FIBO TBox and follow its owl:imports breadth first.
+
+    Each level of the import graph is fetched on a thread pool (sharing the
+    host rate limiter) and parsed on a process pool. Results are merged in
+    BFS order with the first label winning, so with the default budget the
+    output matches the old one-by-one walk over the TBox imports.
+    """
+    try:
+        download_file(FIBO_TBOX_URL, FIBO_CACHE_FILE)
+    except Exception:
+        return {}
 
     try:
         with open(FIBO_CACHE_FILE, "rb") as f:
@@ -334,41 +1093,138 @@ def load_fibo_definitions():
         tbox_content = b""
 
     definitions = {}
-    if tbox_content:
-        parse_rdf_bytes(tbox_content, definitions)
 
+    def merge(pairs):
+        for key, sentence in pairs:
+            if key not in definitions:
+                definitions[key] = sentence
+
+    if not tbox_content:
+        return definitions
+    pairs, frontier = parse_rdf_bytes(tbox_content)
+    merge(pairs)
+
+    visited = {FIBO_TBOX_URL}
+    imported = 0
+    total_bytes = 0
+    depth = 1
+    parse_pool = None
+    if parse_workers > 1:
+        # Spawned, not forked: the fetch threads (and the harvest's) may hold
+        # locks that a forked child would inherit locked.
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
     try:
-        tbox_text = tbox_content.decode("utf-8", errors="ignore")
-    except Exception:
-        tbox_text = ""
-
-    import_urls = []
-    for line in tbox_text.splitlines():
-        if "owl:imports" not in line:
-            continue
-        start = line.find("rdf:resource=\"")
-        if start == -1:
-            continue
-        start += len("rdf:resource=\"")
-        end = line.find("\"", start)
-        if end == -1:
-            continue
-        import_urls.append(line[start:end])
+        with ThreadPoolExecutor(max_workers=FIBO_FETCH_WORKERS) as fetch_pool:
+            while frontier and depth <= FIBO_IMPORT_DEPTH and imported < FIBO_IMPORT_LIMIT:
+                level = []
+                for url in frontier:
+                    if url in visited or not any(part in url for part in FIBO_IMPORT_FILTERS):
+                        continue
+                    visited.add(url)
+                    level.append(url)
+                    imported += 1
+                    if imported >= FIBO_IMPORT_LIMIT:
+                        break
+                contents = []
+                over_budget = False
+                for content in fetch_pool.map(_fetch_fibo_ontology, level):
+                    if not content:
+                        continue
+                    if total_bytes + len(content) > FIBO_TOTAL_MAX_BYTES:
+                        over_budget = True
+                        break
+                    total_bytes += len(content)
+                    contents.append(content)
+                if parse_pool is not None:
+                    results = parse_pool.map(parse_rdf_bytes, contents)
+                else:
+                    results = map(parse_rdf_bytes, contents)
+                frontier = []
+                for pairs, imports in results:
+                    merge(pairs)
+                    frontier.extend(imports)
+                if over_budget:
+                    break
+                depth += 1
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
 
-    filtered = []
-    for url in import_urls:
-        if any(part in url for part in FIBO_IMPORT_FILTERS):
-            filtered.append(url)
-        if len(filtered) >= FIBO_IMPORT_LIMIT:
-            break
+    return definitions
 
-    for url in filtered:
-        content = fetch_bytes(url, "application/rdf+xml", FIBO_MAX_BYTES)
-        if not content:
-            continue
-        parse_rdf_bytes(content, definitions)
 
-    return definitions
+class StoredDefinitions:
+    """Read-only view of one parsed source inside the definition store."""
+
+    def __init__(self, conn, source_id):
+        self.conn = conn
+        self.source_id = source_id
+
+    def get(self, key, default=None):
+        row = self.conn.execute(
+            "SELECT sentence FROM definitions WHERE source_id = ? AND key = ?",
+            (self.source_id, key)
+        ).fetchone()
+        return row[0] if row else default
+
+
+class DefinitionStore:
+    """SQLite index of parsed MeSH/FIBO definitions.
+
+    Sources are keyed by URL and content hash: a build whose MeSH gz or FIBO
+    TBox hashes to a stored version only looks up the keys it needs, and the
+    XML is parsed again only when the downloaded content changes.
+    """
+
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or DEFINITION_STORE_FILE)
+        self.conn.executescript("""
+CREATE TABLE IF NOT EXISTS sources (
+  id INTEGER PRIMARY KEY,
+  kind TEXT NOT NULL,
+  url TEXT NOT NULL,
+  content_hash TEXT NOT NULL,
+  entries INTEGER NOT NULL,
+  built_at TEXT NOT NULL,
+  UNIQUE (url, content_hash)
+);
+CREATE TABLE IF NOT EXISTS definitions (
+  source_id INTEGER NOT NULL,
+  key TEXT NOT NULL,
+  sentence TEXT NOT NULL,
+  PRIMARY KEY (source_id, key)
+) WITHOUT ROWID;
+""")
+
+    def load(self, kind, url, content_hash, loader):
+        if not content_hash:
+            return loader()
+        row = self.conn.execute(
+            "SELECT id FROM sources WHERE url = ? AND content_hash = ?",
+            (url, content_hash)
+        ).fetchone()
+        if row:
+            return StoredDefinitions(self.conn, row[0])
+        definitions = loader()
+        if not definitions:
+            return definitions
+        with self.conn:
+            stale = [r[0] for r in self.conn.execute("SELECT id FROM sources WHERE url = ?", (url,))]
+            for source_id in stale:
+                self.conn.execute("DELETE FROM definitions WHERE source_id = ?", (source_id,))
+                self.conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+            cursor = self.conn.execute(
+                "INSERT INTO sources (kind, url, content_hash, entries, built_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, url, content_hash, len(definitions), time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+            )
+            self.conn.executemany(
+                "INSERT INTO definitions (source_id, key, sentence) VALUES (?, ?, ?)",
+                ((cursor.lastrowid, key, sentence) for key, sentence in definitions.items())
+            )
+        return StoredDefinitions(self.conn, cursor.lastrowid)
+
+    def close(self):
+        self.conn.close()
 
 
 def load_alias_overrides():
@@ -427,232 +1283,1318 @@ def pluralize_word(word):
     return word + "s"
 
 
+def singularize_word(word):
+    """The singular of a plural as a one-item list, or [] when there is none.
+
+    Sibilant "-es" plurals lose "es" ("churches", "boxes") unless listed in
+    E_STEM_PLURALS ("caches"). Other "-zes" plurals are dropped: "sizes"
+    keeps its "e", "quizzes" also loses a "z" and "buzzes" does not.
+    """
+    lower = word.lower()
+    if len(lower) < 4 or lower.endswith(("ss", "us", "is", "os", "ics")) or not lower.endswith("s"):
+        return []
+    if lower in INVARIANT_NOUNS:
+        return []
+    if lower in E_STEM_PLURALS:
+        return [word[:-1]]
+    if lower.endswith("ies"):
+        return [word[:-3] + "y"]
+    if lower.endswith("zes"):
+        return [word[:-2]] if lower.endswith("tzes") else []
+    if lower.endswith(("ches", "shes", "xes", "sses")):
+        return [word[:-2]]
+    return [word[:-1]]
+
+
 def generate_plural_variant(term):
+    """Plural of the last word, or its singulars when it already ends in -s.
+
+    Only lowercase head nouns: capitalized last words are usually names
+    ("Magnuson Act") and phrases with function words have their head elsewhere.
+    Mass nouns (UNCOUNTABLE_NOUNS) and irregular plurals (PLURAL_HEADS) get
+    no variant.
+    """
     tokens = term.split()
     if not tokens:
         return []
     last = tokens[-1]
     if not last.isalpha():
         return []
-    if last.isupper():
+    if not last.islower():
         return []
     if len(last) < 3:
         return []
-    if last.lower().endswith("s"):
+    if FUNCTION_WORDS.intersection(token.lower() for token in tokens):
+        return []
+    if last.endswith("ing") and len(last) > MAX_GERUND_PLURAL_LENGTH:
+        return []
+    if last.endswith(UNCOUNTED_ENDINGS) or last in UNCOUNTABLE_NOUNS or last in PLURAL_HEADS:
         return []
+    if last.endswith("s"):
+        return [" ".join(tokens[:-1] + [single]) for single in singularize_word(last)]
     plural = pluralize_word(last)
     if plural == last:
         return []
     return [" ".join(tokens[:-1] + [plural])]
 
 
-def build_sparql_query(root_qid, limit):
+def generate_verb_variants(word):
+    """-ing/-ed forms of a single lowercase word listed in VERB_TERMS."""
+    lower = word.lower()
+    if lower not in VERB_TERMS or not word.islower():
+        return []
+    if lower in DOUBLING_VERBS:
+        return [word + word[-1] + "ing", word + word[-1] + "ed"]
+    if lower.endswith("e") and not lower.endswith(("ee", "ye", "oe")):
+        return [word[:-1] + "ing", word + "d"]
+    if lower.endswith("y") and lower[-2] not in VOWELS:
+        return [word + "ing", word[:-1] + "ied"]
+    return [word + "ing", word + "ed"]
+
+
+def generate_separator_variants(term):
+    """Hyphen/space/closed spellings of short compounds.
+
+    "e-mail" -> "e mail", "email"; "free list" -> "free-list", "freelist".
+    Closed forms only join a short first part, and only two-word terms get
+    a hyphenated form (compound modifiers like "machine-learning model").
+    """
+    if "-" in term:
+        variants = [term.replace("-", " ")]
+        pieces = term.split("-")
+        if all(len(piece.split()[-1]) <= MAX_CLOSED_PART_LENGTH for piece in pieces[:-1] if piece.split()):
+            variants.append(term.replace("-", ""))
+        return variants
+    tokens = term.split()
+    if len(tokens) != 2:
+        return []
+    if not all(token.isalpha() for token in tokens) or not tokens[1].islower():
+        return []
+    variants = ["-".join(tokens)]
+    if tokens[0].islower() and len(tokens[0]) <= MAX_CLOSED_PART_LENGTH:
+        variants.append("".join(tokens))
+    return variants
+
+
+def acronym_matches(acronym, long_form):
+    """Schwartz-Hearst check: the letters appear in order, the first one starting the long form.
+
+    Uppercased words of the term itself ("DENGUE", "COV" in "COVID-19 test")
+    are not acronyms of it.
+    """
+    short = acronym.lower()
+    text = long_form.lower()
+    words = re.split(r"[\s-]+", text)
+    if len(words) < 2 or short[0] != text[0] or any(short in word for word in words):
+        return False
+    t = len(text) - 1
+    for s in range(len(short) - 1, -1, -1):
+        char = short[s]
+        if not char.isalnum():
+            continue
+        while t >= 0 and (text[t] != char or (s == 0 and t > 0 and text[t - 1].isalnum())):
+            t -= 1
+        if t < 0:
+            return False
+        t -= 1
+    return True
+
+
+def generate_variants(term, evidence=""):
+    """Morphological variants of an English term, best first.
+
+    Covers hyphen/space/closed spellings of the term and of its plural or
+    singular form, -ing/-ed for single-word verbs and acronyms written in the term ("Domain Name
+    System (DNS)") or found in `evidence` (its descriptions) that fit the
+    term's letters. resolve_variants() later drops variants claimed by
+    other entries.
+    """
+    acronyms = []
+    match = PARENTHESIZED_ACRONYM_RE.fullmatch(term)
+    if match:
+        base = match.group(1)
+        acronyms.append(match.group(2))
+        forms = [base]
+    else:
+        base = term
+        forms = []
+    forms += generate_separator_variants(base)
+    # Number comes from the label as written; separator variants of "e-mail"
+    # are not words of their own to inflect ("e mails").
+    numbers = generate_plural_variant(base)
+    variants = forms + numbers
+    for number in numbers:
+        variants.extend(generate_separator_variants(number))
+    if " " not in base and "-" not in base:
+        variants.extend(generate_verb_variants(base))
+    for candidate in ACRONYM_RE.findall(evidence):
+        if candidate not in acronyms and acronym_matches(candidate, base):
+            acronyms.append(candidate)
+    # No acronym plurals: matching is case-insensitive, so "HTTPs" would be "https".
+    variants.extend(acronyms)
+
+    seen = {term.lower()}
+    unique = []
+    for variant in variants:
+        key = variant.lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(variant)
+    return unique
+
+
+# Per matched language: term field, claimed aliases field, candidates field.
+VARIANT_FIELDS = {
+    "en": ("term", "aliases", "variants"),
+    "zh": ("zhTerm", "zhAliases", "zhVariants")
+}
+
+
+def _resolve_language(entries, lang, collisions):
+    term_field, alias_field, variant_field = VARIANT_FIELDS[lang]
+    fold = str.lower if LANGUAGES[lang]["caseFold"] else str
+    owners = {}
+    for entry in entries:
+        for text in [entry[term_field]] + entry.get(alias_field, []):
+            owners.setdefault(fold(text), entry["id"])
+    primary = {fold(entry[term_field]) for entry in entries}
+    claims = {}
+    for entry in entries:
+        for variant in entry.get(variant_field, ()):
+            claims.setdefault(fold(variant), []).append(entry["id"])
+
+    resolved = []
+    for entry in entries:
+        accepted = []
+        for variant in entry.get(variant_field, ()):
+            key = fold(variant)
+            owner = owners.get(key)
+            claimants = claims[key]
+            if (owner is not None and owner != entry["id"]) or len(claimants) > 1:
+                # Losing to another entry's own term is ordinary ownership.
+                contenders = set(claimants + ([owner] if owner else []))
+                if key not in primary and len(contenders) > 1 and key not in collisions:
+                    collisions[key] = sorted(contenders)
+                continue
+            if len(accepted) < MAX_AUTO_ALIASES:
+                accepted.append(variant)
+        if accepted:
+            entry[alias_field] = entry.get(alias_field, []) + accepted
+        resolved.append(entry)
+    return resolved
+
+
+def resolve_variants(entries):
+    """Add each entry's candidate aliases unless another entry claims the pattern.
+
+    Terms and alias overrides are claimed first and always win; a candidate
+    (Wikidata alias or generated variant) proposed by several entries is
+    ambiguous and dropped for all of them, so no pattern in an automaton
+    maps to two entries through a variant. Returns new entry dicts with the
+    final aliases (the inputs are left as built, since the build manifest
+    caches them) and the collisions as {folded pattern: [QIDs]}; a pattern
+    that is some entry's own term is not a collision, whoever else wants it.
+    """
+    collisions = {}
+    # Shallow copies, so the later stages can set top-level fields freely.
+    entries = [dict(entry) for entry in entries]
+    for lang in VARIANT_FIELDS:
+        entries = _resolve_language(entries, lang, collisions)
+    return entries, collisions
+
+
+def extra_languages():
+    return [lang for lang in OUTPUT_LANGUAGES if lang not in BASE_LANGUAGES]
+
+
+def language_vars(lang):
+    """SPARQL variable names for the label and description of an extra language."""
+    return f"itemLabel{lang.capitalize()}", f"{lang}Desc"
+
+
+def build_item_ids_query(root_qid, limit):
+    """The first `limit` items under a root that have en/zh labels and descriptions.
+
+    Only ids are selected, so the traversal is walked and sorted once per
+    root without the label joins, OPTIONAL columns and grouping.
+    """
     return f"""
-SELECT ?item ?itemLabelEn ?itemLabelZh ?enDesc ?zhDesc ?meshId
+SELECT DISTINCT ?item
 WHERE {{
   VALUES ?root {{ wd:{root_qid} }}
   ?item (wdt:P31/wdt:P279*|wdt:P279*) ?root .
+  FILTER EXISTS {{ ?item rdfs:label ?itemLabelEn FILTER(LANG(?itemLabelEn) = "en") }}
+  FILTER EXISTS {{ ?item rdfs:label ?itemLabelZh FILTER(LANG(?itemLabelZh) IN ("zh", "zh-hans", "zh-hant")) }}
+  FILTER EXISTS {{ ?item schema:description ?enDesc FILTER(LANG(?enDesc) = "en") }}
+  FILTER EXISTS {{ ?item schema:description ?zhDesc FILTER(LANG(?zhDesc) IN ("zh", "zh-hans", "zh-hant")) }}
+}}
+ORDER BY STR(?item)
+LIMIT {limit}
+""".strip()
+
+
+def build_sparql_query(qids):
+    """Every row of the given items; en/zh are required, extra languages are OPTIONAL columns."""
+    values = " ".join(f"wd:{qid}" for qid in qids)
+    variables = "?item ?itemLabelEn ?itemLabelZh ?enDesc ?zhDesc"
+    optional = ""
+    for lang in extra_languages():
+        label_var, desc_var = language_vars(lang)
+        tags = ", ".join(f'"{tag}"' for tag in LANGUAGES[lang]["tags"])
+        variables += f" ?{label_var} ?{desc_var}"
+        optional += (
+            f"\n  OPTIONAL {{ ?item rdfs:label ?{label_var} FILTER(LANG(?{label_var}) IN ({tags})) }}"
+            f"\n  OPTIONAL {{ ?item schema:description ?{desc_var} FILTER(LANG(?{desc_var}) IN ({tags})) }}"
+        )
+    return f"""
+SELECT {variables} ?meshId (GROUP_CONCAT(DISTINCT STRAFTER(STR(?parent), "{WIKIDATA_ENTITY_PREFIX}"); separator=" ") AS ?parents)
+WHERE {{
+  VALUES ?item {{ {values} }}
   ?item rdfs:label ?itemLabelEn FILTER(LANG(?itemLabelEn) = "en") .
   ?item rdfs:label ?itemLabelZh .
   FILTER(LANG(?itemLabelZh) IN ("zh", "zh-hans", "zh-hant"))
   ?item schema:description ?enDesc FILTER(LANG(?enDesc) = "en")
   ?item schema:description ?zhDesc .
-  FILTER(LANG(?zhDesc) IN ("zh", "zh-hans", "zh-hant"))
+  FILTER(LANG(?zhDesc) IN ("zh", "zh-hans", "zh-hant")){optional}
   OPTIONAL {{ ?item wdt:P486 ?meshId }}
+  OPTIONAL {{ ?item wdt:P31|wdt:P279 ?parent }}
 }}
-GROUP BY ?item ?itemLabelEn ?itemLabelZh ?enDesc ?zhDesc ?meshId
-LIMIT {limit}
+GROUP BY {variables} ?meshId
+ORDER BY STR(?item)
 """.strip()
 
 
 def sparql_query(query):
     url = f"{SPARQL_ENDPOINT}?format=json&timeout=40&query={urllib.parse.quote(query)}"
-    return fetch_json(url, delay_sec=REQUEST_DELAY_SEC)
+    return fetch_json(url)
 
 
-def collect_items():
-    all_items = {}
-    domain_stats = {}
-    domain_seen = {}
-    for domain in DOMAINS:
-        domain_name = domain["name"]
-        domain_stats[domain_name] = 0
-        domain_seen[domain_name] = set()
-        for root in domain["roots"]:
-            query = build_sparql_query(root, ROOT_LIMIT)
-            data = sparql_query(query)
+def _row_qid(row):
+    return row["item"]["value"].split("/")[-1]
+
+
+def _harvest_checkpoint_path(root):
+    signature = hashlib.sha256(
+        f"{build_item_ids_query(root, ROOT_LIMIT)}|{build_sparql_query(['Q0'])}|{SPARQL_PAGE_SIZE}".encode("utf-8")
+    ).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"harvest_{root}_{signature}.jsonl")
+
+
+def _read_harvest_checkpoint(path):
+    pages = []
+    if not os.path.exists(path):
+        return pages
+    if time.time() - os.path.getmtime(path) > SPARQL_CACHE_MAX_AGE_SEC:
+        # Same lifetime as the cached SPARQL responses: harvest the root again.
+        os.remove(path)
+        return pages
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                pages.append(json.loads(line))
+            except ValueError:
+                # A run killed mid-write leaves a truncated last line.
+                break
+    return pages
+
+
+def iter_root_pages(root):
+    """Yield the rows of one root page by page, in item order.
+
+    One query lists the root's first ROOT_LIMIT item ids; the rows of those
+    items are then fetched SPARQL_PAGE_SIZE ids at a time with VALUES, so no
+    page walks the traversal again and every page holds all rows of its
+    items. The id list and every page are appended to a checkpoint file, so
+    an interrupted harvest resumes with the next batch instead of starting
+    the root over.
+    """
+    path = _harvest_checkpoint_path(root)
+    qids = None
+    pages_done = 0
+    for record in _read_harvest_checkpoint(path):
+        if record.get("done"):
+            return
+        if "ids" in record:
+            qids = record["ids"]
+            continue
+        pages_done += 1
+        if record["rows"]:
+            yield record["rows"]
+    with open(path, "a", encoding="utf-8") as checkpoint:
+        if qids is None:
+            data = sparql_query(build_item_ids_query(root, ROOT_LIMIT))
+            qids = [_row_qid(row) for row in data.get("results", {}).get("bindings", [])]
+            checkpoint.write(json.dumps({"ids": qids}) + "\n")
+            checkpoint.flush()
+        for start in range(pages_done * SPARQL_PAGE_SIZE, len(qids), SPARQL_PAGE_SIZE):
+            data = sparql_query(build_sparql_query(qids[start:start + SPARQL_PAGE_SIZE]))
             rows = data.get("results", {}).get("bindings", [])
-            for row in rows:
-                if len(domain_seen[domain_name]) >= DOMAIN_LIMIT:
+            checkpoint.write(json.dumps({"rows": rows}, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if rows:
+                yield rows
+        checkpoint.write(json.dumps({"done": True}) + "\n")
+
+
+class RootStream:
+    """Pages of one root, fetched on a worker thread and consumed in order.
+
+    At most HARVEST_PREFETCH_PAGES pages wait in the queue; the worker blocks
+    until the merge catches up or the stream is stopped.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.pages = queue.Queue(maxsize=HARVEST_PREFETCH_PAGES)
+        self.stopped = threading.Event()
+
+    def _put(self, page):
+        while not self.stopped.is_set():
+            try:
+                self.pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            pages = iter_root_pages(self.root)
+            while not self.stopped.is_set():
+                page = next(pages, None)
+                if page is None or not self._put(page):
                     break
-                qid = row["item"]["value"].split("/")[-1]
-                if qid not in all_items:
-                    all_items[qid] = {
-                        "qid": qid,
-                        "en": row["itemLabelEn"]["value"],
-                        "zh": row["itemLabelZh"]["value"],
-                        "enDesc": row.get("enDesc", {}).get("value", ""),
-                        "zhDesc": row.get("zhDesc", {}).get("value", ""),
-                        "meshId": row.get("meshId", {}).get("value", ""),
-                        "altEn": [],
-                        "altZh": [],
-                        "enDef": extract_sentence(row.get("enDesc", {}).get("value", "")),
-                        "zhDef": extract_sentence(row.get("zhDesc", {}).get("value", "")),
-                        "enDefSource": "wikidata",
-                        "zhDefSource": "wikidata",
-                        "domains": [domain_name]
-                    }
-                else:
-                    if domain_name not in all_items[qid]["domains"]:
-                        all_items[qid]["domains"].append(domain_name)
-                domain_seen[domain_name].add(qid)
-            if len(domain_seen[domain_name]) >= DOMAIN_LIMIT:
-                break
-        domain_stats[domain_name] = len(domain_seen[domain_name])
-    return all_items, domain_stats
+            pages.close()
+        except Exception as exc:
+            self._put(exc)
+        finally:
+            self._put(None)
 
+    def rows(self):
+        while True:
+            page = self.pages.get()
+            if page is None:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield from page
 
-def build_entries(items):
-    entries = []
-    missing = 0
-    alias_overrides = load_alias_overrides()
-    mesh_defs = load_mesh_definitions()
-    fibo_defs = load_fibo_definitions()
-    domain_details = load_domain_details()
-    for item in items.values():
-        en_def = item.get("enDef", "")
-        zh_def = item.get("zhDef", "")
-        sources = [
-            {
-                "source": "wikidata",
-                "qid": item["qid"],
-                "license": "CC0"
+    def stop(self):
+        self.stopped.set()
+
+
+def iter_root_rows(root):
+    for page in iter_root_pages(root):
+        yield from page
+
+
+def _pooled(row, name):
+    # Labels and descriptions recur across roots and languages; interning
+    # keeps one string object per distinct value for the whole build.
+    return sys.intern(row.get(name, {}).get("value", ""))
+
+
+def merge_rows(all_items, domain_name, rows, seen):
+    for row in rows:
+        if len(seen) >= DOMAIN_LIMIT:
+            break
+        qid = _row_qid(row)
+        if qid not in all_items:
+            item = {
+                "qid": qid,
+                "en": _pooled(row, "itemLabelEn"),
+                "zh": _pooled(row, "itemLabelZh"),
+                "enDesc": _pooled(row, "enDesc"),
+                "zhDesc": _pooled(row, "zhDesc"),
+                "meshId": row.get("meshId", {}).get("value", ""),
+                "parents": row.get("parents", {}).get("value", "").split(),
+                "altEn": [],
+                "altZh": [],
+                "enDef": extract_sentence(row.get("enDesc", {}).get("value", "")),
+                "zhDef": extract_sentence(row.get("zhDesc", {}).get("value", "")),
+                "enDefSource": "wikidata",
+                "zhDefSource": "wikidata",
+                "domains": [domain_name]
             }
-        ]
+            languages = {}
+            for lang in extra_languages():
+                label_var, desc_var = language_vars(lang)
+                label = _pooled(row, label_var)
+                if label:
+                    desc = _pooled(row, desc_var)
+                    languages[lang] = {"label": label, "desc": desc, "def": extract_sentence(desc)}
+            if languages:
+                item["languages"] = languages
+            all_items[qid] = item
+        else:
+            if domain_name not in all_items[qid]["domains"]:
+                all_items[qid]["domains"].append(domain_name)
+        seen.add(qid)
+
+
+def collect_items(workers=HARVEST_WORKERS):
+    """Harvest every domain root, merging rows in DOMAINS order.
+
+    Roots are paged on a bounded thread pool and their rows are streamed back
+    root by root in declaration order, so DOMAIN_LIMIT keeps the same items as
+    a sequential run. Only the next `workers * 2` roots are started ahead of
+    the merge and each buffers at most HARVEST_PREFETCH_PAGES pages, so memory
+    stays bounded however many roots there are. Once a domain is full its
+    remaining roots are stopped.
+    """
+    all_items = {}
+    domain_stats = {}
+    jobs = [(domain["name"], root) for domain in DOMAINS for root in domain["roots"]]
+    window = max(1, workers) * 2 if workers > 1 else 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        streams = []
+
+        def start_streams(until):
+            while len(streams) < min(until, len(jobs)):
+                stream = RootStream(jobs[len(streams)][1])
+                pool.submit(stream.run)
+                streams.append(stream)
+
+        seen_by_domain = {}
+        try:
+            for index, (domain_name, root) in enumerate(jobs):
+                stream = None
+                if window:
+                    start_streams(index + window)
+                    stream = streams[index]
+                seen = seen_by_domain.setdefault(domain_name, set())
+                if len(seen) < DOMAIN_LIMIT:
+                    rows = stream.rows() if stream is not None else iter_root_rows(root)
+                    merge_rows(all_items, domain_name, rows, seen)
+                if stream is not None:
+                    stream.stop()
+        finally:
+            for stream in streams:
+                stream.stop()
+        for domain_name, seen in seen_by_domain.items():
+            domain_stats[domain_name] = len(seen)
+    return all_items, domain_stats
 
-        if not en_def or not zh_def:
-            missing += 1
-            continue
 
-        term = item["en"]
-        zh_term = item.get("zh", "")
-        if not is_en_term_clean(term):
-            missing += 1
-            continue
-        if not zh_term or not has_cjk(zh_term):
-            missing += 1
+def wbgetentities_url(qids):
+    # Every known language, so the per-QID cache does not depend on --languages.
+    tags = sorted({tag for spec in LANGUAGES.values() for tag in spec["tags"]})
+    params = {
+        "action": "wbgetentities",
+        "format": "json",
+        "ids": "|".join(qids),
+        "props": "aliases|labels|sitelinks",
+        "languages": "|".join(tags),
+        "maxlag": str(WIKIDATA_MAXLAG)
+    }
+    return f"{WIKIDATA_API}?{urllib.parse.urlencode(params)}"
+
+
+def reduce_entity(entity):
+    """The parts of a wbgetentities entity the build uses, as cached per QID."""
+    if "missing" in entity:
+        return {"missing": True}
+    sitelinks = entity.get("sitelinks", {})
+    return {
+        "aliases": {tag: [value["value"] for value in values] for tag, values in entity.get("aliases", {}).items()},
+        "labels": {tag: value["value"] for tag, value in entity.get("labels", {}).items()},
+        "sitelinkCount": len(sitelinks),
+        "sitelinks": {
+            f"{lang}wiki": sitelinks[f"{lang}wiki"]["title"]
+            for lang in LANGUAGES
+            if f"{lang}wiki" in sitelinks
+        }
+    }
+
+
+def fetch_entity_batch(qids):
+    """Reduced entities for up to ENTITY_BATCH_SIZE QIDs, keyed by the requested QID.
+
+    A `maxlag` refusal pauses every worker on the host and retries the batch,
+    up to RETRY_LIMIT attempts; any other API error fails the batch.
+    """
+    url = wbgetentities_url(qids)
+    attempt = 0
+    while True:
+        attempt += 1
+        data = fetch_json(url)
+        error = data.get("error")
+        if not error:
+            break
+        # API errors arrive as HTTP 200, so they must not stay in the cache.
+        get_http_cache().discard(url)
+        if error.get("code") != "maxlag" or attempt >= RETRY_LIMIT:
+            raise ValueError(f"wbgetentities: {error.get('info', error)}")
+        get_rate_limiter(url).pause(RETRY_BACKOFF_SEC * attempt)
+    entities = {}
+    for key, entity in data.get("entities", {}).items():
+        # Merged items come back under their target id.
+        requested = entity.get("redirects", {}).get("from", key)
+        entities[requested] = reduce_entity(entity)
+    for qid in qids:
+        entities.setdefault(qid, {"missing": True})
+    return entities
+
+
+class EntityStore:
+    """SQLite cache of reduced wbgetentities results, one row per QID.
+
+    Batches are only a transport detail: a rebuild asks for the QIDs that
+    are new or older than ENTITY_CACHE_MAX_AGE_SEC, whatever batch they
+    arrived in last time.
+    """
+
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or ENTITY_STORE_FILE)
+        self.conn.executescript("""
+CREATE TABLE IF NOT EXISTS entities (
+  qid TEXT PRIMARY KEY,
+  fetched_at REAL NOT NULL,
+  data TEXT NOT NULL
+) WITHOUT ROWID;
+""")
+
+    def get_many(self, qids, max_age):
+        cutoff = time.time() - max_age
+        found = {}
+        for start in range(0, len(qids), 500):
+            chunk = qids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT qid, data FROM entities WHERE fetched_at >= ? AND qid IN ({','.join('?' * len(chunk))})",
+                [cutoff] + chunk
+            )
+            for qid, data in rows:
+                found[qid] = json.loads(data)
+        return found
+
+    def put_many(self, entities):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entities (qid, fetched_at, data) VALUES (?, ?, ?)",
+                ((qid, now, json.dumps(entity, ensure_ascii=False)) for qid, entity in entities.items())
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def apply_entity(item, entity):
+    """Fill an item's aliases, sitelinks and missing extra-language labels."""
+    if not entity or entity.get("missing"):
+        return
+    aliases = entity["aliases"]
+    for field, lang in (("altEn", "en"), ("altZh", "zh")):
+        values = []
+        for tag in LANGUAGES[lang]["tags"]:
+            for alias in aliases.get(tag, []):
+                if alias not in values:
+                    values.append(alias)
+        item[field] = values
+    item["sitelinks"] = entity["sitelinkCount"]
+    titles = {lang: entity["sitelinks"][f"{lang}wiki"] for lang in BASE_LANGUAGES if f"{lang}wiki" in entity["sitelinks"]}
+    if titles:
+        item["wikiTitles"] = titles
+    for lang in extra_languages():
+        if lang in item.get("languages", {}):
             continue
-        if not has_cjk(zh_def):
-            missing += 1
+        label = next((entity["labels"][tag] for tag in LANGUAGES[lang]["tags"] if tag in entity["labels"]), "")
+        if label:
+            item.setdefault("languages", {})[lang] = {"label": label, "desc": "", "def": ""}
+
+
+def enrich_items(items, workers=HARVEST_WORKERS):
+    """Add Wikidata aliases, sitelinks and extra-language labels to harvested items.
+
+    wbgetentities takes ENTITY_BATCH_SIZE ids per call, so this costs about
+    one request per 50 items instead of one per term. Batches run on a
+    thread pool behind the same per-host rate limiter and retries as every
+    other request, and results are cached per QID in entities.sqlite. A
+    failed batch leaves its items unenriched. Returns a summary dict.
+    """
+    qids = sorted(items)
+    store = EntityStore()
+    try:
+        entities = store.get_many(qids, ENTITY_CACHE_MAX_AGE_SEC)
+        missing = [qid for qid in qids if qid not in entities]
+        batches = [missing[i:i + ENTITY_BATCH_SIZE] for i in range(0, len(missing), ENTITY_BATCH_SIZE)]
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(fetch_entity_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                try:
+                    fetched = future.result()
+                except Exception as exc:
+                    failed += 1
+                    print(f"Entity batch {futures[future][0]}..{futures[future][-1]} failed: {exc}")
+                    continue
+                store.put_many(fetched)
+                entities.update(fetched)
+    finally:
+        store.close()
+    for qid in qids:
+        apply_entity(items[qid], entities.get(qid))
+    return {
+        "cached": len(qids) - len(missing),
+        "batches": len(batches),
+        "failed": failed
+    }
+
+
+def wikipedia_extracts_url(lang, titles, cont=None):
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "prop": "extracts",
+        "exintro": "1",
+        "explaintext": "1",
+        "exlimit": "max",
+        "redirects": "1",
+        "titles": "|".join(titles)
+    }
+    params.update(cont or {})
+    return f"{WIKIPEDIA_API.format(lang=lang)}?{urllib.parse.urlencode(params)}"
+
+
+def fetch_summary_batch(lang, titles):
+    """Intro extracts for up to SUMMARY_BATCH_SIZE titles, keyed by the requested title.
+
+    Follows normalization and redirects back to the requested title and the
+    API's continuation, which hands out intro extracts 20 at a time. Missing
+    pages map to "".
+    """
+    extracts = {}
+    targets = {}
+    cont = None
+    while True:
+        url = wikipedia_extracts_url(lang, titles, cont)
+        data = fetch_json(url)
+        if "error" in data:
+            # API errors come back as HTTP 200; do not keep them in the HTTP cache.
+            get_http_cache().discard(url)
+            raise ValueError(f"extracts: {data['error'].get('info', data['error'])}")
+        query = data.get("query", {})
+        for hop in query.get("normalized", []) + query.get("redirects", []):
+            targets[hop["from"]] = hop["to"]
+        for page in query.get("pages", []):
+            if page.get("extract"):
+                extracts[page["title"]] = page["extract"]
+        cont = data.get("continue")
+        if not cont:
+            break
+    found = {}
+    for title in titles:
+        target = title
+        for _ in range(3):  # normalized, then redirected
+            target = targets.get(target, target)
+        found[title] = extracts.get(target, "")
+    return found
+
+
+class SummaryStore:
+    """SQLite cache of Wikipedia intro extracts, one row per language and title."""
+
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or SUMMARY_STORE_FILE)
+        self.conn.executescript("""
+CREATE TABLE IF NOT EXISTS summaries (
+  lang TEXT NOT NULL,
+  title TEXT NOT NULL,
+  fetched_at REAL NOT NULL,
+  extract TEXT NOT NULL,
+  PRIMARY KEY (lang, title)
+) WITHOUT ROWID;
+""")
+
+    def get_many(self, lang, titles, max_age):
+        cutoff = time.time() - max_age
+        found = {}
+        for start in range(0, len(titles), 500):
+            chunk = titles[start:start + 500]
+            rows = self.conn.execute(
+                "SELECT title, fetched_at, extract FROM summaries "
+                f"WHERE lang = ? AND fetched_at >= ? AND title IN ({','.join('?' * len(chunk))})",
+                [lang, cutoff] + chunk
+            )
+            for title, fetched_at, extract in rows:
+                found[title] = (fetched_at, extract)
+        return found
+
+    def put_many(self, lang, extracts):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO summaries (lang, title, fetched_at, extract) VALUES (?, ?, ?, ?)",
+                ((lang, title, now, extract) for title, extract in extracts.items())
+            )
+        return {title: (now, extract) for title, extract in extracts.items()}
+
+    def close(self):
+        self.conn.close()
+
+
+def add_summaries(entries, workers=HARVEST_WORKERS):
+    """Store the first sentence of each entry's Wikipedia intro in entry["summaries"].
+
+    Titles are the enwiki/zhwiki sitelinks found by enrich_items. The sidebar
+    shows these instead of fetching the summary page by page at runtime.
+    Batches of SUMMARY_BATCH_SIZE titles go through the shared rate limiter
+    and retries; extracts are cached per title in summaries.sqlite, and a
+    failed batch leaves its entries to the runtime lookup. Returns a summary
+    dict.
+    """
+    stats = {"cached": 0, "batches": 0, "failed": 0, "found": 0}
+    found = {}
+    store = SummaryStore()
+    try:
+        for lang in BASE_LANGUAGES:
+            titles = sorted({entry["wikiTitles"][lang] for entry in entries if lang in entry.get("wikiTitles", {})})
+            extracts = store.get_many(lang, titles, SUMMARY_CACHE_MAX_AGE_SEC)
+            stats["cached"] += len(extracts)
+            missing = [title for title in titles if title not in extracts]
+            batches = [missing[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(missing), SUMMARY_BATCH_SIZE)]
+            stats["batches"] += len(batches)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = {pool.submit(fetch_summary_batch, lang, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    try:
+                        fetched = future.result()
+                    except Exception as exc:
+                        stats["failed"] += 1
+                        print(f"Summary batch {lang}:{futures[future][0]}.. failed: {exc}")
+                        continue
+                    extracts.update(store.put_many(lang, fetched))
+            found[lang] = extracts
+    finally:
+        store.close()
+    for entry in entries:
+        summaries = {}
+        for lang, title in entry.get("wikiTitles", {}).items():
+            # Only the text: fetch times would make replayed and incremental
+            # builds differ from a fresh one.
+            _, extract = found.get(lang, {}).get(title, (0, ""))
+            definition = extract_sentence(extract)
+            if definition:
+                summaries[lang] = {"source": "wikipedia", "title": title, "definition": definition}
+        if summaries:
+            entry["summaries"] = summaries
+            stats["found"] += 1
+        else:
+            entry.pop("summaries", None)
+    return stats
+
+
+def fibo_key(term):
+    # [\W_] is exactly "not str.isalnum()", so runs of them become one space.
+    return " ".join(NON_ALNUM_RUN_RE.sub(" ", term).lower().split())
+
+
+class _CharClassTable(dict):
+    """str.translate table: CJK -> "c", other letters -> "a", other alnum -> "0", the rest dropped."""
+
+    def __missing__(self, code):
+        char = chr(code)
+        if CJK_RE.match(char):
+            value = "c"
+        elif char.isalpha():
+            value = "a"
+        elif char.isalnum():
+            value = "0"
+        else:
+            value = None
+        self[code] = value
+        return value
+
+
+COLUMN_SEP = "\x00"
+CHAR_CLASS_TABLE = _CharClassTable({ord(COLUMN_SEP): COLUMN_SEP})
+# One match per row of a COLUMN_SEP-terminated column; the group is the
+# row's first CJK character, or empty.
+ROW_CJK_RE = re.compile("[^\x00\u4e00-\u9fff]*([\u4e00-\u9fff]?)[^\x00]*\x00")
+
+
+def cjk_mask(column):
+    """has_cjk() of every string in `column`, from one regex pass over the joined column."""
+    joined = COLUMN_SEP.join(column) + COLUMN_SEP
+    if joined.count(COLUMN_SEP) != len(column):
+        return [has_cjk(text) for text in column]
+    return list(map(bool, ROW_CJK_RE.findall(joined)))
+
+
+def clean_term_mask(column):
+    """is_en_term_clean() of every string in `column`, from one str.translate pass."""
+    joined = COLUMN_SEP.join(column) + COLUMN_SEP
+    if joined.count(COLUMN_SEP) != len(column):
+        return [is_en_term_clean(text) for text in column]
+    # letters / alnum >= 0.4, as in is_en_term_clean().
+    return [
+        "c" not in classes and classes.count("a") >= 2 and classes.count("a") * 5 >= len(classes) * 2
+        for classes in joined.translate(CHAR_CLASS_TABLE).split(COLUMN_SEP)[:-1]
+    ]
+
+
+def screen_rows(rows):
+    """Whether build_entry would accept each item, as column-wide boolean masks.
+
+    The three text checks run once per column: CJK presence as one regex
+    pass and the English letter ratio as one str.translate pass over the
+    joined column.
+    """
+    en_terms = [item["en"] for item in rows]
+    zh_terms = [item.get("zh", "") for item in rows]
+    zh_defs = [item.get("zhDef", "") for item in rows]
+    present = [bool(item.get("enDef") and zh_def and zh_term) for item, zh_def, zh_term in zip(rows, zh_defs, zh_terms)]
+    return [
+        all(checks)
+        for checks in zip(present, clean_term_mask(en_terms), cjk_mask(zh_terms), cjk_mask(zh_defs))
+    ]
+
+
+def is_buildable(item):
+    zh_term = item.get("zh", "")
+    zh_def = item.get("zhDef", "")
+    return bool(
+        item.get("enDef") and zh_def and zh_term
+        and is_en_term_clean(item["en"]) and has_cjk(zh_term) and has_cjk(zh_def)
+    )
+
+
+def screen_items(items):
+    """Pre-pass that drops the items build_entry would reject.
+
+    Runs screen_rows() over all items, so the per-entry work, including
+    MeSH/FIBO lookups, only happens for survivors. Returns the surviving
+    items in harvest order and the number dropped.
+    """
+    rows = list(items.values())
+    survivors = [item for item, ok in zip(rows, screen_rows(rows)) if ok]
+    return survivors, len(rows) - len(survivors)
+
+
+def wikidata_aliases(item, lang):
+    """Wikidata aliases worth matching: long enough, and in the right script."""
+    aliases = item.get("altEn" if lang == "en" else "altZh", [])
+    if lang == "en":
+        return [alias for alias in aliases if len(alias) >= MIN_WIKIDATA_ALIAS_LENGTH["en"] and is_en_term_clean(alias)]
+    return [alias for alias in aliases if len(alias) >= MIN_WIKIDATA_ALIAS_LENGTH["zh"] and has_cjk(alias)]
+
+
+def popularity_score(item, has_override, has_domain_detail):
+    """How likely a reader is to meet the term; ranks the TARGET_TOTAL cut and the tiers."""
+    score = math.log2(1 + item.get("sitelinks", 0))
+    if has_domain_detail:
+        score += POPULARITY_WEIGHTS["domainFile"]
+    if has_override:
+        score += POPULARITY_WEIGHTS["aliasOverride"]
+    score += POPULARITY_WEIGHTS["extraDomain"] * max(0, len(item.get("domains", [])) - 1)
+    return round(score, 3)
+
+
+def rank_entries(entries):
+    """Most popular first; ties fall back to the term so the order is stable."""
+    entries.sort(key=lambda entry: (-entry.get("popularity", 0), entry["term"].lower(), entry["id"]))
+    return entries
+
+
+RELATED_WORD_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+RELATED_HAN_RE = re.compile("[\u4e00-\u9fff]+")
+
+
+def related_features(entry, stems):
+    """Term frequencies of an entry's English words, Chinese term bigrams and parent classes.
+
+    `stems` caches singular forms across entries; most words recur.
+    """
+    detail = entry.get("detail", {}).get("detailedExplanation", {})
+    text = " ".join([entry["term"], *entry.get("aliases", []), entry["definition"].get("en", ""), detail.get("en", "")])
+    counts = collections.Counter()
+    for word, tf in collections.Counter(RELATED_WORD_RE.findall(text.lower())).items():
+        if word in FUNCTION_WORDS:
             continue
-        if "Medical" in item.get("domains", []):
-            mesh_id = item.get("meshId", "")
-            mesh_note = mesh_defs.get(mesh_id)
-            if mesh_id and mesh_note:
-                en_def = mesh_note
-                sources.append({
-                    "source": "mesh",
-                    "id": mesh_id,
-                    "license": "NLM Terms and Conditions"
-                })
-        if "Finance" in item.get("domains", []):
-            normalized = "".join([ch.lower() if ch.isalnum() else " " for ch in term])
-            normalized = " ".join(normalized.split()).strip()
-            fibo_def = fibo_defs.get(normalized)
-            if fibo_def:
-                en_def = fibo_def
-                sources.append({
-                    "source": "fibo",
-                    "license": "MIT"
-                })
-        domain_detail = domain_details.get(term.lower())
-        if domain_detail:
-            detail_en_def = str(domain_detail.get("definition_en", "")).strip()
-            detail_zh_def = str(domain_detail.get("definition_zh", "")).strip()
-            if detail_en_def:
-                en_def = detail_en_def
-            if detail_zh_def:
-                zh_def = detail_zh_def
-        aliases = []
-        overrides = alias_overrides.get(term.lower(), [])
-        aliases.extend(overrides)
-        aliases.extend(generate_plural_variant(term))
-        seen = set()
-        cleaned_aliases = []
-        for alias in aliases:
-            if not alias:
-                continue
-            key = alias.lower()
-            if key == term.lower():
-                continue
-            if key in seen:
-                continue
+        stem = stems.get(word)
+        if stem is None:
+            stem = stems[word] = (singularize_word(word) or [word])[0]
+        counts[stem] += tf
+    # Chinese definitions mostly restate the English ones; the term itself
+    # still links entries like 鼻炎 and 胃炎 whose English names share nothing.
+    for run in RELATED_HAN_RE.findall(entry.get("zhTerm", "")):
+        for i in range(len(run) - 1):
+            counts[run[i:i + 2]] += 1
+    for parent in entry.get("parents", []):
+        # Upper case never collides with the lowered words above.
+        counts[parent] += 1
+    return counts
+
+
+def compute_related(entries, limit=RELATED_LIMIT):
+    """Fill detail.related with the ids of each entry's nearest neighbours.
+
+    Entries are TF-IDF vectors over related_features(); parent classes get
+    RELATED_PARENT_WEIGHT on top of their IDF. Features with a document
+    frequency above RELATED_MAX_DF are dropped and each vector keeps its
+    RELATED_MAX_FEATURES heaviest features, so scoring one entry walks a
+    bounded number of postings and the whole pass grows linearly with the
+    glossary. Returns the number of entries that got at least one neighbour.
+    """
+    stems = {}
+    docs = [related_features(entry, stems) for entry in entries]
+    df = collections.Counter()
+    for counts in docs:
+        df.update(counts.keys())
+    total = len(entries)
+    # A feature of one entry links nothing; only these ones get a weight.
+    idf = {
+        feature: math.log(total / count) * (RELATED_PARENT_WEIGHT if feature[0] == "Q" else 1.0)
+        for feature, count in df.items()
+        if 1 < count <= RELATED_MAX_DF
+    }
+    postings = collections.defaultdict(list)
+    vectors = []
+    for index, counts in enumerate(docs):
+        weights = heapq.nlargest(RELATED_MAX_FEATURES, [
+            ((1 + math.log(tf)) * idf[feature], feature)
+            for feature, tf in counts.items()
+            if feature in idf
+        ])
+        norm = math.sqrt(sum(weight * weight for weight, _ in weights)) or 1.0
+        vector = [(feature, weight / norm) for weight, feature in weights]
+        for feature, weight in vector:
+            postings[feature].append((index, weight))
+        vectors.append(vector)
+    linked = 0
+    for index, vector in enumerate(vectors):
+        scores = {}
+        get = scores.get
+        for feature, weight in vector:
+            for other, other_weight in postings[feature]:
+                scores[other] = get(other, 0.0) + weight * other_weight
+        scores.pop(index, None)
+        # Ties go to the more popular entry, which comes first in rank order.
+        best = heapq.nsmallest(limit, ((-score, other) for other, score in scores.items() if score >= RELATED_MIN_SCORE))
+        # A fresh dict: "detail" is shared with the cached manifest entry.
+        entry = entries[index]
+        entry["detail"] = {**entry["detail"], "related": [entries[other]["id"] for _, other in best]}
+        linked += bool(best)
+    return linked
+
+
+def build_entry(item, alias_overrides, mesh_defs, fibo_defs, domain_details, screened=False):
+    """Build one entry; `screened` skips the checks already done by screen_items."""
+    if not screened and not is_buildable(item):
+        return None
+    en_def = item.get("enDef", "")
+    zh_def = item.get("zhDef", "")
+    sources = [
+        {
+            "source": "wikidata",
+            "qid": item["qid"],
+            "license": "CC0"
+        }
+    ]
+
+    term = item["en"]
+    if "Medical" in item.get("domains", []):
+        mesh_id = item.get("meshId", "")
+        mesh_note = mesh_defs.get(mesh_id)
+        if mesh_id and mesh_note:
+            en_def = mesh_note
+            sources.append({
+                "source": "mesh",
+                "id": mesh_id,
+                "license": "NLM Terms and Conditions"
+            })
+    if "Finance" in item.get("domains", []):
+        fibo_def = fibo_defs.get(fibo_key(term))
+        if fibo_def:
+            en_def = fibo_def
+            sources.append({
+                "source": "fibo",
+                "license": "MIT"
+            })
+    domain_detail = domain_details.get(term.lower())
+    if domain_detail:
+        detail_en_def = str(domain_detail.get("definition_en", "")).strip()
+        detail_zh_def = str(domain_detail.get("definition_zh", "")).strip()
+        if detail_en_def:
+            en_def = detail_en_def
+        if detail_zh_def:
+            zh_def = detail_zh_def
+    seen = {term.lower()}
+    cleaned_aliases = []
+    for alias in alias_overrides.get(term.lower(), []):
+        key = alias.lower()
+        if alias and key not in seen:
             seen.add(key)
             cleaned_aliases.append(alias)
-            if len(cleaned_aliases) >= MAX_AUTO_ALIASES + len(overrides):
+
+    desc_en = str(item.get("enDesc", "")).strip() or en_def
+    # Candidates only; resolve_variants() decides which become aliases.
+    # Wikidata's own aliases come before the generated variants.
+    variants = []
+    for variant in wikidata_aliases(item, "en") + generate_variants(term, f"{desc_en} {en_def}"):
+        if variant.lower() not in seen:
+            seen.add(variant.lower())
+            variants.append(variant)
+    zh_variants = [alias for alias in wikidata_aliases(item, "zh") if alias != item["zh"]]
+    desc_zh = str(item.get("zhDesc", "")).strip() or zh_def
+    examples_en = []
+    examples_zh = []
+    if domain_detail:
+        examples_en = [str(x).strip() for x in domain_detail.get("examples_en", []) if str(x).strip()]
+        examples_zh = [str(x).strip() for x in domain_detail.get("examples_zh", []) if str(x).strip()]
+    detail_examples = []
+    total_examples = max(len(examples_en), len(examples_zh))
+    for idx in range(total_examples):
+        desc = {}
+        if idx < len(examples_en):
+            desc["en"] = examples_en[idx]
+        if idx < len(examples_zh):
+            desc["zh_CN"] = examples_zh[idx]
+        if desc:
+            detail_examples.append({
+                "title": "",
+                "description": desc
+            })
+    # The definition lives on the entry only; readers fall back to it.
+    detail = {
+        "detailedExplanation": {
+            "en": desc_en,
+            "zh_CN": desc_zh
+        },
+        "scenarios": {
+            "use": [],
+            "avoid": []
+        },
+        "examples": detail_examples,
+        "pitfalls": [],
+        "related": []
+    }
+    entry = {
+        "id": item["qid"],
+        "term": term,
+        "aliases": cleaned_aliases,
+        "variants": variants,
+        "definition": {
+            "en": en_def,
+            "zh_CN": zh_def
+        },
+        "examples": {
+            "en": examples_en,
+            "zh_CN": examples_zh
+        },
+        "category": item["domains"][0] if item["domains"] else "General",
+        "sources": sources,
+        "zhTerm": item["zh"],
+        "zhVariants": zh_variants,
+        "domains": list(item["domains"]),
+        "parents": item.get("parents", []),
+        "wikiTitles": item.get("wikiTitles", {}),
+        "popularity": popularity_score(item, term.lower() in alias_overrides, bool(domain_detail)),
+        "detail": detail
+    }
+    # Extra languages share every other field; only label and texts are added.
+    labels = {}
+    for lang, values in item.get("languages", {}).items():
+        if lang not in OUTPUT_LANGUAGES:
+            continue
+        key = LANGUAGES[lang]["detailKey"]
+        labels[lang] = values["label"]
+        if values["def"]:
+            entry["definition"][key] = values["def"]
+        if values["desc"]:
+            detail["detailedExplanation"][key] = values["desc"]
+    if labels:
+        entry["labels"] = labels
+    return entry
+
+
+def fingerprint_file(path):
+    if not path or not os.path.exists(path):
+        return ""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
                 break
+            digest.update(chunk)
+    return digest.hexdigest()
 
-        desc_en = str(item.get("enDesc", "")).strip() or en_def
-        desc_zh = str(item.get("zhDesc", "")).strip() or zh_def
-        examples_en = []
-        examples_zh = []
-        if domain_detail:
-            examples_en = [str(x).strip() for x in domain_detail.get("examples_en", []) if str(x).strip()]
-            examples_zh = [str(x).strip() for x in domain_detail.get("examples_zh", []) if str(x).strip()]
-        detail_examples = []
-        total_examples = max(len(examples_en), len(examples_zh))
-        for idx in range(total_examples):
-            desc = {}
-            if idx < len(examples_en):
-                desc["en"] = examples_en[idx]
-            if idx < len(examples_zh):
-                desc["zh_CN"] = examples_zh[idx]
-            if desc:
-                detail_examples.append({
-                    "title": "",
-                    "description": desc
-                })
-        detail = {
-            "definition": {
-                "en": en_def,
-                "zh_CN": zh_def
-            },
-            "detailedExplanation": {
-                "en": desc_en,
-                "zh_CN": desc_zh
-            },
-            "scenarios": {
-                "use": [],
-                "avoid": []
-            },
-            "examples": detail_examples,
-            "pitfalls": [],
-            "related": []
-        }
-        entries.append({
-            "id": item["qid"],
-            "term": term,
-            "aliases": cleaned_aliases,
-            "definition": {
-                "en": en_def,
-                "zh_CN": zh_def
-            },
-            "examples": {
-                "en": examples_en,
-                "zh_CN": examples_zh
-            },
-            "category": item["domains"][0] if item["domains"] else "General",
-            "sources": sources,
-            "zhTerm": item["zh"],
-            "detail": detail
-        })
-    return entries, missing
+
+def fingerprint_value(value):
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def source_fingerprints():
+    for url, path in ((MESH_DESC_URL, MESH_CACHE_FILE), (FIBO_TBOX_URL, FIBO_CACHE_FILE)):
+        try:
+            download_file(url, path)
+        except Exception:
+            pass
+    return {
+        "mesh": fingerprint_file(MESH_CACHE_FILE),
+        "fibo": fingerprint_file(FIBO_CACHE_FILE)
+    }
+
+
+def build_config_fingerprint():
+    return fingerprint_value([
+        SCHEMA_VERSION,
+        MAX_AUTO_ALIASES,
+        [sorted(VERB_TERMS), sorted(DOUBLING_VERBS), sorted(E_STEM_PLURALS)],
+        [UNCOUNTED_ENDINGS, sorted(UNCOUNTABLE_NOUNS), sorted(PLURAL_HEADS)],
+        TARGET_TOTAL,
+        HOT_TIER_SIZE,
+        POPULARITY_WEIGHTS,
+        [RELATED_LIMIT, RELATED_MIN_SCORE, RELATED_MAX_DF, RELATED_MAX_FEATURES, RELATED_PARENT_WEIGHT],
+        DOMAINS,
+        SITE_DOMAINS,
+        OUTPUT_LANGUAGES
+    ])
+
+
+def load_build_manifest():
+    if not os.path.exists(BUILD_MANIFEST_FILE):
+        return {}
+    try:
+        with open(BUILD_MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("config") != build_config_fingerprint():
+        return {}
+    return manifest
+
+
+def save_build_manifest(manifest):
+    tmp_path = BUILD_MANIFEST_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, BUILD_MANIFEST_FILE)
+
+
+class LazyDefinitions:
+    """Mapping facade that only runs the (expensive) loader on first lookup."""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.data = None
+
+    def get(self, key, default=None):
+        if self.data is None:
+            self.data = self.loader()
+        return self.data.get(key, default)
+
+
+def open_definition_sources(store, sources):
+    def load(kind, url, loader):
+        with _profiler.stage(kind, cpu=True):
+            return store.load(kind, url, sources[kind], loader)
+
+    mesh_defs = LazyDefinitions(lambda: load("mesh", MESH_DESC_URL, load_mesh_definitions))
+    fibo_defs = LazyDefinitions(lambda: load("fibo", FIBO_TBOX_URL, load_fibo_definitions))
+    return mesh_defs, fibo_defs
+
+
+def build_entries_incremental(items, manifest):
+    """Rebuild only the entries whose inputs changed since the last build.
+
+    Each QID record in the manifest keeps a fingerprint of its Wikidata item,
+    alias override and domain detail, plus the MeSH/FIBO definition it used.
+    Those definitions stay valid while the source files keep their
+    fingerprint, so MeSH and FIBO are parsed only when an entry really needs
+    a lookup that is not already recorded.
+    """
+    alias_overrides = load_alias_overrides()
+    domain_details = load_domain_details()
+    with _profiler.stage("sources"):
+        sources = source_fingerprints()
+    previous_sources = manifest.get("sources", {})
+    previous = manifest.get("entries", {})
+    mesh_valid = previous_sources.get("mesh") == sources["mesh"]
+    fibo_valid = previous_sources.get("fibo") == sources["fibo"]
+    with contextlib.closing(DefinitionStore()) as store:
+        mesh_defs, fibo_defs = open_definition_sources(store, sources)
+
+        entries = []
+        records = {}
+        rebuilt = 0
+        survivors, missing = screen_items(items)
+        buildable = {item["qid"] for item in survivors}
+        for item in items.values():
+            term_key = item["en"].lower()
+            key = fingerprint_value([item, alias_overrides.get(term_key), domain_details.get(term_key)])
+            record = previous.get(item["qid"]) or {}
+            if item["qid"] not in buildable:
+                # Dropped items never need MeSH/FIBO lookups; a changed key may
+                # still remove an entry built last time.
+                if record.get("key") != key:
+                    rebuilt += 1
+                records[item["qid"]] = {"key": key, "mesh": None, "fibo": None, "entry": None, "fragments": None}
+                continue
+
+            mesh_id = item.get("meshId", "") if "Medical" in item.get("domains", []) else ""
+            mesh_note = ""
+            if mesh_id:
+                cached = record.get("mesh")
+                if mesh_valid and cached and cached[0] == mesh_id:
+                    mesh_note = cached[1]
+                else:
+                    mesh_note = mesh_defs.get(mesh_id) or ""
+            fibo_lookup = fibo_key(item["en"]) if "Finance" in item.get("domains", []) else ""
+            fibo_def = ""
+            if fibo_lookup:
+                cached = record.get("fibo")
+                if fibo_valid and cached and cached[0] == fibo_lookup:
+                    fibo_def = cached[1]
+                else:
+                    fibo_def = fibo_defs.get(fibo_lookup) or ""
+
+            mesh_record = [mesh_id, mesh_note] if mesh_id else None
+            fibo_record = [fibo_lookup, fibo_def] if fibo_lookup else None
+            if (
+                record.get("key") == key
+                and record.get("mesh") == mesh_record
+                and record.get("fibo") == fibo_record
+            ):
+                entry = record.get("entry")
+                fragments = record.get("fragments")
+            else:
+                entry = build_entry(
+                    item,
+                    alias_overrides,
+                    {mesh_id: mesh_note} if mesh_note else {},
+                    {fibo_lookup: fibo_def} if fibo_def else {},
+                    domain_details,
+                    screened=True
+                )
+                fragments = None
+                rebuilt += 1
+            records[item["qid"]] = {
+                "key": key,
+                "mesh": mesh_record,
+                "fibo": fibo_record,
+                "entry": entry,
+                "fragments": fragments
+            }
+            entries.append(entry)
+
+    changed = rebuilt > 0 or set(records) != set(previous)
+    manifest = {
+        "config": build_config_fingerprint(),
+        "sources": sources,
+        "rebuilt": rebuilt,
+        "entries": records
+    }
+    return entries, missing, manifest, changed
 
 
 def build_meta(domain_stats):
     return {
         "schemaVersion": SCHEMA_VERSION,
-        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(BUILD_TIMESTAMP)),
         "sources": [
             {
                 "name": "wikidata",
@@ -668,45 +2610,67 @@ def build_meta(domain_stats):
                 "license": "MIT",
                 "version": "master",
                 "subset": "FND,FBC,SEC",
-                "importLimit": FIBO_IMPORT_LIMIT
+                "importLimit": FIBO_IMPORT_LIMIT,
+                "importDepth": FIBO_IMPORT_DEPTH
             }
         ],
         "domainStats": domain_stats,
+        "languages": list(OUTPUT_LANGUAGES),
         "limits": {
             "targetTotal": TARGET_TOTAL,
+            "hotTierSize": HOT_TIER_SIZE,
             "domainLimit": DOMAIN_LIMIT,
-            "rootLimit": ROOT_LIMIT
+            "rootLimit": ROOT_LIMIT,
+            "pageSize": SPARQL_PAGE_SIZE
         }
     }
 
 
-def build_index_entries(entries, lang):
-    items = []
-    for entry in entries:
-        term = entry["term"] if lang == "en" else (entry.get("zhTerm") or entry["term"])
-        items.append({
-            "id": entry["id"],
-            "term": term,
-            "aliases": entry["aliases"] if lang == "en" else [],
-            "category": entry["category"]
-        })
-    return items
+def has_language(entry, lang):
+    return lang in BASE_LANGUAGES or lang in entry.get("labels", {})
 
 
-def build_detail_entries(entries):
-    items = {}
-    for entry in entries:
-        items[entry["id"]] = {
-            "id": entry["id"],
-            "term": entry["term"],
-            "zhTerm": entry.get("zhTerm") or entry["term"],
-            "definition": entry["definition"],
-            "examples": entry["examples"],
-            "category": entry["category"],
-            "sources": entry.get("sources", []),
-            "detail": entry.get("detail", {})
-        }
-    return items
+def language_entries(entries, lang):
+    """The entries that have a term in `lang` (all of them for en/zh)."""
+    if lang in BASE_LANGUAGES:
+        return entries
+    return [entry for entry in entries if lang in entry.get("labels", {})]
+
+
+def build_index_item(entry, lang):
+    aliases = []
+    if lang == "en":
+        term = entry["term"]
+        aliases = entry["aliases"]
+    elif lang == "zh":
+        term = entry.get("zhTerm") or entry["term"]
+        aliases = entry.get("zhAliases", [])
+    else:
+        term = entry["labels"][lang]
+    return {
+        "id": entry["id"],
+        "term": term,
+        "aliases": aliases,
+        "category": entry["category"]
+    }
+
+
+def build_detail_item(entry):
+    item = {
+        "id": entry["id"],
+        "term": entry["term"],
+        "zhTerm": entry.get("zhTerm") or entry["term"],
+        "definition": entry["definition"],
+        "examples": entry["examples"],
+        "category": entry["category"],
+        "sources": entry.get("sources", []),
+        "detail": entry.get("detail", {})
+    }
+    if entry.get("labels"):
+        item["labels"] = entry["labels"]
+    if entry.get("summaries"):
+        item["summaries"] = entry["summaries"]
+    return item
 
 
 def build_cedict(entries):
@@ -723,49 +2687,786 @@ def build_cedict(entries):
     return cedict
 
 
+def utf16_units(text):
+    units = array.array("H", text.encode("utf-16-le"))
+    if sys.byteorder != "little":
+        units.byteswap()
+    return units
+
+
+def utf16_length(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+class StringTable:
+    """Interned UTF-16 string table for the packed glossary."""
+
+    def __init__(self):
+        self.index = {}
+        self.offsets = array.array("I", [0])
+        self.units = array.array("H")
+
+    def add(self, text):
+        found = self.index.get(text)
+        if found is not None:
+            return found
+        self.units.extend(utf16_units(text))
+        self.offsets.append(len(self.units))
+        found = len(self.index)
+        self.index[text] = found
+        return found
+
+
+def compile_automaton(patterns):
+    """Compile UTF-16 code unit sequences into a flat Aho-Corasick automaton.
+
+    States are numbered breadth-first with siblings in code unit order, so
+    the children of a state are consecutive and transition t always leads to
+    state t + 1: only the sorted codes are stored. State 0 is the root. Each
+    state owns a range of transitionCodes and a range of outputPatterns for
+    the patterns ending exactly there; stateOutputLink points to the nearest
+    failure-chain state that has outputs of its own (0 when none), so output
+    lists are never copied along failure links.
+    """
+    children = [{}]
+    own = [[]]
+    for pattern_index, units in enumerate(patterns):
+        state = 0
+        for unit in units:
+            target = children[state].get(unit)
+            if target is None:
+                target = len(children)
+                children[state][unit] = target
+                children.append({})
+                own.append([])
+            state = target
+        own[state].append(pattern_index)
+
+    order = [0]
+    fail = [0] * len(children)
+    output_link = [0] * len(children)
+    for state in order:
+        for unit in sorted(children[state]):
+            target = children[state][unit]
+            link = 0
+            if state:
+                link = fail[state]
+                while link and unit not in children[link]:
+                    link = fail[link]
+                link = children[link].get(unit, 0)
+            fail[target] = link
+            output_link[target] = link if own[link] else output_link[link]
+            order.append(target)
+
+    renumber = [0] * len(children)
+    for new_state, state in enumerate(order):
+        renumber[state] = new_state
+    automaton = {
+        "stateTransitions": array.array("I", [0]),
+        "transitionCodes": array.array("H"),
+        "stateFail": array.array("I"),
+        "stateOutputs": array.array("I", [0]),
+        "stateOutputLink": array.array("I"),
+        "outputPatterns": array.array("I")
+    }
+    for state in order:
+        automaton["transitionCodes"].extend(sorted(children[state]))
+        automaton["stateTransitions"].append(len(automaton["transitionCodes"]))
+        automaton["stateFail"].append(renumber[fail[state]])
+        automaton["stateOutputLink"].append(renumber[output_link[state]])
+        automaton["outputPatterns"].extend(own[state])
+        automaton["stateOutputs"].append(len(automaton["outputPatterns"]))
+    return automaton
+
+
+def _pack_section(chunks, values, offsets, name):
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    data = values.tobytes()
+    position = sum(len(chunk) for chunk in chunks)
+    offsets[name] = position
+    chunks.append(data)
+    if len(data) % 4:
+        chunks.append(b"\0" * (4 - len(data) % 4))
+
+
+def build_packed_glossary(entries, lang):
+    """Serialize one language index into the packed binary format.
+
+    The layout is a fixed header of little-endian uint32 fields (see
+    PACK_HEADER_FIELDS) followed by 4-byte aligned typed-array sections:
+    a UTF-16 string table, per-entry id/term/category columns, alias ranges,
+    the entry index and display length of each match pattern, and the
+    (case-folded for en/de) patterns precompiled into a flat Aho-Corasick
+    automaton. The content script reads it through ArrayBuffer views without
+    building an object per entry, and the worker matches on it directly.
+    """
+    strings = StringTable()
+    categories = {}
+    entry_ids = array.array("I")
+    entry_terms = array.array("I")
+    entry_categories = array.array("H")
+    alias_offsets = array.array("I", [0])
+    alias_strings = array.array("I")
+    pattern_entries = array.array("I")
+    pattern_lengths = array.array("H")
+    pattern_units = []
+    entries = language_entries(entries, lang)
+    fold = LANGUAGES[lang]["caseFold"]
+    for index, entry in enumerate(entries):
+        item = build_index_item(entry, lang)
+        term = item["term"]
+        entry_ids.append(strings.add(item["id"]))
+        entry_terms.append(strings.add(term))
+        category = item["category"]
+        if category not in categories:
+            categories[category] = len(categories)
+        entry_categories.append(categories[category])
+        for alias in item["aliases"]:
+            alias_strings.append(strings.add(alias))
+        alias_offsets.append(len(alias_strings))
+        for text in [term] + item["aliases"]:
+            pattern = text.lower() if fold else text
+            if not pattern:
+                continue
+            pattern_units.append(utf16_units(pattern))
+            pattern_entries.append(index)
+            pattern_lengths.append(min(utf16_length(text), 0xFFFF))
+    category_strings = array.array("I", [strings.add(name) for name in categories])
+    automaton = compile_automaton(pattern_units)
+
+    header_size = 4 * len(PACK_HEADER_FIELDS)
+    chunks = [b"\0" * header_size]
+    offsets = {}
+    _pack_section(chunks, strings.offsets, offsets, "stringOffsets")
+    _pack_section(chunks, strings.units, offsets, "stringData")
+    _pack_section(chunks, entry_ids, offsets, "entryIds")
+    _pack_section(chunks, entry_terms, offsets, "entryTerms")
+    _pack_section(chunks, entry_categories, offsets, "entryCategories")
+    _pack_section(chunks, alias_offsets, offsets, "aliasOffsets")
+    _pack_section(chunks, alias_strings, offsets, "aliasStrings")
+    _pack_section(chunks, pattern_entries, offsets, "patternEntries")
+    _pack_section(chunks, pattern_lengths, offsets, "patternLengths")
+    _pack_section(chunks, category_strings, offsets, "categoryStrings")
+    for name, values in automaton.items():
+        _pack_section(chunks, values, offsets, name)
+    header = {
+        "magic": struct.unpack("<I", PACK_MAGIC)[0],
+        "formatVersion": PACK_FORMAT_VERSION,
+        "schemaVersion": SCHEMA_VERSION,
+        "entryCount": len(entries),
+        "stringCount": len(strings.index),
+        "aliasCount": len(alias_strings),
+        "patternCount": len(pattern_units),
+        "categoryCount": len(categories),
+        "stateCount": len(automaton["stateFail"]),
+        "transitionCount": len(automaton["transitionCodes"]),
+        "outputCount": len(automaton["outputPatterns"]),
+        "byteLength": sum(len(chunk) for chunk in chunks)
+    }
+    header.update(offsets)
+    chunks[0] = struct.pack(f"<{len(PACK_HEADER_FIELDS)}I", *(header[name] for name in PACK_HEADER_FIELDS))
+    return b"".join(chunks)
+
+
+def write_packed_glossaries(entries, report):
+    """Write each language's full pack and its hot tier.
+
+    `entries` are in rank_entries() order, so the hot tier
+    (glossary_<lang>_hot.bin, the first HOT_TIER_SIZE entries) is a prefix of
+    glossary_<lang>.bin with the same entry indexes. The content script
+    compiles the hot tier at injection and swaps in the full pack on idle;
+    one automaton per language keeps scans single-pass.
+    """
+    for lang in OUTPUT_LANGUAGES:
+        ranked = language_entries(entries, lang)
+        tiers = (
+            (f"glossary_{lang}_hot.bin", ranked[:HOT_TIER_SIZE]),
+            (f"glossary_{lang}.bin", ranked)
+        )
+        for name, tier in tiers:
+            path = os.path.join(DATA_DIR, name)
+            with report.track(name, [path]):
+                with open(path, "wb") as f:
+                    f.write(build_packed_glossary(tier, lang))
 
 
-def main():
-    items, domain_stats = collect_items()
-    entries, missing = build_entries(items)
-    entries.sort(key=lambda x: x["term"].lower())
-    if len(entries) > TARGET_TOTAL:
-        entries = entries[:TARGET_TOTAL]
+def domain_slug(name):
+    """File-name form of a domain, as in data/domains/ (software_engineering)."""
+    return "_".join(name.lower().split())
 
-    meta = build_meta(domain_stats)
-    en_index = {
-        "meta": meta,
-        "items": build_index_entries(entries, "en")
+
+def write_domain_packs(entries, report, indent=2):
+    """Write one packed glossary per domain and language, plus the site map.
+
+    glossary_<lang>_<domain>.bin holds the entries harvested under that
+    domain, in rank order. glossary_domains.json lists the packs and maps
+    each SITE_DOMAINS host to its domain, so the content script on those
+    hosts compiles only the patterns the site needs.
+    """
+    packs = {}
+    for domain in DOMAINS:
+        slug = domain_slug(domain["name"])
+        counts = {}
+        for lang in OUTPUT_LANGUAGES:
+            members = [entry for entry in language_entries(entries, lang) if domain["name"] in entry["domains"]]
+            name = f"glossary_{lang}_{slug}.bin"
+            path = os.path.join(DATA_DIR, name)
+            with report.track(name, [path]):
+                with open(path, "wb") as f:
+                    f.write(build_packed_glossary(members, lang))
+            counts[lang] = len(members)
+        packs[slug] = {"name": domain["name"], "entries": counts}
+    index = {
+        "schemaVersion": SCHEMA_VERSION,
+        "domains": packs,
+        "sites": {host: domain_slug(name) for host, name in sorted(SITE_DOMAINS.items())}
     }
-    zh_index = {
-        "meta": meta,
-        "items": build_index_entries(entries, "zh")
+    path = os.path.join(DATA_DIR, DOMAIN_PACKS_FILE)
+    with report.track(DOMAIN_PACKS_FILE, [path]):
+        write_json(path, index, indent)
+
+
+def search_grams(units, size):
+    """Distinct n-grams of a key padded with one space on each side."""
+    padded = (0x20,) + tuple(units) + (0x20,)
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def build_search_index(entries, lang):
+    """Serialize the sidebar search index for one language.
+
+    Keys are the (case-folded for en/de) terms and aliases, sorted by UTF-16
+    code units so the sidebar can binary-search a prefix range with plain
+    string comparison order. Every key is also listed under each of its
+    n-grams (LANGUAGES gramSize), giving ascending key posting lists for
+    infix and typo-tolerant lookups; postings are stored as LEB128 varint
+    gaps with byte offsets per gram. Like the packed glossary, the layout is
+    a header of little-endian uint32 fields (SEARCH_HEADER_FIELDS) followed
+    by 4-byte aligned typed-array sections.
+    """
+    pairs = set()
+    entries = language_entries(entries, lang)
+    fold = LANGUAGES[lang]["caseFold"]
+    for index, entry in enumerate(entries):
+        item = build_index_item(entry, lang)
+        for text in [item["term"]] + item["aliases"]:
+            key = " ".join(text.split())
+            if fold:
+                key = key.lower()
+            if key:
+                pairs.add((key.encode("utf-16-be"), key, index))
+    keys = sorted(pairs)
+
+    gram_size = LANGUAGES[lang]["gramSize"]
+    key_offsets = array.array("I", [0])
+    key_data = array.array("H")
+    key_entries = array.array("I")
+    postings = {}
+    for key_index, (_, key, entry_index) in enumerate(keys):
+        units = utf16_units(key)
+        key_data.extend(units)
+        key_offsets.append(len(key_data))
+        key_entries.append(entry_index)
+        for gram in search_grams(units, gram_size):
+            postings.setdefault(gram, []).append(key_index)
+    gram_units = array.array("H")
+    gram_posting_offsets = array.array("I", [0])
+    gram_postings = array.array("B")
+    posting_count = 0
+    for gram in sorted(postings):
+        gram_units.extend(gram)
+        previous = 0
+        for key_index in postings[gram]:
+            gap = key_index - previous
+            previous = key_index
+            while gap >= 0x80:
+                gram_postings.append(gap & 0x7F | 0x80)
+                gap >>= 7
+            gram_postings.append(gap)
+        posting_count += len(postings[gram])
+        gram_posting_offsets.append(len(gram_postings))
+
+    header_size = 4 * len(SEARCH_HEADER_FIELDS)
+    chunks = [b"\0" * header_size]
+    offsets = {}
+    _pack_section(chunks, key_offsets, offsets, "keyOffsets")
+    _pack_section(chunks, key_data, offsets, "keyData")
+    _pack_section(chunks, key_entries, offsets, "keyEntries")
+    _pack_section(chunks, gram_units, offsets, "gramUnits")
+    _pack_section(chunks, gram_posting_offsets, offsets, "gramPostingOffsets")
+    _pack_section(chunks, gram_postings, offsets, "gramPostings")
+    header = {
+        "magic": struct.unpack("<I", SEARCH_MAGIC)[0],
+        "formatVersion": SEARCH_FORMAT_VERSION,
+        "schemaVersion": SCHEMA_VERSION,
+        "entryCount": len(entries),
+        "keyCount": len(keys),
+        "gramSize": gram_size,
+        "gramCount": len(postings),
+        "postingCount": posting_count,
+        "postingBytes": len(gram_postings),
+        "byteLength": sum(len(chunk) for chunk in chunks)
     }
-    detail = {
-        "meta": meta,
-        "items": build_detail_entries(entries)
+    header.update(offsets)
+    chunks[0] = struct.pack(f"<{len(SEARCH_HEADER_FIELDS)}I", *(header[name] for name in SEARCH_HEADER_FIELDS))
+    return b"".join(chunks)
+
+
+def write_search_indexes(entries, report):
+    for lang in OUTPUT_LANGUAGES:
+        path = os.path.join(DATA_DIR, f"search_{lang}.bin")
+        with report.track(os.path.basename(path), [path]):
+            with open(path, "wb") as f:
+                f.write(build_search_index(entries, lang))
+
+
+def write_json(path, value, indent=2):
+    separators = (",", ":") if indent is None else None
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, indent=indent, separators=separators)
+
+
+def _encode_fragment(value, depth, key=None, indent=2):
+    if indent is None:
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        if key is not None:
+            text = json.dumps(key, ensure_ascii=False) + ":" + text
+        return text
+    pad = " " * (indent * depth)
+    text = json.dumps(value, ensure_ascii=False, indent=indent).replace("\n", "\n" + pad)
+    if key is not None:
+        text = json.dumps(key, ensure_ascii=False) + ": " + text
+    return pad + text
+
+
+class JsonItemsWriter:
+    """Write a {"meta": ..., "items": ...} document one item at a time.
+
+    The result is byte-identical to json.dump(document, indent=indent) (or
+    the compact separators when indent is None), but items can be handed in
+    as pre-encoded fragments cached from an earlier build. Time spent in the
+    writer is accumulated in `seconds` for the artifact report.
+    """
+
+    def __init__(self, path, meta, keyed=False, indent=2):
+        start = time.perf_counter()
+        self.path = path
+        self.keyed = keyed
+        self.indent = indent
+        self.count = 0
+        self.file = open(path, "w", encoding="utf-8")
+        opening = "{" if keyed else "["
+        if indent is None:
+            self.file.write("{" + _encode_fragment(meta, 1, "meta", None) + ',"items":' + opening)
+        else:
+            self.file.write("{\n" + _encode_fragment(meta, 1, "meta", indent) + ",\n")
+            self.file.write(" " * indent + '"items": ' + opening)
+        self.seconds = time.perf_counter() - start
+
+    def encode(self, item, key=None):
+        start = time.perf_counter()
+        fragment = _encode_fragment(item, 2, key if self.keyed else None, self.indent)
+        self.seconds += time.perf_counter() - start
+        return fragment
+
+    def write(self, fragment):
+        start = time.perf_counter()
+        separator = "," if self.count else ""
+        if self.indent is not None:
+            separator += "\n"
+        self.file.write(separator + fragment)
+        self.count += 1
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        start = time.perf_counter()
+        closing = "}" if self.keyed else "]"
+        if self.indent is None:
+            self.file.write(closing + "}")
+        else:
+            self.file.write(("\n" + " " * self.indent + closing if self.count else closing) + "\n}")
+        self.file.close()
+        self.seconds += time.perf_counter() - start
+
+
+class ArtifactReport:
+    """Collects size and write time per output artifact."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, name, paths, seconds):
+        size = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+        self.rows.append((name, len(paths), size, seconds))
+
+    @contextlib.contextmanager
+    def track(self, name, paths):
+        start = time.perf_counter()
+        yield
+        self.add(name, paths, time.perf_counter() - start)
+
+    def print_summary(self):
+        print("Artifacts")
+        for name, files, size, seconds in self.rows:
+            label = f"{name} ({files} files)" if files > 1 else name
+            print(f"- {label}: {size / 1024:.1f} KiB in {seconds:.2f}s")
+        total = sum(row[2] for row in self.rows)
+        print(f"Total artifact size: {total / 1024:.1f} KiB")
+
+
+def fnv1a32(text):
+    value = FNV32_OFFSET
+    for byte in text.encode("utf-8"):
+        value = ((value ^ byte) * FNV32_PRIME) & 0xFFFFFFFF
+    return value
+
+
+def detail_shard_count(total):
+    count = 1
+    while count * DETAIL_SHARD_SIZE < total:
+        count *= 2
+    return count
+
+
+def detail_shard_name(qid, count):
+    width = len(format(count - 1, "x"))
+    return format(fnv1a32(qid) % count, f"0{width}x")
+
+
+def write_detail_shards(shards, count, meta, indent=2):
+    """Write data/detail/<shard>.json files plus the index.json the sidebar reads.
+
+    A QID lives in shard fnv1a32(qid) % shardCount, named in fixed-width hex,
+    so the content script can fetch the one file holding a term. Returns the
+    paths written.
+    """
+    shard_dir = os.path.join(DATA_DIR, "detail")
+    os.makedirs(shard_dir, exist_ok=True)
+    for name in os.listdir(shard_dir):
+        if name.endswith(".json"):
+            os.remove(os.path.join(shard_dir, name))
+    paths = []
+    for shard, fragments in sorted(shards.items()):
+        writer = JsonItemsWriter(
+            os.path.join(shard_dir, f"{shard}.json"),
+            dict(meta, shard=shard),
+            keyed=True,
+            indent=indent
+        )
+        try:
+            for fragment in fragments:
+                writer.write(fragment)
+        finally:
+            writer.close()
+        paths.append(writer.path)
+    index = {
+        "schemaVersion": SCHEMA_VERSION,
+        "hash": "fnv1a32",
+        "shardCount": count
     }
+    paths.append(os.path.join(shard_dir, "index.json"))
+    write_json(paths[-1], index, indent)
+    return paths
 
-    with open(os.path.join(DATA_DIR, "glossary_en_index.json"), "w", encoding="utf-8") as f:
-        json.dump(en_index, f, ensure_ascii=False, indent=2)
 
-    with open(os.path.join(DATA_DIR, "glossary_zh_index.json"), "w", encoding="utf-8") as f:
-        json.dump(zh_index, f, ensure_ascii=False, indent=2)
+def remove_dropped_languages():
+    """Delete the index, packs and search index of languages no longer in OUTPUT_LANGUAGES.
 
-    with open(os.path.join(DATA_DIR, "glossary_detail.json"), "w", encoding="utf-8") as f:
-        json.dump(detail, f, ensure_ascii=False, indent=2)
-
-    cedict = build_cedict(entries)
-    with open(os.path.join(DATA_DIR, "cedict_min.json"), "w", encoding="utf-8") as f:
-        json.dump(cedict, f, ensure_ascii=False, indent=2)
+    Returns the file names removed.
+    """
+    dropped = [lang for lang in (*LANGUAGES, *RETIRED_LANGUAGES) if lang not in OUTPUT_LANGUAGES]
+    if not dropped:
+        return []
+    pattern = re.compile(r"(?:glossary|search)_(?:%s)(?:_[a-z0-9_]+)?\.(?:json|bin)" % "|".join(dropped))
+    removed = []
+    for name in sorted(os.listdir(DATA_DIR)):
+        if pattern.fullmatch(name):
+            os.remove(os.path.join(DATA_DIR, name))
+            removed.append(name)
+    return removed
+
+
+def write_glossary_outputs(entries, meta, fragments, report, indent=2):
+    """Stream the per-language indexes, the detail map and its shards, reusing cached fragments.
+
+    `fragments` maps QID -> {<language>..., "detail"} encoded items; missing
+    fragments are encoded here and stored back into the mapping. The full
+    build metadata is written once to glossary_meta.json; the other files
+    only carry the schema version and build time.
+    """
+    meta_path = os.path.join(DATA_DIR, "glossary_meta.json")
+    with report.track("glossary_meta.json", [meta_path]):
+        write_json(meta_path, meta, indent)
+    file_meta = {"schemaVersion": meta["schemaVersion"], "generatedAt": meta["generatedAt"]}
+    shard_count = detail_shard_count(len(entries))
+    shards = {}
+    writers = {
+        lang: JsonItemsWriter(os.path.join(DATA_DIR, f"glossary_{lang}_index.json"), file_meta, indent=indent)
+        for lang in OUTPUT_LANGUAGES
+    }
+    writers["detail"] = JsonItemsWriter(
+        os.path.join(DATA_DIR, "glossary_detail.json"), file_meta, keyed=True, indent=indent
+    )
+    try:
+        for entry in entries:
+            cached = fragments.get(entry["id"]) or {}
+            encoded = {}
+            for name, writer in writers.items():
+                if name != "detail" and not has_language(entry, name):
+                    continue
+                fragment = cached.get(name)
+                if fragment is None:
+                    if name == "detail":
+                        fragment = writer.encode(build_detail_item(entry), entry["id"])
+                    else:
+                        fragment = writer.encode(build_index_item(entry, name))
+                writer.write(fragment)
+                encoded[name] = fragment
+            fragments[entry["id"]] = encoded
+            shards.setdefault(detail_shard_name(entry["id"], shard_count), []).append(encoded["detail"])
+    finally:
+        for writer in writers.values():
+            writer.close()
+    for writer in writers.values():
+        report.add(os.path.basename(writer.path), [writer.path], writer.seconds)
+    start = time.perf_counter()
+    paths = write_detail_shards(shards, shard_count, file_meta, indent)
+    report.add("detail shards", paths, time.perf_counter() - start)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the terminology sidebar glossary.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=HARVEST_WORKERS,
+        help="concurrent SPARQL queries (1 runs the roots sequentially)"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write JSON outputs without indentation"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="rebuild only entries whose inputs changed since the last build"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory for the HTTP cache, harvest checkpoints and build manifest "
+             "(default tools/.cache; a fresh temporary one with --record/--replay)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="write the glossary artifacts here instead of data/"
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        metavar="BUNDLE",
+        help="capture every network response into a sealed fixture bundle"
+    )
+    fixtures.add_argument(
+        "--replay",
+        metavar="BUNDLE",
+        help="serve all network requests from a recorded fixture bundle"
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="SCALE",
+        help="with --replay, delay responses by SCALE x their recorded latency "
+             "and apply the live rate limits (default 0: no delays)"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="TRACE",
+        help="write a JSON trace of every build stage and HTTP request"
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="DIR",
+        help="dump cProfile stats (<stage>.pstats) for the CPU-bound stages"
+    )
+    parser.add_argument(
+        "--languages",
+        default=",".join(BASE_LANGUAGES),
+        help="comma-separated output languages; en and zh are always built "
+             f"(known: {', '.join(LANGUAGES)})"
+    )
+    parser.add_argument(
+        "--skip-enrichment",
+        action="store_true",
+        help="do not fetch Wikidata aliases and sitelinks with wbgetentities"
+    )
+    parser.add_argument(
+        "--summaries",
+        action="store_true",
+        help="batch-fetch Wikipedia intro sentences into the detail records "
+             "(needs the sitelinks from enrichment)"
+    )
+    args = parser.parse_args(argv)
+    languages = [lang.strip().lower() for lang in args.languages.split(",") if lang.strip()]
+    unknown = sorted(set(languages) - set(LANGUAGES))
+    if unknown:
+        parser.error(f"unknown languages: {', '.join(unknown)} (known: {', '.join(LANGUAGES)})")
+    args.languages = BASE_LANGUAGES + tuple(
+        lang for lang in LANGUAGES if lang in languages and lang not in BASE_LANGUAGES
+    )
+    return args
+
+
+def main(argv=None):
+    global DATA_DIR, BUILD_TIMESTAMP, OUTPUT_LANGUAGES
+    args = parse_args(argv)
+    OUTPUT_LANGUAGES = args.languages
+    if args.cache_dir:
+        set_cache_dir(args.cache_dir)
+    elif args.record or args.replay:
+        # Start cold so every request reaches (or is served from) the bundle.
+        set_cache_dir(tempfile.mkdtemp(prefix="glossary-cache-"))
+    if args.output_dir:
+        DATA_DIR = args.output_dir
+        os.makedirs(DATA_DIR, exist_ok=True)
+    if args.record or args.replay:
+        if args.record:
+            transport = RecordingTransport(args.record)
+        else:
+            transport = ReplayTransport(args.replay, args.replay_latency)
+        BUILD_TIMESTAMP = transport.recorded_at
+        set_transport(transport)
+    _profiler.cprofile_dir = args.cprofile
+    try:
+        build(args)
+    finally:
+        _transport.close()
+        if args.profile:
+            _profiler.write_trace(args.profile)
+
+
+def build(args):
+    with _profiler.stage("harvest"):
+        items, domain_stats = collect_items(workers=args.workers)
+    enrichment = None
+    if not args.skip_enrichment:
+        with _profiler.stage("enrich"):
+            enrichment = enrich_items(items, workers=args.workers)
+    previous = load_build_manifest() if args.incremental else {}
+    with _profiler.stage("entries", cpu=True):
+        entries, missing, manifest, changed = build_entries_incremental(items, previous)
+    layout = "compact" if args.compact else "indent"
+    manifest["layout"] = layout
+    manifest["summaries"] = with_summaries = args.summaries and not args.skip_enrichment
+    changed = changed or previous.get("layout") != layout or previous.get("summaries", False) != with_summaries
+    outputs = [
+        "glossary_meta.json",
+        DOMAIN_PACKS_FILE,
+        "glossary_detail.json",
+        os.path.join("detail", "index.json")
+    ]
+    for lang in OUTPUT_LANGUAGES:
+        outputs += [
+            f"glossary_{lang}_index.json",
+            f"glossary_{lang}_hot.bin",
+            f"glossary_{lang}.bin",
+            f"search_{lang}.bin"
+        ]
+        outputs += [f"glossary_{lang}_{domain_slug(domain['name'])}.bin" for domain in DOMAINS]
+    if args.incremental and not changed and all(os.path.exists(os.path.join(DATA_DIR, name)) for name in outputs):
+        print("Glossary is up to date; no inputs changed since the last build.")
+        return
+    # Keep the most popular TARGET_TOTAL entries, in rank order, so every
+    # language index starts with its hot tier.
+    entries = rank_entries(entries)[:TARGET_TOTAL]
+    with _profiler.stage("variants", cpu=True):
+        entries, collisions = resolve_variants(entries)
+    with _profiler.stage("related", cpu=True):
+        linked = compute_related(entries)
+    summaries = None
+    if with_summaries:
+        with _profiler.stage("summaries"):
+            summaries = add_summaries(entries, workers=args.workers)
+    else:
+        # Cached entries may still carry the summaries of an earlier build.
+        for entry in entries:
+            entry.pop("summaries", None)
+    # Variants and related terms depend on the other entries, and summaries
+    # on a later stage, so an unchanged entry can still end up with different
+    # ones than its cached fragments.
+    links = {
+        entry["id"]: [entry["aliases"], entry.get("zhAliases", []), entry["detail"]["related"], entry.get("summaries")]
+        for entry in entries
+    }
 
+    meta = build_meta(domain_stats)
+    indent = None if args.compact else 2
+    fragments = {}
+    if previous.get("layout") == layout:
+        previous_entries = previous.get("entries", {})
+        for qid, record in manifest["entries"].items():
+            if record.get("fragments") and (previous_entries.get(qid) or {}).get("links") == links.get(qid):
+                fragments[qid] = record["fragments"]
+    report = ArtifactReport()
+    with _profiler.stage("write-json", cpu=True):
+        write_glossary_outputs(entries, meta, fragments, report, indent)
+    with _profiler.stage("write-packed", cpu=True):
+        write_packed_glossaries(entries, report)
+    with _profiler.stage("write-search", cpu=True):
+        write_search_indexes(entries, report)
+    with _profiler.stage("write-domains", cpu=True):
+        write_domain_packs(entries, report, indent)
+    dropped_files = remove_dropped_languages()
+    for name in RETIRED_OUTPUTS:
+        path = os.path.join(DATA_DIR, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    cedict_path = os.path.join(DATA_DIR, "cedict_min.json")
+    with report.track("cedict_min.json", [cedict_path]):
+        write_json(cedict_path, build_cedict(entries), indent)
+
+    with _profiler.stage("manifest"):
+        for qid, record in manifest["entries"].items():
+            record["fragments"] = fragments.get(qid)
+            record["links"] = links.get(qid)
+        save_build_manifest(manifest)
+
+    if args.incremental:
+        print(f"Incremental build: {manifest['rebuilt']} of {len(items)} entries rebuilt")
     print("Build summary")
     print(f"Domains queried: {len(DOMAINS)}")
     for domain, count in domain_stats.items():
         print(f"- {domain}: {count} raw rows")
     print(f"Total items fetched: {len(items)}")
+    if enrichment is not None:
+        print(
+            f"Entity enrichment: {enrichment['cached']} cached, "
+            f"{enrichment['batches']} wbgetentities batches, {enrichment['failed']} failed"
+        )
+    if summaries is not None:
+        print(
+            f"Wikipedia summaries: {summaries['found']} entries, {summaries['cached']} cached titles, "
+            f"{summaries['batches']} batches, {summaries['failed']} failed"
+        )
+    elif args.summaries:
+        print("Wikipedia summaries skipped: they need the sitelinks from enrichment")
     print(f"Entries with bilingual definitions: {len(entries)}")
     print(f"Entries dropped (missing bilingual definition): {missing}")
+    print(f"Hot tier: {min(len(entries), HOT_TIER_SIZE)} of {len(entries)} entries")
+    print(f"Aliases (overrides and variants): {sum(len(entry['aliases']) for entry in entries)}")
+    print(f"Chinese aliases (Wikidata): {sum(len(entry.get('zhAliases', [])) for entry in entries)}")
+    print(f"Variant collisions (dropped): {len(collisions)}")
+    print(f"Related terms: {linked} of {len(entries)} entries linked")
+    for pattern, qids in sorted(collisions.items())[:VARIANT_COLLISION_EXAMPLES]:
+        print(f"- {pattern}: {', '.join(qids)}")
+    if dropped_files:
+        print(f"Removed outputs of dropped languages: {', '.join(dropped_files)}")
+    report.print_summary()
+    _profiler.print_summary()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""Local stand-in for the Wikidata and Wikipedia APIs the builder enriches from.
+
+StandInWiki answers the two calls build_glossary.py makes after the harvest:
+
+- wbgetentities (enrich_items): labels, aliases and sitelinks of up to 50 ids,
+  merged items under their target id, and `maxlag` errors on request.
+- query&prop=extracts (add_summaries): intro extracts for up to 50 titles,
+  with title normalization, redirects, missing pages and the API's
+  continuation, which hands out 20 intro extracts per response.
+
+Every request is logged in `requests`, so tests can check the batching.
+point_builder() swaps WIKIDATA_API/WIKIPEDIA_API of the build_glossary
+module to the server; tools/test_build_glossary.py uses it that way.
+"""
+import http.server
+import json
+import threading
+import urllib.parse
+
+ENTITY_LIMIT = 50
+EXTRACTS_PER_RESPONSE = 20
+
+
+def entity(qid, labels=None, aliases=None, sitelinks=None):
+    """A wbgetentities entity from plain {tag: value}, {tag: [values]} and {site: title} maps."""
+    return {
+        "type": "item",
+        "id": qid,
+        "labels": {tag: {"language": tag, "value": value} for tag, value in (labels or {}).items()},
+        "aliases": {
+            tag: [{"language": tag, "value": value} for value in values]
+            for tag, values in (aliases or {}).items()
+        },
+        "sitelinks": {site: {"site": site, "title": title} for site, title in (sitelinks or {}).items()}
+    }
+
+
+def normalize_title(title):
+    return title[:1].upper() + title[1:].replace("_", " ")
+
+
+class StandInWiki:
+    def __init__(self):
+        self.entities = {}  # QID -> entity()
+        self.merged = {}  # QID -> QID it was merged into
+        self.pages = {}  # (lang, title) -> intro extract
+        self.page_redirects = {}  # (lang, title) -> target title
+        self.failing_titles = set()  # extracts queries naming one of these get HTTP 500
+        self.maxlag_replies = 0  # the next N wbgetentities calls report replication lag
+        self.requests = []  # (api, params) in arrival order
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def wikidata_api(self):
+        return f"{self.base_url}/wikidata/w/api.php"
+
+    @property
+    def wikipedia_api(self):
+        return f"{self.base_url}/{{lang}}wiki/w/api.php"
+
+    def start(self):
+        wiki = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                params = {key: values[0] for key, values in urllib.parse.parse_qs(url.query).items()}
+                site = url.path.strip("/").split("/")[0]
+                status, body = wiki.handle(site, params)
+                raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def point_builder(self, module):
+        module.WIKIDATA_API = self.wikidata_api
+        module.WIKIPEDIA_API = self.wikipedia_api
+
+    def calls(self, api):
+        with self.lock:
+            return [params for name, params in self.requests if name == api]
+
+    def handle(self, site, params):
+        if site == "wikidata" and params.get("action") == "wbgetentities":
+            with self.lock:
+                self.requests.append(("wbgetentities", params))
+            return self.get_entities(params)
+        if site.endswith("wiki") and params.get("prop") == "extracts":
+            with self.lock:
+                self.requests.append(("extracts", params))
+            return self.get_extracts(site[:-len("wiki")], params)
+        return 400, {"error": {"code": "badvalue", "info": f"Unsupported request to {site}"}}
+
+    def get_entities(self, params):
+        ids = params.get("ids", "").split("|")
+        if len(ids) > ENTITY_LIMIT:
+            return 200, {"error": {"code": "toomanyvalues", "info": f"Too many values supplied for ids (limit {ENTITY_LIMIT})"}}
+        with self.lock:
+            lagged = "maxlag" in params and self.maxlag_replies > 0
+            if lagged:
+                self.maxlag_replies -= 1
+        if lagged:
+            return 200, {"error": {"code": "maxlag", "info": "Waiting for a database server: 6 seconds lagged.", "lag": 6}}
+        entities = {}
+        for qid in ids:
+            target = self.merged.get(qid)
+            if target:
+                entities[target] = dict(self.entities[target], redirects={"from": qid, "to": target})
+            elif qid in self.entities:
+                entities[qid] = self.entities[qid]
+            else:
+                entities[qid] = {"id": qid, "missing": ""}
+        return 200, {"entities": entities, "success": 1}
+
+    def get_extracts(self, lang, params):
+        titles = params.get("titles", "").split("|")
+        if self.failing_titles.intersection(titles):
+            return 500, {"error": {"code": "internal_api_error", "info": "Stand-in failure"}}
+        normalized = []
+        redirects = []
+        pages = []
+        for title in titles:
+            name = normalize_title(title)
+            if name != title:
+                normalized.append({"from": title, "to": name})
+            target = self.page_redirects.get((lang, name))
+            if target:
+                redirects.append({"from": name, "to": target})
+                name = target
+            if (lang, name) in self.pages:
+                pages.append({"title": name})
+            else:
+                pages.append({"title": name, "missing": True})
+        present = [page for page in pages if not page.get("missing")]
+        offset = int(params.get("excontinue", 0))
+        for page in present[offset:offset + EXTRACTS_PER_RESPONSE]:
+            page["extract"] = self.pages[(lang, page["title"])]
+        body = {"batchcomplete": True, "query": {"normalized": normalized, "redirects": redirects, "pages": pages}}
+        if offset + EXTRACTS_PER_RESPONSE < len(present):
+            body["batchcomplete"] = False
+            body["continue"] = {"excontinue": str(offset + EXTRACTS_PER_RESPONSE), "continue": "||"}
+        return 200, body
@@ -0,0 +1,280 @@
+"""Network stages of build_glossary.py against local stand-ins for the APIs.
+
+Usage:
+    python -m unittest discover -s tools
+"""
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import build_glossary  # noqa: E402
+from stand_in_wiki import StandInWiki, entity  # noqa: E402
+
+
+class StandInTestCase(unittest.TestCase):
+    """Points the builder's caches at a temporary directory and its APIs at a fresh server."""
+
+    PATCHED = ("WIKIDATA_API", "WIKIPEDIA_API", "REQUEST_DELAY_SEC", "RETRY_BACKOFF_SEC", "LANGUAGES", "OUTPUT_LANGUAGES")
+
+    def setUp(self):
+        self.saved = {name: getattr(build_glossary, name) for name in self.PATCHED}
+        self.saved_cache_dir = build_glossary.CACHE_DIR
+        self.cache_dir = tempfile.mkdtemp(prefix="glossary-test-")
+        build_glossary.set_cache_dir(self.cache_dir)
+        build_glossary.REQUEST_DELAY_SEC = 0.001
+        build_glossary.RETRY_BACKOFF_SEC = 0.001
+        self.wiki = StandInWiki().start()
+        self.wiki.point_builder(build_glossary)
+
+    def tearDown(self):
+        self.wiki.stop()
+        for name, value in self.saved.items():
+            setattr(build_glossary, name, value)
+        build_glossary.set_cache_dir(self.saved_cache_dir)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class RootPagingTest(unittest.TestCase):
+    """iter_root_pages against a fake endpoint that returns two rows per item."""
+
+    def setUp(self):
+        self.saved = {name: getattr(build_glossary, name) for name in ("sparql_query", "ROOT_LIMIT", "SPARQL_PAGE_SIZE")}
+        self.saved_cache_dir = build_glossary.CACHE_DIR
+        self.cache_dir = tempfile.mkdtemp(prefix="glossary-test-")
+        build_glossary.set_cache_dir(self.cache_dir)
+        build_glossary.ROOT_LIMIT = 230
+        build_glossary.SPARQL_PAGE_SIZE = 100
+        build_glossary.sparql_query = self.answer
+        self.queries = []
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(build_glossary, name, value)
+        build_glossary.set_cache_dir(self.saved_cache_dir)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def answer(self, query):
+        self.queries.append(query)
+        if "SELECT DISTINCT ?item" in query:
+            limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+            qids = sorted(f"Q{index}" for index in range(1, 301))[:limit]
+        else:
+            qids = re.search(r"VALUES \?item \{ (.*) \}", query).group(1).replace("wd:", "").split()
+        rows = []
+        for qid in qids:
+            item = {"value": build_glossary.WIKIDATA_ENTITY_PREFIX + qid}
+            rows.append({"item": item, "itemLabelZh": {"value": f"{qid} zh"}})
+            if "SELECT DISTINCT ?item" not in query:
+                rows.append({"item": item, "itemLabelZh": {"value": f"{qid} zh-hant"}})
+        return {"results": {"bindings": rows}}
+
+    def test_traversal_runs_once_and_pages_hold_whole_items(self):
+        pages = list(build_glossary.iter_root_pages("Q11190"))
+
+        traversals = [query for query in self.queries if "wdt:P279*" in query]
+        self.assertEqual(len(traversals), 1)
+        self.assertEqual(len(self.queries), 1 + 3)
+        self.assertEqual([len(page) for page in pages], [200, 200, 60])
+        qids = [[build_glossary._row_qid(row) for row in page] for page in pages]
+        for index, page in enumerate(qids):
+            for other in qids[index + 1:]:
+                self.assertFalse(set(page) & set(other))
+        self.assertEqual(len({qid for page in qids for qid in page}), 230)
+
+    def test_interrupted_harvest_resumes_with_the_next_batch(self):
+        pages = build_glossary.iter_root_pages("Q11190")
+        first = next(pages)
+        pages.close()
+        self.queries.clear()
+        resumed = list(build_glossary.iter_root_pages("Q11190"))
+
+        self.assertEqual(resumed[0], first)
+        self.assertEqual([len(page) for page in resumed], [200, 200, 60])
+        # No new id query, and only the two batches that were not fetched yet.
+        self.assertEqual(len(self.queries), 2)
+        self.assertTrue(all("VALUES ?item" in query for query in self.queries))
+        self.queries.clear()
+        self.assertEqual(list(build_glossary.iter_root_pages("Q11190")), resumed)
+        self.assertEqual(self.queries, [])
+
+
+class EnrichmentTest(StandInTestCase):
+    def add_entities(self, count):
+        items = {}
+        for index in range(count):
+            qid = f"Q{index + 1}"
+            self.wiki.entities[qid] = entity(qid, labels={"en": f"term {index}"})
+            items[qid] = {"id": qid}
+        return items
+
+    def test_batches_of_fifty(self):
+        items = self.add_entities(120)
+        stats = build_glossary.enrich_items(items, workers=2)
+
+        calls = self.wiki.calls("wbgetentities")
+        self.assertEqual(sorted(len(call["ids"].split("|")) for call in calls), [20, 50, 50])
+        requested = [qid for call in calls for qid in call["ids"].split("|")]
+        self.assertEqual(sorted(requested), sorted(items))
+        self.assertEqual(stats, {"cached": 0, "batches": 3, "failed": 0})
+
+    def test_merges_labels_aliases_and_sitelinks(self):
+        # The shipped matrix is en/zh only; an extra row exercises the label fill.
+        build_glossary.LANGUAGES = {
+            **build_glossary.LANGUAGES,
+            "ja": {"tags": ("ja",), "detailKey": "ja", "caseFold": False, "gramSize": 2}
+        }
+        build_glossary.OUTPUT_LANGUAGES = ("en", "zh", "ja")
+        self.wiki.entities["Q10"] = entity(
+            "Q10",
+            labels={"en": "hash table", "zh": "哈希表", "ja": "ハッシュテーブル"},
+            aliases={"en": ["hash map", "hashmap"], "zh-hans": ["散列表"], "zh-hant": ["雜湊表", "散列表"]},
+            sitelinks={"enwiki": "Hash table", "zhwiki": "哈希表", "jawiki": "ハッシュテーブル", "dewiki": "Hashtabelle"}
+        )
+        self.wiki.entities["Q20"] = entity("Q20", labels={"en": "binary tree", "ja": "二分木"})
+        self.wiki.merged["Q11"] = "Q20"
+        items = {
+            "Q10": {"id": "Q10", "languages": {"ja": {"label": "ハッシュ表", "desc": "", "def": ""}}},
+            "Q11": {"id": "Q11"},
+            "Q12": {"id": "Q12"}
+        }
+        build_glossary.enrich_items(items, workers=1)
+
+        hash_table = items["Q10"]
+        self.assertEqual(hash_table["altEn"], ["hash map", "hashmap"])
+        self.assertEqual(hash_table["altZh"], ["散列表", "雜湊表"])
+        self.assertEqual(hash_table["sitelinks"], 4)
+        self.assertEqual(hash_table["wikiTitles"], {"en": "Hash table", "zh": "哈希表"})
+        # Labels only fill languages the harvest left empty.
+        self.assertEqual(hash_table["languages"]["ja"]["label"], "ハッシュ表")
+        # A merged item is enriched from its target under the requested id.
+        self.assertEqual(items["Q11"]["languages"], {"ja": {"label": "二分木", "desc": "", "def": ""}})
+        self.assertEqual(items["Q11"]["altEn"], [])
+        self.assertEqual(items["Q12"], {"id": "Q12"})
+
+    def test_maxlag_is_retried(self):
+        items = self.add_entities(10)
+        self.wiki.maxlag_replies = 2
+        stats = build_glossary.enrich_items(items, workers=1)
+
+        calls = self.wiki.calls("wbgetentities")
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(all(call["maxlag"] == str(build_glossary.WIKIDATA_MAXLAG) for call in calls))
+        self.assertEqual(stats["failed"], 0)
+        self.assertTrue(all(item["sitelinks"] == 0 for item in items.values()))
+
+    def test_persistent_maxlag_fails_the_batch_only(self):
+        items = self.add_entities(60)
+        self.wiki.maxlag_replies = build_glossary.RETRY_LIMIT
+        stats = build_glossary.enrich_items(items, workers=1)
+
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(sum("sitelinks" in item for item in items.values()), 60 - build_glossary.ENTITY_BATCH_SIZE)
+        # The refusals were not cached: the next build fetches the failed batch again.
+        self.wiki.requests.clear()
+        stats = build_glossary.enrich_items(items, workers=1)
+        self.assertEqual(stats, {"cached": 10, "batches": 1, "failed": 0})
+        self.assertTrue(all("sitelinks" in item for item in items.values()))
+
+    def test_cached_entities_make_no_requests(self):
+        items = self.add_entities(70)
+        build_glossary.enrich_items(items, workers=2)
+        self.wiki.requests.clear()
+        again = {qid: {"id": qid} for qid in items}
+        stats = build_glossary.enrich_items(again, workers=2)
+
+        self.assertEqual(self.wiki.calls("wbgetentities"), [])
+        self.assertEqual(stats, {"cached": 70, "batches": 0, "failed": 0})
+        self.assertEqual(again, items)
+
+
+class SummaryTest(StandInTestCase):
+    def add_pages(self, lang, count):
+        titles = []
+        for index in range(count):
+            title = f"Term {lang} {index}"
+            self.wiki.pages[(lang, title)] = f"{title} is a test page. It has a second sentence."
+            titles.append(title)
+        return titles
+
+    def entries_for(self, titles_by_lang):
+        entries = []
+        for lang, titles in titles_by_lang.items():
+            for index, title in enumerate(titles):
+                entries.append({"id": f"Q{lang}{index}", "wikiTitles": {lang: title}})
+        return entries
+
+    def test_batches_and_continuation(self):
+        titles = self.add_pages("en", 120)
+        entries = self.entries_for({"en": titles})
+        stats = build_glossary.add_summaries(entries, workers=2)
+
+        calls = self.wiki.calls("extracts")
+        first_pages = sorted(len(call["titles"].split("|")) for call in calls if "excontinue" not in call)
+        self.assertEqual(first_pages, [20, 50, 50])
+        # 50 titles need three responses of at most 20 extracts, 20 titles one.
+        self.assertEqual(len(calls), 3 + 3 + 1)
+        self.assertEqual(stats, {"cached": 0, "batches": 3, "failed": 0, "found": 120})
+        self.assertEqual(
+            entries[7]["summaries"],
+            {"en": {"source": "wikipedia", "title": titles[7], "definition": f"{titles[7]} is a test page"}}
+        )
+
+    def test_normalized_redirected_and_missing_titles(self):
+        self.wiki.pages[("en", "Hash table")] = "A hash table maps keys to values. More."
+        self.wiki.page_redirects[("en", "Hashmap")] = "Hash table"
+        self.wiki.pages[("zh", "哈希表")] = "哈希表是一种数据结构。更多。"
+        entries = [
+            {"id": "Q1", "wikiTitles": {"en": "hash table", "zh": "哈希表"}},
+            {"id": "Q2", "wikiTitles": {"en": "hashmap"}},
+            {"id": "Q3", "wikiTitles": {"en": "No such page"}}
+        ]
+        build_glossary.add_summaries(entries, workers=1)
+
+        self.assertEqual(entries[0]["summaries"]["en"]["definition"], "A hash table maps keys to values")
+        self.assertEqual(entries[0]["summaries"]["zh"]["definition"], "哈希表是一种数据结构。")
+        self.assertEqual(entries[1]["summaries"]["en"]["title"], "hashmap")
+        self.assertEqual(entries[1]["summaries"]["en"]["definition"], "A hash table maps keys to values")
+        # Missing pages are left to the runtime lookup.
+        self.assertNotIn("summaries", entries[2])
+
+    def test_failed_batch_falls_back_to_runtime_lookup(self):
+        titles = self.add_pages("en", 60)
+        # Batches are cut from the sorted titles: fail the second one.
+        failed_batch = set(sorted(titles)[50:])
+        self.wiki.failing_titles.add(sorted(titles)[55])
+        entries = self.entries_for({"en": titles})
+        stats = build_glossary.add_summaries(entries, workers=1)
+
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["found"], 50)
+        for entry in entries:
+            self.assertEqual("summaries" in entry, entry["wikiTitles"]["en"] not in failed_batch)
+
+        # The next build only asks for the titles of the failed batch.
+        self.wiki.failing_titles.clear()
+        self.wiki.requests.clear()
+        stats = build_glossary.add_summaries(entries, workers=1)
+        self.assertEqual(stats["cached"], 50)
+        self.assertEqual([len(call["titles"].split("|")) for call in self.wiki.calls("extracts")], [10])
+        self.assertTrue(all("summaries" in entry for entry in entries))
+
+    def test_cached_build_matches_fresh_build(self):
+        titles = self.add_pages("en", 30)
+        fresh = self.entries_for({"en": titles})
+        build_glossary.add_summaries(fresh, workers=1)
+        self.wiki.requests.clear()
+        cached = self.entries_for({"en": titles})
+        stats = build_glossary.add_summaries(cached, workers=1)
+
+        self.assertEqual(self.wiki.calls("extracts"), [])
+        self.assertEqual(stats["cached"], 30)
+        self.assertEqual(cached, fresh)
+
+
+if __name__ == "__main__":
+    unittest.main()
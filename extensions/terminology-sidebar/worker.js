@@ -1,2 +1,326 @@
 // Built by tools/bundle.js
-// Web Worker for Aho-Corasick matching// This runs in a separate thread to avoid blocking the UIconst isWordChar = (ch) => /[A-Za-z0-9_]/.test(ch);// Automaton statelet automatonEn = null;let automatonZh = null;// --- Matcher Logic (Optimized with TypedArrays for larger dictionaries) ---const buildAutomaton = (patterns) => {    const root = { next: new Map(), fail: null, outputs: [] };    const addPattern = (pattern, meta) => {      let node = root;      for (const ch of pattern) {        if (!node.next.has(ch)) node.next.set(ch, { next: new Map(), fail: null, outputs: [] });        node = node.next.get(ch);      }      node.outputs.push(meta);    };    patterns.forEach((item) => {      // item: { p: pattern, i: index, l: termLength }      addPattern(item.p, { i: item.i, l: item.l });    });    const queue = [];    for (const child of root.next.values()) {      child.fail = root;      queue.push(child);    }    while (queue.length) {      const current = queue.shift();      for (const [ch, nextNode] of current.next.entries()) {        let fail = current.fail;        while (fail && !fail.next.has(ch)) {          fail = fail.fail;        }        nextNode.fail = fail ? fail.next.get(ch) : root;        if (nextNode.fail.outputs.length > 0) {          nextNode.outputs = nextNode.outputs.concat(nextNode.fail.outputs);        }        queue.push(nextNode);      }    }    return { root };  };  const findMatches = (automaton, textChunks, options = {}) => {    const matches = [];    const caseInsensitive = Boolean(options.caseInsensitive);    for (let c = 0; c < textChunks.length; c++) {      const chunk = textChunks[c];      const text = caseInsensitive ? chunk.text.toLowerCase() : chunk.text;      let node = automaton.root;      for (let i = 0; i < text.length; i++) {        const ch = text[i];        while (node && !node.next.has(ch)) {          node = node.fail;        }        node = node ? node.next.get(ch) : automaton.root;        if (!node) {          node = automaton.root;          continue;        }        if (node.outputs.length > 0) {          for (let o = 0; o < node.outputs.length; o++) {            const output = node.outputs[o];            const length = output.l; // patternLength or termLength            const start = i - length + 1;            const end = i + 1;            if (start < 0) continue;            matches.push({              i: output.i, // entryIndex              start,              end,              chunkId: chunk.id            });          }        }      }    }    return matches;  };const enforceEnglishBoundary = (match, text) => {  const before = match.start > 0 ? text[match.start - 1] : "";  const after = match.end < text.length ? text[match.end] : "";  if (before && isWordChar(before)) return false;  if (after && isWordChar(after)) return false;  return true;};// --- Message Handler ---self.onmessage = (e) => {  const { type, payload } = e.data;  if (type === 'INIT') {    const { enPatterns, zhPatterns } = payload;    if (enPatterns) automatonEn = buildAutomaton(enPatterns);    if (zhPatterns) automatonZh = buildAutomaton(zhPatterns);    self.postMessage({ type: 'INIT_COMPLETE' });  }  if (type === 'SCAN') {    const { chunks, scanModes, id } = payload;    const matchesEn = [];    const matchesZh = [];    if (scanModes.includes('en') && automatonEn) {      const raw = findMatches(automatonEn, chunks, { caseInsensitive: true });      raw.forEach(match => {        // Find the chunk text to check boundary        const chunk = chunks.find(c => c.id === match.chunkId);        if (chunk && enforceEnglishBoundary(match, chunk.text.toLowerCase())) {           matchesEn.push(match);        }      });    }    if (scanModes.includes('zh') && automatonZh) {      const raw = findMatches(automatonZh, chunks);      matchesZh.push(...raw);    }    // Optimization: Don't send back the text in matches?    // We didn't include text in matches in findMatches anymore, only chunkId.    // So payload is already minimal.    self.postMessage({      type: 'SCAN_RESULT',      payload: {        id,        matchesEn,        matchesZh      }    });  }};
\ No newline at end of file
+// Reader for the packed binary glossary written by tools/build_glossary.py.
+// Layout: a header of little-endian uint32 fields (PACK_HEADER_FIELDS order)
+// followed by 4-byte aligned typed-array sections.
+const PACK_FORMAT_VERSION = 3;
+const PACK_MAGIC = 0x50475354; // "TSGP"
+const PACK_HEADER_FIELDS = [
+  "magic",
+  "formatVersion",
+  "schemaVersion",
+  "entryCount",
+  "stringCount",
+  "aliasCount",
+  "patternCount",
+  "categoryCount",
+  "stateCount",
+  "transitionCount",
+  "outputCount",
+  "stringOffsets",
+  "stringData",
+  "entryIds",
+  "entryTerms",
+  "entryCategories",
+  "aliasOffsets",
+  "aliasStrings",
+  "patternEntries",
+  "patternLengths",
+  "categoryStrings",
+  "stateTransitions",
+  "transitionCodes",
+  "stateFail",
+  "stateOutputs",
+  "stateOutputLink",
+  "outputPatterns",
+  "byteLength"
+];
+const utf16Decoder = new TextDecoder("utf-16le");
+class PackedGlossary {
+  constructor(buffer) {
+    if (buffer.byteLength < PACK_HEADER_FIELDS.length * 4) {
+      throw new Error("Packed glossary is truncated");
+    }
+    const raw = new Uint32Array(buffer, 0, PACK_HEADER_FIELDS.length);
+    const header = {};
+    PACK_HEADER_FIELDS.forEach((name, index) => {
+      header[name] = raw[index];
+    });
+    if (header.magic !== PACK_MAGIC) {
+      throw new Error("Not a packed glossary");
+    }
+    if (header.formatVersion !== PACK_FORMAT_VERSION) {
+      throw new Error(`Unsupported packed glossary version ${header.formatVersion}`);
+    }
+    if (header.byteLength !== buffer.byteLength) {
+      throw new Error("Packed glossary size mismatch");
+    }
+    this.buffer = buffer;
+    this.header = header;
+    this.schemaVersion = header.schemaVersion;
+    this.length = header.entryCount;
+    this.patternCount = header.patternCount;
+    this.stringOffsets = new Uint32Array(buffer, header.stringOffsets, header.stringCount + 1);
+    this.stringData = new Uint16Array(buffer, header.stringData, this.stringOffsets[header.stringCount]);
+    this.entryIds = new Uint32Array(buffer, header.entryIds, header.entryCount);
+    this.entryTerms = new Uint32Array(buffer, header.entryTerms, header.entryCount);
+    this.entryCategories = new Uint16Array(buffer, header.entryCategories, header.entryCount);
+    this.aliasOffsets = new Uint32Array(buffer, header.aliasOffsets, header.entryCount + 1);
+    this.aliasStrings = new Uint32Array(buffer, header.aliasStrings, header.aliasCount);
+    this.patternEntries = new Uint32Array(buffer, header.patternEntries, header.patternCount);
+    this.patternLengths = new Uint16Array(buffer, header.patternLengths, header.patternCount);
+    this.categoryStrings = new Uint32Array(buffer, header.categoryStrings, header.categoryCount);
+    // Precompiled Aho-Corasick automaton (see compile_automaton in build_glossary.py)
+    this.stateTransitions = new Uint32Array(buffer, header.stateTransitions, header.stateCount + 1);
+    this.transitionCodes = new Uint16Array(buffer, header.transitionCodes, header.transitionCount);
+    this.stateFail = new Uint32Array(buffer, header.stateFail, header.stateCount);
+    this.stateOutputs = new Uint32Array(buffer, header.stateOutputs, header.stateCount + 1);
+    this.stateOutputLink = new Uint32Array(buffer, header.stateOutputLink, header.stateCount);
+    this.outputPatterns = new Uint32Array(buffer, header.outputPatterns, header.outputCount);
+    this.entryCache = new Map();
+    this.idIndex = null;
+  }
+  getString(index) {
+    const start = this.stringOffsets[index];
+    const end = this.stringOffsets[index + 1];
+    return utf16Decoder.decode(this.stringData.subarray(start, end));
+  }
+  getEntry(index) {
+    if (index < 0 || index >= this.length) return undefined;
+    let entry = this.entryCache.get(index);
+    if (!entry) {
+      const aliases = [];
+      for (let a = this.aliasOffsets[index]; a < this.aliasOffsets[index + 1]; a++) {
+        aliases.push(this.getString(this.aliasStrings[a]));
+      }
+      entry = {
+        id: this.getString(this.entryIds[index]),
+        term: this.getString(this.entryTerms[index]),
+        aliases,
+        category: this.getString(this.categoryStrings[this.entryCategories[index]])
+      };
+      this.entryCache.set(index, entry);
+    }
+    return entry;
+  }
+  findEntry(id) {
+    if (!this.idIndex) {
+      this.idIndex = new Map();
+      for (let index = 0; index < this.length; index++) {
+        this.idIndex.set(this.getString(this.entryIds[index]), index);
+      }
+    }
+    const index = this.idIndex.get(id);
+    return index === undefined ? undefined : this.getEntry(index);
+  }
+}
+// Web Worker for Aho-Corasick matching
+// This runs in a separate thread to avoid blocking the UI
+const isWordChar = (ch) => /[A-Za-z0-9_]/.test(ch);
+// Automaton state
+let automatonEn = null;
+let automatonZh = null;
+// --- Matcher Logic (flat TypedArray automaton) ---
+// States are numbered breadth-first, so transition t leads to state t + 1. State s owns
+// transitions [stateTransitions[s], stateTransitions[s + 1]) sorted by UTF-16 code unit,
+// and the patterns ending at s in [stateOutputs[s], stateOutputs[s + 1]).
+// stateOutputLink[s] is the next state on the failure chain with outputs (0 = none).
+// Dense lookup for the root's transitions: most characters fall back to the root.
+const buildRootTable = (automaton) => {
+  const end = automaton.stateTransitions[1];
+  let size = 0;
+  for (let t = 0; t < end; t++) size = Math.max(size, automaton.transitionCodes[t] + 1);
+  const rootNext = new Uint32Array(size);
+  for (let t = 0; t < end; t++) rootNext[automaton.transitionCodes[t]] = t + 1;
+  automaton.rootNext = rootNext;
+  return automaton;
+};
+const fromPack = (pack) => buildRootTable({
+  stateTransitions: pack.stateTransitions,
+  transitionCodes: pack.transitionCodes,
+  stateFail: pack.stateFail,
+  stateOutputs: pack.stateOutputs,
+  stateOutputLink: pack.stateOutputLink,
+  outputPatterns: pack.outputPatterns,
+  patternEntries: pack.patternEntries,
+  patternLengths: pack.patternLengths
+});
+// Fallback for the JSON index: compiles the same layout as tools/build_glossary.py.
+const compileAutomaton = (patterns) => {
+  // patterns item: { p: pattern, i: index, l: termLength }
+  const children = [new Map()];
+  const own = [[]];
+  patterns.forEach((item, index) => {
+    let state = 0;
+    for (let c = 0; c < item.p.length; c++) {
+      const code = item.p.charCodeAt(c);
+      let target = children[state].get(code);
+      if (target === undefined) {
+        target = children.length;
+        children[state].set(code, target);
+        children.push(new Map());
+        own.push([]);
+      }
+      state = target;
+    }
+    own[state].push(index);
+  });
+  // Breadth-first renumbering with sorted siblings (see the layout note above).
+  const stateCount = children.length;
+  const order = [0];
+  const sortedCodes = new Array(stateCount);
+  const fail = new Uint32Array(stateCount);
+  const outputLink = new Uint32Array(stateCount);
+  for (let head = 0; head < order.length; head++) {
+    const state = order[head];
+    const codes = Array.from(children[state].keys()).sort((a, b) => a - b);
+    sortedCodes[state] = codes;
+    for (const code of codes) {
+      const target = children[state].get(code);
+      let link = 0;
+      if (state !== 0) {
+        link = fail[state];
+        while (link && !children[link].has(code)) link = fail[link];
+        link = children[link].get(code) || 0;
+      }
+      fail[target] = link;
+      outputLink[target] = own[link].length ? link : outputLink[link];
+      order.push(target);
+    }
+  }
+  const renumber = new Uint32Array(stateCount);
+  order.forEach((state, index) => {
+    renumber[state] = index;
+  });
+  const stateTransitions = new Uint32Array(stateCount + 1);
+  const transitionCodes = new Uint16Array(stateCount - 1);
+  const stateFail = new Uint32Array(stateCount);
+  const stateOutputLink = new Uint32Array(stateCount);
+  const stateOutputs = new Uint32Array(stateCount + 1);
+  const outputPatterns = new Uint32Array(patterns.length);
+  let t = 0;
+  let o = 0;
+  order.forEach((state, index) => {
+    for (const code of sortedCodes[state]) transitionCodes[t++] = code;
+    stateTransitions[index + 1] = t;
+    stateFail[index] = renumber[fail[state]];
+    stateOutputLink[index] = renumber[outputLink[state]];
+    for (const pattern of own[state]) outputPatterns[o++] = pattern;
+    stateOutputs[index + 1] = o;
+  });
+  return buildRootTable({
+    stateTransitions,
+    transitionCodes,
+    stateFail,
+    stateOutputs,
+    stateOutputLink,
+    outputPatterns,
+    patternEntries: Uint32Array.from(patterns, (item) => item.i),
+    patternLengths: Uint32Array.from(patterns, (item) => item.l)
+  });
+};
+const loadAutomaton = (pack, patterns) => {
+  if (pack) {
+    try {
+      return fromPack(new PackedGlossary(pack));
+    } catch (error) {
+      console.warn('Invalid packed glossary, falling back to patterns:', error);
+    }
+  }
+  return patterns ? compileAutomaton(patterns) : null;
+};
+const nextState = (automaton, state, code) => {
+  const { stateTransitions, transitionCodes, stateFail, rootNext } = automaton;
+  while (state !== 0) {
+    let lo = stateTransitions[state];
+    let hi = stateTransitions[state + 1] - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >> 1;
+      const midCode = transitionCodes[mid];
+      if (midCode === code) return mid + 1;
+      if (midCode < code) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    state = stateFail[state];
+  }
+  return code < rootNext.length ? rootNext[code] : 0;
+};
+const findMatches = (automaton, textChunks, options = {}) => {
+  const matches = [];
+  const caseInsensitive = Boolean(options.caseInsensitive);
+  const { stateOutputs, stateOutputLink, outputPatterns, patternEntries, patternLengths } = automaton;
+  for (let c = 0; c < textChunks.length; c++) {
+    const chunk = textChunks[c];
+    const text = caseInsensitive ? chunk.text.toLowerCase() : chunk.text;
+    let state = 0;
+    for (let i = 0; i < text.length; i++) {
+      state = nextState(automaton, state, text.charCodeAt(i));
+      for (let s = state; s !== 0; s = stateOutputLink[s]) {
+        for (let o = stateOutputs[s]; o < stateOutputs[s + 1]; o++) {
+          const pattern = outputPatterns[o];
+          const start = i - patternLengths[pattern] + 1; // patternLength or termLength
+          if (start < 0) continue;
+          matches.push({
+            i: patternEntries[pattern], // entryIndex
+            start,
+            end: i + 1,
+            chunkId: chunk.id
+          });
+        }
+      }
+    }
+  }
+  return matches;
+};
+const enforceEnglishBoundary = (match, text) => {
+  const before = match.start > 0 ? text[match.start - 1] : "";
+  const after = match.end < text.length ? text[match.end] : "";
+  if (before && isWordChar(before)) return false;
+  if (after && isWordChar(after)) return false;
+  return true;
+};
+// --- Message Handler ---
+self.onmessage = (e) => {
+  const { type, payload } = e.data;
+  if (type === 'INIT') {
+    const { enPack, zhPack, enPatterns, zhPatterns } = payload;
+    automatonEn = loadAutomaton(enPack, enPatterns);
+    automatonZh = loadAutomaton(zhPack, zhPatterns);
+    self.postMessage({ type: 'INIT_COMPLETE' });
+  }
+  if (type === 'LOAD_PACKS') {
+    // Full packs replacing the hot tier or domain pack.
+    const { enPack, zhPack } = payload;
+    if (enPack) automatonEn = loadAutomaton(enPack, null) || automatonEn;
+    if (zhPack) automatonZh = loadAutomaton(zhPack, null) || automatonZh;
+  }
+  if (type === 'SCAN') {
+    const { chunks, scanModes, id } = payload;
+    const matchesEn = [];
+    const matchesZh = [];
+    if (scanModes.includes('en') && automatonEn) {
+      const raw = findMatches(automatonEn, chunks, { caseInsensitive: true });
+      raw.forEach(match => {
+        // Find the chunk text to check boundary
+        const chunk = chunks.find(c => c.id === match.chunkId);
+        if (chunk && enforceEnglishBoundary(match, chunk.text.toLowerCase())) {
+           matchesEn.push(match);
+        }
+      });
+    }
+    if (scanModes.includes('zh') && automatonZh) {
+      const raw = findMatches(automatonZh, chunks);
+      matchesZh.push(...raw);
+    }
+    // Optimization: Don't send back the text in matches?
+    // We didn't include text in matches in findMatches anymore, only chunkId.
+    // So payload is already minimal.
+    self.postMessage({
+      type: 'SCAN_RESULT',
+      payload: {
+        id,
+        matchesEn,
+        matchesZh
+      }
+    });
+  }
+};
\ No newline at end of file